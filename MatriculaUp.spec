@@ -1,11 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
+sys.path.insert(0, 'C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\src')
+sys.path.insert(0, 'C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\scripts')
+from build_exe import compile_data_bundle
+
+# Regular + EFE offering (merged) and curriculum precompiled into build/matriculaup.bundle
+bundle = compile_data_bundle()
 
 
 a = Analysis(
     ['C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\src\\matriculaup\\main.py'],
     pathex=['C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\src'],
     binaries=[],
-    datas=[('C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\input\\courses_2026-1.json', 'input'), ('C:\\Users\\johnb\\Documents\\GitHub\\MatriculaUp\\input\\curricula_economia2017.json', 'input')],
+    datas=[(str(bundle), 'input')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
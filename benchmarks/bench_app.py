@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from benchmarks.conftest import SCALES, catalog_rows, scaled_catalog
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda s: f"x{s}")
+def catalog(request, matricula_app, real_catalog):
+    df = pd.DataFrame(catalog_rows(scaled_catalog(real_catalog, request.param)))
+    return matricula_app.CourseCatalog(df)
+
+
+@pytest.fixture
+def schedule_labels(catalog):
+    """One section label for each of the first 30 courses."""
+    return [catalog.course_sections[name][0] for name in catalog.course_names[:30]]
+
+
+def test_build_catalog(benchmark, matricula_app, real_catalog):
+    df = pd.DataFrame(catalog_rows(real_catalog))
+    benchmark(matricula_app.CourseCatalog, df)
+
+
+@pytest.mark.parametrize("term", ["", "micro", "eco fin"])
+def test_list_courses(benchmark, matricula_app, catalog, term):
+    app = matricula_app.MatriculaApp(catalog)
+    benchmark.pedantic(app.list_courses, args=(term,), setup=app._course_search_cache.clear, rounds=20)
+
+
+def test_build_schedule(benchmark, matricula_app, catalog, schedule_labels):
+    # Adds sections one by one, as a user does, with conflict checks on every add
+    def build():
+        app = matricula_app.MatriculaApp(catalog)
+        for label in schedule_labels:
+            app.add_to_schedule([label], 1, force_replace=True)
+        return app
+
+    app = benchmark(build)
+    assert app.schedules[1]
+
+
+def test_draw_week_schedule(benchmark, matricula_app, catalog, schedule_labels):
+    app = matricula_app.MatriculaApp(catalog)
+    for label in schedule_labels[:8]:
+        app.add_to_schedule([label], 1, force_replace=True)
+
+    def clear_caches():
+        # Every round must really draw, not hit the per-app or shared render caches
+        app._schedule_image_cache.clear()
+        matricula_app.render_cache._memory.clear()
+
+    benchmark.pedantic(app.draw_week_schedule, args=(1,), setup=clear_caches, rounds=10)
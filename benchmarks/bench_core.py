@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from matriculaup.core.conflict_detector import ConflictDetector
+from matriculaup.core.course_search import filter_courses
+from matriculaup.core.degree_planner import DegreePlanner
+from matriculaup.core.timeutil import hhmm_array_to_minutes, hhmm_to_minutes
+from matriculaup.models.course import load_from_json
+from matriculaup.models.curriculum import Curriculum
+
+
+def test_load_from_json(benchmark, catalog_json):
+    courses = benchmark(load_from_json, str(catalog_json))
+    assert courses
+
+
+@pytest.fixture(scope="session")
+def courses(catalog_json):
+    return load_from_json(str(catalog_json))
+
+
+@pytest.mark.parametrize("term", ["micro", "garcia", "zzz"])
+def test_filter_courses(benchmark, courses, term):
+    benchmark(filter_courses, courses, term)
+
+
+@pytest.mark.parametrize("n_sections", [8, 40])
+def test_find_conflicts(benchmark, courses, n_sections):
+    # Sections spread across the whole catalog, so larger catalogs mean more distinct sessions
+    with_sections = [c for c in courses if c.secciones]
+    step = max(1, len(with_sections) // n_sections)
+    selected = [(c, c.secciones[0]) for c in with_sections[::step]][:n_sections]
+    benchmark(ConflictDetector.find_conflicts, selected)
+
+
+def test_degree_plan(benchmark, real_catalog):
+    # Real prerequisite trees, laid out as a curriculum of six courses per cycle
+    cursos = real_catalog["cursos"]
+    curriculum = Curriculum.from_dict({"ciclos": [
+        {"ciclo": i // 6 + 1, "cursos": [
+            {"codigo": c["codigo"], "nombre": c["nombre"], "creditos": c["creditos"], "tipo": "obligatorio"}
+            for c in cursos[i:i + 6]]}
+        for i in range(0, len(cursos), 6)
+    ]})
+    prerequisites = {c["codigo"]: c["prerequisitos"] for c in cursos}
+
+    def plan():
+        return DegreePlanner(curriculum, prerequisites).plan(set())
+
+    result = benchmark(plan)
+    assert result.semestres
+
+
+def _strptime_minutes(value):
+    """The HH:MM parse timeutil replaced (ConflictDetector and the scripts used strptime)."""
+    t = datetime.strptime(value, "%H:%M")
+    return t.hour * 60 + t.minute
+
+
+@pytest.fixture(scope="session")
+def session_times(real_catalog):
+    """Every session start and end time of the real catalog."""
+    return [t for c in real_catalog["cursos"] for s in c["secciones"] for sess in s["sesiones"]
+            for t in (sess["hora_inicio"], sess["hora_fin"])]
+
+
+# One call per value; divide the mean by extra_info['calls'] for the per-call cost
+HHMM_PARSERS = {
+    "strptime": lambda values: [_strptime_minutes(v) for v in values],
+    "hhmm_to_minutes": lambda values: [hhmm_to_minutes(v) for v in values],
+}
+
+# A whole DataFrame column at once, as the Tk builder parses Horario_Inicio/Horario_Cierre
+HHMM_COLUMN_PARSERS = {
+    "strptime": lambda column: column.map(_strptime_minutes),
+    "hhmm_to_minutes": lambda column: column.map(hhmm_to_minutes),
+    "hhmm_array_to_minutes": hhmm_array_to_minutes,
+}
+
+
+@pytest.mark.benchmark(group="hhmm")
+@pytest.mark.parametrize("parser", list(HHMM_PARSERS))
+def test_parse_hhmm(benchmark, session_times, parser):
+    benchmark.extra_info["calls"] = len(session_times)
+    minutes = benchmark(HHMM_PARSERS[parser], session_times)
+    assert minutes == [_strptime_minutes(t) for t in session_times]
+
+
+@pytest.mark.benchmark(group="hhmm_column")
+@pytest.mark.parametrize("parser", list(HHMM_COLUMN_PARSERS))
+def test_parse_hhmm_column(benchmark, session_times, parser):
+    column = pd.Series(session_times)
+    benchmark.extra_info["calls"] = len(column)
+    minutes = benchmark(HHMM_COLUMN_PARSERS[parser], column)
+    assert list(minutes) == [_strptime_minutes(t) for t in session_times]
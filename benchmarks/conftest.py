@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.generate_catalog import CatalogGenerator, CatalogProfile
+
+ROOT = Path(__file__).resolve().parent.parent
+REAL_CATALOG = ROOT / "input" / "courses_2026-1_v4.json"
+
+# Catalog sizes benchmarked, as multiples of the real semester
+SCALES = [1, 10, 100]
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    """
+    pytest.ini always compares against the saved baseline and fails on regressions; on a
+    machine with no saved run yet, skip the check with a warning so the first run can save one.
+    """
+    storage = config.getoption("benchmark_storage", None)
+    if not config.getoption("benchmark_compare_fail", None) or not storage or not storage.startswith("file://"):
+        return
+    from pytest_benchmark.utils import get_machine_id
+
+    runs = Path(storage[len("file://"):]) / get_machine_id()
+    if not any(runs.glob("*.json")):
+        config.option.benchmark_compare_fail = None
+        session = getattr(config, "_benchmarksession", None)
+        if session is not None:
+            session.compare_fail = None
+        config.issue_config_time_warning(pytest.PytestConfigWarning(
+            f"No saved benchmark run in {runs}; not checking for regressions "
+            f"(record one with --benchmark-save=baseline)"), stacklevel=2)
+
+
+_SCALED = {}
+
+
+def scaled_catalog(data: dict, factor: int) -> dict:
+    """Synthetic catalog `factor` times the size of `data`, drawn from its distributions."""
+    if factor == 1:
+        return data
+    if factor not in _SCALED:
+        generator = CatalogGenerator(CatalogProfile(data), seed=factor)
+        _SCALED[factor] = generator.generate(len(data["cursos"]) * factor)
+    return _SCALED[factor]
+
+
+def catalog_rows(data: dict) -> list:
+    """Flat schedule rows (one per session) in the column layout the Gradio app reads."""
+    rows = []
+    for course in data["cursos"]:
+        for section in course["secciones"]:
+            for session in section["sesiones"]:
+                rows.append({
+                    "Curso": course["nombre"],
+                    "Secc": section["seccion"],
+                    "Docentes": ", ".join(section.get("docentes", [])),
+                    "Cred": course["creditos"],
+                    "Día": session["dia"],
+                    "Horario_Inicio": session["hora_inicio"],
+                    "Horario_Cierre": session["hora_fin"],
+                    "Tipo": session["tipo"],
+                })
+    return rows
+
+
+@pytest.fixture(scope="session")
+def real_catalog() -> dict:
+    if not REAL_CATALOG.exists():
+        pytest.skip(f"{REAL_CATALOG} not found")
+    with open(REAL_CATALOG, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session", params=SCALES, ids=lambda s: f"x{s}")
+def catalog_json(request, real_catalog, tmp_path_factory) -> Path:
+    """Path to a courses JSON `scale` times the size of the real one."""
+    path = tmp_path_factory.mktemp("catalogs") / f"courses_x{request.param}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(scaled_catalog(real_catalog, request.param), f, ensure_ascii=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def matricula_app():
+    """The Gradio app module (scripts/matricula_app.py); skipped without gradio."""
+    pytest.importorskip("gradio")
+    scripts = str(ROOT / "scripts")
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)
+    os.environ.setdefault("MATRICULA_CACHE_DIR", str(ROOT / "output" / ".cache"))
+    import matricula_app
+    return matricula_app
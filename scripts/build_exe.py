@@ -1,18 +1,48 @@
 import PyInstaller.__main__
 from pathlib import Path
+import json
 import os
+import sys
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from matriculaup.store.bundle import BUNDLE_NAME, build_bundle
+from scripts.extractors.merge import merge_files
+
+def compile_data_bundle(project_root: Path = PROJECT_ROOT) -> Path:
+    """Merges the regular and EFE offerings and precompiles them, with the curriculum, into build/matriculaup.bundle."""
+    sources = [project_root / "input" / "courses_2026-1.json"]
+    efe = project_root / "input" / "efe_courses_2026-1_v1.json"
+    if efe.exists():
+        sources.append(efe)
+    merged, report = merge_files(sources)
+    print(report.summary())
+
+    merged_path = project_root / "build" / "courses_2026-1_merged.json"
+    merged_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(merged_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False)
+
+    bundle = build_bundle(
+        project_root / "build" / BUNDLE_NAME,
+        courses_path=merged_path,
+        curriculum_path=project_root / "input" / "curricula_economia2017.json",
+    )
+    print(f"Data bundle written to {bundle} ({bundle.stat().st_size / 1024:.0f} KB)")
+    return bundle
 
 def build_exe():
-    project_root = Path(__file__).parent.parent.absolute()
+    project_root = PROJECT_ROOT
     main_script = project_root / "src" / "matriculaup" / "main.py"
     
-    # Path outputs for bundled files
-    input_courses = project_root / "input" / "courses_2026-1.json"
-    input_curriculum = project_root / "input" / "curricula_economia2017.json"
+    # The app reads the precompiled bundle instead of parsing the JSON at every launch
+    print("Compiling data bundle...")
+    bundle = compile_data_bundle(project_root)
 
     # Convert paths to string for PyInstaller
-    add_data_courses = f"{input_courses}{os.pathsep}input"
-    add_data_curriculum = f"{input_curriculum}{os.pathsep}input"
+    add_data_bundle = f"{bundle}{os.pathsep}input"
 
     print("Building PyInstaller Executable...")
     PyInstaller.__main__.run([
@@ -21,8 +51,7 @@ def build_exe():
         '--onedir',
         '--windowed',
         '--noconfirm',
-        f'--add-data={add_data_courses}',
-        f'--add-data={add_data_curriculum}',
+        f'--add-data={add_data_bundle}',
         f'--paths={project_root / "src"}',
         '--exclude-module=pdfplumber',
         '--exclude-module=pandas',
@@ -3,17 +3,28 @@
 Script de utilidad para convertir archivos Excel a CSV.
 CSV es ~10x más rápido de cargar que Excel.
 
+Con --feather o --parquet genera en cambio un archivo columnar tipado, que
+matricula_app.py carga directamente sin parsear CSV ni Excel (requiere pyarrow).
+
 Uso:
     python scripts/convert_excel_to_csv.py
     python scripts/convert_excel_to_csv.py input_file.xlsx output_file.csv
+    python scripts/convert_excel_to_csv.py --feather [input_file.xlsx|.csv [output_file.feather]]
+    python scripts/convert_excel_to_csv.py --parquet [input_file.xlsx|.csv [output_file.parquet]]
 """
 
 import pandas as pd
 import os
 import sys
 
+from schedule_io import read_csv_flexible, to_columnar_frame
+
 WORKSPACE_ROOT = os.path.dirname(os.path.dirname(__file__))
 
+# Si en output/ hay varios archivos con el mismo nombre base (p.ej. X.xlsx y el X.csv ya
+# convertido), se convierte solo el primero según este orden: todos escribirían el mismo archivo
+SOURCE_PRIORITY = ('.xlsx', '.xls', '.csv')
+
 
 def convert_excel_to_csv(excel_path: str, csv_path: str = None) -> bool:
     """
@@ -56,18 +67,99 @@ def convert_excel_to_csv(excel_path: str, csv_path: str = None) -> bool:
         return False
 
 
+def convert_to_columnar(input_path: str, output_path: str = None, fmt: str = 'feather') -> bool:
+    """
+    Convierte un archivo Excel o CSV a Feather o Parquet.
+
+    Los archivos se leen igual que en matricula_app.py (CSV con ',' o ';', UTF-8 o cp1252) y
+    las columnas de texto con valores mixtos (p.ej. secciones 1 y 'A') se guardan como texto,
+    ya que Arrow exige un único tipo por columna.
+
+    Args:
+        input_path: Ruta al archivo Excel o CSV
+        output_path: Ruta de salida (opcional, se genera automáticamente si no se provee)
+        fmt: 'feather' o 'parquet'
+
+    Returns:
+        True si la conversión fue exitosa
+    """
+    try:
+        if output_path is None:
+            output_path = f"{os.path.splitext(input_path)[0]}.{fmt}"
+
+        print(f"📖 Leyendo: {input_path}")
+        if input_path.lower().endswith('.csv'):
+            df = read_csv_flexible(input_path)
+        else:
+            df = pd.read_excel(input_path, engine='openpyxl')
+        df = to_columnar_frame(df)
+
+        print(f"✓ Leídos {len(df)} registros")
+        print(f"💾 Guardando {fmt.capitalize()}: {output_path}")
+
+        if fmt == 'parquet':
+            df.to_parquet(output_path, index=False)
+        else:
+            df.to_feather(output_path)
+
+        input_size = os.path.getsize(input_path) / 1024  # KB
+        output_size = os.path.getsize(output_path) / 1024  # KB
+
+        print(f"\n✅ Conversión exitosa!")
+        print(f"   Origen:  {input_size:.1f} KB")
+        print(f"   {fmt.capitalize()}: {output_size:.1f} KB")
+
+        return True
+
+    except ImportError:
+        print("❌ Error: se requiere pyarrow (pip install pyarrow)")
+        return False
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+
+def _priority(filename: str) -> int:
+    return SOURCE_PRIORITY.index(os.path.splitext(filename)[1].lower())
+
+
+def pick_sources(filenames: list, extensions: tuple) -> tuple:
+    """
+    Elige un archivo por nombre base entre los que tienen alguna de `extensions`, según
+    SOURCE_PRIORITY. Retorna (elegidos, omitidos), ambos ordenados por nombre.
+    """
+    candidates = sorted(f for f in filenames if os.path.splitext(f)[1].lower() in extensions)
+    chosen = {}
+    for name in candidates:
+        base = os.path.splitext(name)[0]
+        if base not in chosen or _priority(name) < _priority(chosen[base]):
+            chosen[base] = name
+    picked = sorted(chosen.values())
+    return picked, [f for f in candidates if f not in picked]
+
+
 def main():
     """Función principal."""
-    if len(sys.argv) >= 2:
+    args = sys.argv[1:]
+    fmt = None
+    for flag in ('--feather', '--parquet'):
+        if flag in args:
+            args.remove(flag)
+            fmt = flag[2:]
+
+    if args:
         # Modo con argumentos
-        excel_path = sys.argv[1]
-        csv_path = sys.argv[2] if len(sys.argv) >= 3 else None
+        input_path = args[0]
+        output_path = args[1] if len(args) >= 2 else None
 
-        if not os.path.exists(excel_path):
-            print(f"❌ Error: No existe el archivo {excel_path}")
+        if not os.path.exists(input_path):
+            print(f"❌ Error: No existe el archivo {input_path}")
             return
 
-        convert_excel_to_csv(excel_path, csv_path)
+        if fmt:
+            convert_to_columnar(input_path, output_path, fmt)
+        else:
+            convert_excel_to_csv(input_path, output_path)
 
     else:
         # Modo automático: convertir archivos por defecto
@@ -81,28 +173,34 @@ def main():
             print(f"❌ Error: No existe el directorio {output_dir}")
             return
 
-        excel_files = [
-            f for f in os.listdir(output_dir)
-            if f.endswith(('.xlsx', '.xls'))
-        ]
+        # En modo columnar también se aceptan los CSV ya convertidos
+        extensions = ('.xlsx', '.xls', '.csv') if fmt else ('.xlsx', '.xls')
+        excel_files, skipped = pick_sources(os.listdir(output_dir), extensions)
 
         if not excel_files:
             print(f"⚠ No se encontraron archivos Excel en {output_dir}")
             return
 
         print(f"📁 Encontrados {len(excel_files)} archivo(s) Excel:\n")
+        for name in skipped:
+            print(f"⏭️  {name}: se omite, ya se convierte otro archivo con el mismo nombre")
+        if skipped:
+            print()
 
         for excel_file in excel_files:
             excel_path = os.path.join(output_dir, excel_file)
-            csv_file = os.path.splitext(excel_file)[0] + '.csv'
-            csv_path = os.path.join(output_dir, csv_file)
 
             print(f"➡️  {excel_file}")
-            convert_excel_to_csv(excel_path, csv_path)
+            if fmt:
+                convert_to_columnar(excel_path, fmt=fmt)
+            else:
+                csv_file = os.path.splitext(excel_file)[0] + '.csv'
+                csv_path = os.path.join(output_dir, csv_file)
+                convert_excel_to_csv(excel_path, csv_path)
             print()
 
         print("✅ Conversión completa!")
-        print("\n💡 Tip: Ahora puedes usar los archivos .csv en la aplicación")
+        print(f"\n💡 Tip: Ahora puedes usar los archivos .{fmt or 'csv'} en la aplicación")
         print("   para una carga ~10x más rápida.")
 
 
@@ -4,6 +4,9 @@ MatriculaUp PDF Extractor
 Usage:
   python scripts/extract.py --type courses --pdf <path>
   python scripts/extract.py --type curriculum --pdf <path>
+  python scripts/extract.py --type courses --pdf <path> --profile
+      also writes <output>.profile.json / .profile.html with per-page, per-stage
+      timings, allocations and row-classification counts
 """
 import argparse
 import sys
@@ -13,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.extractors.courses import CourseOfferingExtractor
+from scripts.extractors.profiling import ExtractionProfiler
 
 
 def main():
@@ -21,6 +25,10 @@ def main():
                         help="Type of PDF to extract")
     parser.add_argument("--pdf", required=True, help="Path to PDF file")
     parser.add_argument("--output-dir", default="input", help="Output directory (default: input/)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a per-page/per-stage timing and allocation report (courses only)")
+    parser.add_argument("--profile-no-alloc", action="store_true",
+                        help="With --profile, skip tracemalloc (lower overhead, timings only)")
     args = parser.parse_args()
 
     pdf_path = Path(args.pdf)
@@ -28,8 +36,15 @@ def main():
         print(f"x PDF not found: {pdf_path}", file=sys.stderr)
         sys.exit(1)
 
+    profiler = None
+    if args.profile:
+        if args.type == "courses":
+            profiler = ExtractionProfiler(track_allocations=not args.profile_no_alloc)
+        else:
+            print("  --profile only supports --type courses; ignoring it", file=sys.stderr)
+
     if args.type == "courses":
-        extractor = CourseOfferingExtractor(str(pdf_path), args.output_dir)
+        extractor = CourseOfferingExtractor(str(pdf_path), args.output_dir, profiler=profiler)
     elif args.type == "curriculum":
         # Plan 03 implements CurriculumExtractor -- import lazily to avoid import error
         try:
@@ -39,10 +54,20 @@ def main():
             print("x Curriculum extractor not yet implemented", file=sys.stderr)
             sys.exit(1)
 
-    data = extractor.extract()
+    if profiler:
+        profiler.start(str(pdf_path))
+        try:
+            data = extractor.extract()
+        finally:
+            profiler.stop()
+    else:
+        data = extractor.extract()
     out_path = extractor.save(data)
     print(f"Output written to {out_path}")
 
+    if profiler:
+        write_profile(profiler, out_path)
+
     if extractor.error_rate() > 0.01:
         print(f"  Error rate {extractor.error_rate():.1%} exceeds threshold", file=sys.stderr)
         sys.exit(1)
@@ -50,5 +75,18 @@ def main():
     sys.exit(0)
 
 
+def write_profile(profiler: ExtractionProfiler, out_path: Path):
+    """Writes the JSON/HTML reports next to the output and prints the summary."""
+    json_path = profiler.write_json(out_path.with_suffix(".profile.json"))
+    html_path = profiler.write_html(out_path.with_suffix(".profile.html"))
+    report = profiler.report()
+    print(f"Profile: {report['total_seconds']:.2f}s total -> {json_path}, {html_path}")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<16} {stage['seconds']:8.3f}s  {stage['calls']:5d} calls  "
+              f"{stage['alloc_bytes'] / 1024:10.1f} KB alloc")
+    print("  rows: " + ", ".join(f"{k}={v}" for k, v in sorted(report["rows"].items())))
+    print("  slowest pages: " + ", ".join(f"p{p['page']} {p['seconds']:.3f}s" for p in report["slowest_pages"]))
+
+
 if __name__ == "__main__":
     main()
@@ -24,6 +24,7 @@ from datetime import date
 from pathlib import Path
 
 from scripts.extractors.base import BaseExtractor
+from scripts.extractors.profiling import NullProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -551,8 +552,10 @@ class CourseOfferingExtractor(BaseExtractor):
         "join_tolerance": 3,
     }
 
-    def __init__(self, pdf_path: str, output_dir: str = "input"):
+    def __init__(self, pdf_path: str, output_dir: str = "input", profiler=None):
         super().__init__(pdf_path, output_dir)
+        # ExtractionProfiler for --profile; the default NullProfiler makes every hook a no-op
+        self.profiler = profiler or NullProfiler()
         self._cycle = self._detect_cycle()
         self._version = self._detect_version_from_filename()
         self._version_date = None
@@ -621,8 +624,10 @@ class CourseOfferingExtractor(BaseExtractor):
         section_count_total = 0
         warning_count = 0
 
+        profiler = self.profiler
         with pdfplumber.open(str(self.pdf_path)) as pdf:
-            detected_version, detected_date = self._detect_version_from_pdf_text(pdf)
+            with profiler.stage("_detect_version"):
+                detected_version, detected_date = self._detect_version_from_pdf_text(pdf)
             if detected_version:
                 self._version = detected_version
             if detected_date:
@@ -633,35 +638,39 @@ class CourseOfferingExtractor(BaseExtractor):
                 if i % 10 == 0:
                     print(f"Procesando página {i+1}/{total_pages}...", end="\r", flush=True)
 
-                # Use find_tables for better table detection
-                tables = page.find_tables(self.TABLE_SETTINGS)
-                if not tables:
-                    # Try simpler extract_table fallback
-                    table = page.extract_table()
-                    if table:
-                        tables_data = [table]
-                    else:
-                        continue  # Cover/header page, skip silently
-                else:
-                    tables_data = [t.extract() for t in tables]
-
-                for table in tables_data:
-                    if not table:
-                        continue
-                    self.total_rows += len(table)
-                    # Pass the last course context into the table parser
-                    last_course = all_courses[-1] if all_courses else None
-                    page_courses = self._process_table(table, last_course)
-                    
-                    if page_courses:
-                        if all_courses and last_course and page_courses[0] is last_course:
-                            # The first course returned is the continuation of the last one
-                            all_courses.extend(page_courses[1:])
+                with profiler.page(i):
+                    # Use find_tables for better table detection
+                    with profiler.stage("find_tables"):
+                        tables = page.find_tables(self.TABLE_SETTINGS)
+                    with profiler.stage("extract"):
+                        if not tables:
+                            # Try simpler extract_table fallback
+                            table = page.extract_table()
+                            tables_data = [table] if table else []
                         else:
-                            all_courses.extend(page_courses)
+                            tables_data = [t.extract() for t in tables]
+                    if not tables_data:
+                        continue  # Cover/header page, skip silently
+
+                    for table in tables_data:
+                        if not table:
+                            continue
+                        self.total_rows += len(table)
+                        # Pass the last course context into the table parser
+                        last_course = all_courses[-1] if all_courses else None
+                        with profiler.stage("_process_table"):
+                            page_courses = self._process_table(table, last_course)
+
+                        if page_courses:
+                            if all_courses and last_course and page_courses[0] is last_course:
+                                # The first course returned is the continuation of the last one
+                                all_courses.extend(page_courses[1:])
+                            else:
+                                all_courses.extend(page_courses)
 
         # Deduplicate: if a course spans pages, merge sections
-        merged = self._merge_courses(all_courses)
+        with profiler.stage("_merge_courses"):
+            merged = self._merge_courses(all_courses)
 
         # Calculate stats
         for course in merged:
@@ -698,7 +707,8 @@ class CourseOfferingExtractor(BaseExtractor):
         # Validate output against schema before saving
         try:
             from scripts.extractors.validators import validate_courses_json
-            errors = validate_courses_json(data)
+            with profiler.stage("validate"):
+                errors = validate_courses_json(data)
             if errors:
                 for e in errors[:5]:  # Show first 5 errors
                     logger.warning("Schema error: %s", e)
@@ -724,6 +734,8 @@ class CourseOfferingExtractor(BaseExtractor):
              courses.append(current_course)
 
         session_kws = SESSION_KEYWORDS
+        # Row classification counts for --profile (no-op otherwise)
+        count = self.profiler.count
 
         def flush_course():
             nonlocal current_course, prereq_parts
@@ -752,6 +764,7 @@ class CourseOfferingExtractor(BaseExtractor):
 
         for row in table:
             if not row:
+                count("blank")
                 continue
 
             cells = [str(c).strip() if c is not None else "" for c in row]
@@ -759,11 +772,13 @@ class CourseOfferingExtractor(BaseExtractor):
 
             # Skip header rows
             if any(h in col0 for h in ["Secc", "CURSOS"]):
+                count("header")
                 continue
 
             # --- Course header row ---
             m = COURSE_CODE_RE.match(col0)
             if m:
+                count("course")
                 flush_course()
 
                 code = m.group(1)
@@ -793,6 +808,7 @@ class CourseOfferingExtractor(BaseExtractor):
                 continue
 
             if current_course is None:
+                count("orphan")
                 continue
 
             # --- Section header row ---
@@ -806,6 +822,7 @@ class CourseOfferingExtractor(BaseExtractor):
 
             if is_section:
                 section = self._parse_real_section_row(cells)
+                count("section" if section else "section_unparsed")
                 if section:
                     # Check if section already exists (page boundary continuation)
                     existing_sec = next((s for s in current_course["secciones"] if s["seccion"] == section["seccion"]), None)
@@ -822,8 +839,13 @@ class CourseOfferingExtractor(BaseExtractor):
                 if tipo in session_kws or any(kw in tipo for kw in session_kws):
                     session = self._parse_real_session_row(cells)
                     if session and current_course["secciones"]:
+                        count("session")
                         current_course["secciones"][-1]["sesiones"].append(session)
-                continue
+                    else:
+                        count("session_dropped")
+                    continue
+
+            count("other")
 
         # Flush the last course
         flush_course()
@@ -60,7 +60,12 @@ Formato JSON:
 
 from __future__ import annotations
 
+import argparse
+import csv
+import hashlib
+import io
 import json
+import os
 import re
 import sys
 from collections import defaultdict
@@ -76,6 +81,11 @@ XLSX_PATH = EFE_DIR / "Sesiones SSU_2026-I(1).xlsx"
 OUT_PATH  = EFE_DIR / "efe_ssu_2026-1_v1.json"
 CICLO     = "2026-1"
 
+# Parsed Excel/CSV sessions, one JSON per source content hash
+CACHE_DIR = BASE_DIR / "output" / ".cache" / "efe_ssu"
+# Bump when _load_excel's output changes, to ignore maps cached by older versions
+EXCEL_CACHE_VERSION = 1
+
 # ── Constants ────────────────────────────────────────────────────────────────
 
 COURSE_CODE_RE = re.compile(r"^(\d{5,7}[_A-Z]*)\s*[-–]\s*(.+)", re.DOTALL)
@@ -124,7 +134,8 @@ def _parse_excel_date(val) -> str | None:
     if isinstance(val, date):
         return val.isoformat()
     s = str(val).strip()
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
+    # The last one is how a CSV export writes Excel date cells
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S"):
         try:
             return datetime.strptime(s, fmt).date().isoformat()
         except ValueError:
@@ -160,30 +171,105 @@ def _is_skip_row(col0: str) -> bool:
 
 # ── Step 1: Parse Excel ──────────────────────────────────────────────────────
 
-def _load_excel() -> dict[str, dict[str, list[dict]]]:
-    """Returns {codigo: {seccion: [{fecha, dia, tipo, hora_inicio, hora_fin}]}}"""
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_csv_text(path: Path) -> str:
+    """CSV text as UTF-8 or, failing that, cp1252 (what a Spanish-locale Excel writes)."""
+    raw = path.read_bytes()
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252")
+
+
+def _csv_delimiter(sample: str) -> str:
+    """
+    ',' or, from a Spanish-locale Excel, ';' (or tab). The title and blank rows above the
+    header can make csv.Sniffer give up; then the delimiter seen most often decides.
+    """
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        return max(",;\t", key=sample.count)
+
+
+def _iter_sheet_rows(path: Path):
+    """Yields the rows of a .csv, or of the active sheet of a workbook streamed in read-only mode."""
+    if path.suffix.lower() == ".csv":
+        text = _read_csv_text(path)
+        for row in csv.reader(io.StringIO(text, newline=""), delimiter=_csv_delimiter(text[:65536])):
+            yield tuple(cell if cell != "" else None for cell in row)
+        return
+
     import openpyxl
 
-    wb   = openpyxl.load_workbook(str(XLSX_PATH))
-    ws   = wb.active
-    rows = list(ws.iter_rows(values_only=True))
+    wb = openpyxl.load_workbook(str(path), read_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _load_excel(path: Path = XLSX_PATH, use_cache: bool = True) -> dict[str, dict[str, list[dict]]]:
+    """
+    Returns {codigo: {seccion: [{fecha, dia, tipo, hora_inicio, hora_fin}]}} from the SSU
+    sessions workbook (or a CSV export of it). The result is cached by file content hash.
+    """
+    path = Path(path)
+    cache_path = None
+    if use_cache:
+        cache_path = CACHE_DIR / f"{_file_sha256(path)[:32]}.v{EXCEL_CACHE_VERSION}.json"
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                result = json.load(f)
+            print(f"[Excel] {sum(len(v) for secs in result.values() for v in secs.values())} session rows "
+                  f"| {len(result)} cursos (cached)")
+            return result
+        except (OSError, ValueError):
+            pass
+
+    # A CSV is always passed explicitly (--excel): one without a header is an error, not "no SSU"
+    result = _parse_session_rows(_iter_sheet_rows(path), required=path.suffix.lower() == ".csv")
+
+    if cache_path is not None and result:
+        # Atomic write: a concurrent run sees the old map or the complete new one
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    return result
+
+
+def _parse_session_rows(rows, required: bool = False) -> dict[str, dict[str, list[dict]]]:
+    """
+    Finds the header row and parses the session rows after it, in a single pass over `rows`.
+    Without a header row, returns {} (or raises ValueError if `required`).
+    """
+    rows = iter(rows)
 
     # Locate header row
-    header_idx = None
-    for i, row in enumerate(rows):
-        for cell in row:
-            if cell and re.search(r"C[ÓO]D", str(cell), re.IGNORECASE):
-                header_idx = i
-                break
-        if header_idx is not None:
+    header = None
+    for row in rows:
+        if any(cell and re.search(r"C[ÓO]D", str(cell), re.IGNORECASE) for cell in row):
+            header = [_clean(c) for c in row]
             break
 
-    if header_idx is None:
+    if header is None:
+        if required:
+            raise ValueError("Header row not found (expected a CÓDIGO column)")
         print("[Excel] WARNING: Header row not found — Excel skipped.")
         return {}
 
-    header = [_clean(c) for c in rows[header_idx]]
-
     def col(patterns: list[str]) -> int:
         for pat in patterns:
             for idx, h in enumerate(header):
@@ -202,10 +288,14 @@ def _load_excel() -> dict[str, dict[str, list[dict]]]:
         print(f"[Excel] WARNING: {e} — Excel skipped.")
         return {}
 
+    width = max(i_cod, i_sec, i_fec, i_tip, i_hi, i_hf) + 1
     result: dict[str, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
     total = skipped = 0
 
-    for row in rows[header_idx + 1:]:
+    for row in rows:
+        if len(row) < width:
+            # Read-only sheets and CSV rows can stop at their last non-empty cell
+            row = tuple(row) + (None,) * (width - len(row))
         codigo = _clean(row[i_cod])
         if not re.match(r"^\d{5,7}$", codigo):
             continue
@@ -237,7 +327,7 @@ def _load_excel() -> dict[str, dict[str, list[dict]]]:
             result[codigo][sec].sort(key=lambda s: (s["fecha"], s["hora_inicio"]))
 
     print(f"[Excel] {total} session rows | {len(result)} cursos | {skipped} skipped")
-    return dict(result)
+    return {codigo: dict(secs) for codigo, secs in result.items()}
 
 
 # ── Step 2: Parse PDF ────────────────────────────────────────────────────────
@@ -507,14 +597,25 @@ def _merge_excel(courses: list[dict], excel: dict[str, dict[str, list[dict]]]) -
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="EFE extractor (PDF + SSU sessions Excel)")
+    parser.add_argument("--excel", type=Path, default=XLSX_PATH,
+                        help="SSU sessions workbook, or a CSV export of it (faster)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-parse the Excel/CSV even if {CACHE_DIR} has it")
+    args = parser.parse_args()
+
     print("=== EFE Extractor (todos los tipos) ===")
     print(f"PDF:   {PDF_PATH.name}")
-    print(f"Excel: {XLSX_PATH.name}")
+    print(f"Excel: {args.excel.name}")
     print(f"Out:   {OUT_PATH}")
     print()
 
     print("[1/3] Parsing Excel (sesiones SSU)...")
-    excel = _load_excel()
+    try:
+        excel = _load_excel(args.excel, use_cache=not args.no_cache)
+    except ValueError as e:
+        print(f"[Excel] ERROR: {args.excel}: {e}", file=sys.stderr)
+        sys.exit(1)
 
     print()
     print("[2/3] Parsing PDF (todos los EFEs)...")
@@ -530,7 +631,7 @@ def main() -> None:
             "descripcion":      "Experiencias Formativas Estudiantiles — Planes Antiguos 2026-I",
             "fecha_extraccion": date.today().isoformat(),
             "fuente_pdf":       PDF_PATH.name,
-            "fuente_excel":     XLSX_PATH.name,
+            "fuente_excel":     args.excel.name,
             "total_cursos":     len(courses),
         },
         "cursos": courses,
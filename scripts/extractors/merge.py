@@ -0,0 +1,153 @@
+"""
+merge.py — Combines several course offerings into one MatriculaUp catalog.
+
+Every source is a courses JSON (COURSES_SCHEMA), e.g. the regular offering and the
+EFE offering from efe_to_courses.py. Courses are indexed by code: a code seen in more
+than one source becomes a single course whose sections are the union of its sources'
+sections (indexed by section letter). Exact duplicates are dropped; a course field, a
+section or the metadata `ciclo` that differs between sources, or a section letter repeated
+with different contents within one source, is a conflict, resolved by the `on_conflict` policy:
+
+  first  keep the value from the earliest source (default; list the regular offering first)
+  last   let later sources override earlier ones
+  error  raise MergeConflictError
+
+Usage:
+  python -m scripts.extractors.merge input/courses_2026-1_v4.json input/efe_courses_2026-1_v1.json \
+      --output input/courses_2026-1_merged.json
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+POLICIES = ("first", "last", "error")
+
+# Course fields compared between sources (the sections are merged one by one)
+_COURSE_FIELDS = ("nombre", "creditos", "prerequisitos")
+
+
+class MergeConflictError(ValueError):
+    """Two sources (or two sections of one source) disagree and the policy is 'error'."""
+
+
+@dataclass
+class MergeReport:
+    sources: list[tuple[str, int]] = field(default_factory=list)
+    courses: int = 0
+    duplicates: int = 0
+    sections_added: int = 0
+    conflicts: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [f"  {name}: {n} cursos" for name, n in self.sources]
+        lines.append(f"  -> {self.courses} cursos | {self.sections_added} secciones agregadas a cursos "
+                     f"existentes | {self.duplicates} duplicados | {len(self.conflicts)} conflictos")
+        lines.extend(f"  ! {c}" for c in self.conflicts)
+        return "\n".join(lines)
+
+
+def merge_offerings(sources: list[tuple[str, dict]], on_conflict: str = "first") -> tuple[dict, MergeReport]:
+    """
+    Merges (name, courses document) pairs, in priority order, into one courses document.
+    The inputs are not modified. Returns the merged document and a MergeReport.
+    """
+    if on_conflict not in POLICIES:
+        raise ValueError(f"on_conflict must be one of {POLICIES}, got {on_conflict!r}")
+    if not sources:
+        raise ValueError("No sources to merge")
+
+    report = MergeReport()
+    # codigo -> merged course; seccion -> position in that course's secciones
+    courses: dict[str, dict] = {}
+    section_index: dict[str, dict[str, int]] = {}
+
+    def conflict(what: str, source: str) -> bool:
+        """Records a conflict; True if `source`'s value should replace the current one."""
+        report.conflicts.append(f"{what} ({source})")
+        if on_conflict == "error":
+            raise MergeConflictError(f"{what}: {source} differs from an earlier definition")
+        return on_conflict == "last"
+
+    metadata = dict(sources[0][1].get("metadata", {}))
+    for name, data in sources:
+        meta = data.get("metadata", {})
+        if "ciclo" in meta and meta["ciclo"] != metadata.get("ciclo") and conflict("metadata.ciclo", name):
+            metadata["ciclo"] = meta["ciclo"]
+
+        cursos = data.get("cursos", [])
+        report.sources.append((name, len(cursos)))
+        for course in cursos:
+            code = course["codigo"]
+            merged = courses.get(code)
+            new_course = merged is None
+            if new_course:
+                # Sections go through the loop below, so a letter repeated within this source is caught too
+                merged = courses[code] = {k: copy.deepcopy(v) if k != "secciones" else []
+                                          for k, v in course.items()}
+                section_index[code] = {}
+            else:
+                for key in _COURSE_FIELDS:
+                    if key in course and course[key] != merged.get(key) and conflict(f"{code}.{key}", name):
+                        merged[key] = copy.deepcopy(course[key])
+
+            sections = merged.setdefault("secciones", [])
+            index = section_index[code]
+            for section in course.get("secciones", []):
+                pos = index.get(section["seccion"])
+                if pos is None:
+                    index[section["seccion"]] = len(sections)
+                    sections.append(copy.deepcopy(section))
+                    if not new_course:
+                        report.sections_added += 1
+                elif sections[pos] == section:
+                    report.duplicates += 1
+                elif conflict(f"{code} sección {section['seccion']}", name):
+                    sections[pos] = copy.deepcopy(section)
+
+    metadata["fuentes"] = [{"nombre": name, "cursos": n} for name, n in report.sources]
+    report.courses = len(courses)
+    return {"metadata": metadata, "cursos": list(courses.values())}, report
+
+
+def merge_files(paths: list[Path], on_conflict: str = "first") -> tuple[dict, MergeReport]:
+    """merge_offerings over courses JSON files, named by file name."""
+    sources = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            sources.append((Path(path).name, json.load(f)))
+    return merge_offerings(sources, on_conflict)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge course offerings into one catalog")
+    parser.add_argument("sources", nargs="+", type=Path, help="Courses JSON files, highest priority first")
+    parser.add_argument("--output", type=Path, required=True, help="Merged courses JSON")
+    parser.add_argument("--on-conflict", choices=POLICIES, default="first",
+                        help="How to resolve a course/section that differs between sources (default: first)")
+    args = parser.parse_args()
+
+    try:
+        data, report = merge_files(args.sources, args.on_conflict)
+    except MergeConflictError as e:
+        print(f"x {e}", file=sys.stderr)
+        sys.exit(1)
+
+    from scripts.extractors.validators import validate_courses_json
+    errors = validate_courses_json(data)
+    for err in errors[:5]:
+        print(f"[WARN] Schema error: {err}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"[OK] {args.output}")
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
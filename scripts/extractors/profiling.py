@@ -0,0 +1,201 @@
+"""
+profiling.py — opt-in timing/allocation profiler for the PDF extractors.
+
+Extractors call `with profiler.page(i):`, `with profiler.stage(name):` and
+`profiler.count(kind)` unconditionally; the default NullProfiler turns all of
+them into no-ops, so extraction without --profile pays nothing measurable.
+ExtractionProfiler records wall time (and, optionally, tracemalloc allocations)
+per page and per stage, plus row-classification counts, and writes JSON/HTML reports.
+"""
+from __future__ import annotations
+
+import html
+import json
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+DOCUMENT = "document"  # pseudo-page for stages outside the page loop (e.g. _merge_courses)
+
+
+class NullProfiler:
+    """Does nothing; the extractors' default."""
+
+    enabled = False
+
+    def page(self, index: int):
+        return nullcontext()
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def count(self, kind: str, n: int = 1):
+        pass
+
+
+class ExtractionProfiler(NullProfiler):
+    """Per-page, per-stage wall time and allocations for one extraction run."""
+
+    enabled = True
+
+    def __init__(self, track_allocations: bool = True, slowest: int = 5):
+        self.track_allocations = track_allocations
+        self.slowest = slowest
+        self.pdf_path: str | None = None
+        # page -> stage -> {"calls", "seconds", "alloc_bytes", "peak_bytes"}
+        self.stages: dict = defaultdict(lambda: defaultdict(lambda: {
+            "calls": 0, "seconds": 0.0, "alloc_bytes": 0, "peak_bytes": 0}))
+        self.page_seconds: dict = {}
+        self.rows: dict = defaultdict(Counter)
+        self._page = DOCUMENT
+        self._started_tracing = False
+        self._start = None
+        self.total_seconds = 0.0
+
+    def start(self, pdf_path: str | None = None):
+        self.pdf_path = pdf_path
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+
+    def stop(self):
+        if self._start is not None:
+            self.total_seconds = time.perf_counter() - self._start
+            self._start = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def page(self, index: int):
+        previous, self._page = self._page, index + 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.page_seconds[self._page] = self.page_seconds.get(self._page, 0.0) + time.perf_counter() - t0
+            self._page = previous
+
+    @contextmanager
+    def stage(self, name: str):
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            entry = self.stages[self._page][name]
+            entry["calls"] += 1
+            entry["seconds"] += elapsed
+            if tracing:
+                after, peak = tracemalloc.get_traced_memory()
+                entry["alloc_bytes"] += max(after - before, 0)
+                entry["peak_bytes"] = max(entry["peak_bytes"], peak - before)
+
+    def count(self, kind: str, n: int = 1):
+        self.rows[self._page][kind] += n
+
+    def report(self) -> dict:
+        pages = []
+        for page in sorted(p for p in set(self.stages) | set(self.page_seconds) | set(self.rows) if p != DOCUMENT):
+            pages.append({
+                "page": page,
+                "seconds": round(self.page_seconds.get(page, 0.0), 6),
+                "stages": {name: self._rounded(s) for name, s in self.stages[page].items()},
+                "rows": dict(self.rows[page]),
+            })
+
+        totals: dict = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "alloc_bytes": 0, "peak_bytes": 0})
+        for page_stages in self.stages.values():
+            for name, s in page_stages.items():
+                t = totals[name]
+                t["calls"] += s["calls"]
+                t["seconds"] += s["seconds"]
+                t["alloc_bytes"] += s["alloc_bytes"]
+                t["peak_bytes"] = max(t["peak_bytes"], s["peak_bytes"])
+        row_totals = Counter()
+        for counts in self.rows.values():
+            row_totals.update(counts)
+
+        slowest = sorted(pages, key=lambda p: p["seconds"], reverse=True)[:self.slowest]
+        return {
+            "pdf": self.pdf_path,
+            "total_seconds": round(self.total_seconds, 6),
+            "pages_seconds": round(sum(self.page_seconds.values()), 6),
+            "allocations_tracked": self.track_allocations,
+            "stages": {name: self._rounded(s) for name, s in sorted(totals.items(), key=lambda kv: -kv[1]["seconds"])},
+            "document_stages": {name: self._rounded(s) for name, s in self.stages.get(DOCUMENT, {}).items()},
+            "rows": dict(row_totals),
+            "slowest_pages": [{"page": p["page"], "seconds": p["seconds"]} for p in slowest],
+            "pages": pages,
+        }
+
+    @staticmethod
+    def _rounded(stats: dict) -> dict:
+        return dict(stats, seconds=round(stats["seconds"], 6))
+
+    def write_json(self, path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def write_html(self, path) -> Path:
+        path = Path(path)
+        path.write_text(render_html(self.report()), encoding="utf-8")
+        return path
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:,.1f}"
+
+
+def render_html(report: dict) -> str:
+    """Self-contained HTML view of a profiler report (no external assets)."""
+    esc = html.escape
+    stage_names = list(report["stages"])
+    row_kinds = sorted(report["rows"])
+    slow = {p["page"] for p in report["slowest_pages"]}
+    max_seconds = max((p["seconds"] for p in report["pages"]), default=0) or 1
+
+    def stage_table(stages: dict) -> str:
+        body = "".join(
+            f"<tr><td>{esc(name)}</td><td>{s['calls']}</td><td>{s['seconds']:.3f}</td>"
+            f"<td>{_kb(s['alloc_bytes'])}</td><td>{_kb(s['peak_bytes'])}</td></tr>"
+            for name, s in stages.items())
+        return ("<table><tr><th>Stage</th><th>Calls</th><th>Seconds</th><th>Allocated KB</th>"
+                f"<th>Peak KB</th></tr>{body}</table>")
+
+    page_rows = []
+    for p in report["pages"]:
+        cls = ' class="slow"' if p["page"] in slow else ""
+        bar = f'<div class="bar" style="width:{100 * p["seconds"] / max_seconds:.1f}%"></div>'
+        cells = "".join(f"<td>{p['stages'].get(n, {}).get('seconds', 0):.3f}</td>" for n in stage_names)
+        rows = "".join(f"<td>{p['rows'].get(k, 0)}</td>" for k in row_kinds)
+        page_rows.append(f"<tr{cls}><td>{p['page']}</td><td>{p['seconds']:.3f}{bar}</td>{cells}{rows}</tr>")
+
+    header = "".join(f"<th>{esc(n)} s</th>" for n in stage_names) + "".join(f"<th>{esc(k)}</th>" for k in row_kinds)
+    slowest = ", ".join(f"p{p['page']} ({p['seconds']:.3f}s)" for p in report["slowest_pages"])
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Extraction profile</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 3px 8px; text-align: right; }}
+th {{ background: #eee; }}
+tr.slow td {{ background: #ffe3e3; }}
+.bar {{ background: #4dabf7; height: 4px; }}
+</style></head><body>
+<h1>Extraction profile</h1>
+<p>{esc(str(report['pdf']))}<br>Total {report['total_seconds']:.3f}s, pages {report['pages_seconds']:.3f}s
+{'' if report['allocations_tracked'] else ' (allocations not tracked)'}<br>Slowest pages: {esc(slowest)}</p>
+<h2>Stages</h2>{stage_table(report['stages'])}
+<h2>Rows</h2><p>{esc(', '.join(f'{k}: {v}' for k, v in sorted(report['rows'].items())))}</p>
+<h2>Pages</h2><table><tr><th>Page</th><th>Seconds</th>{header}</tr>{''.join(page_rows)}</table>
+</body></html>
+"""
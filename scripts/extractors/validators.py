@@ -1,9 +1,15 @@
 """
 JSON Schema validators for MatriculaUp extraction output.
-Uses jsonschema library for declarative schema validation.
+
+The schemas below are declarative (Draft 7 subset) and are compiled once, at import,
+into plain Python checks that report the same errors as jsonschema's Draft7Validator
+(same paths, messages and order). Courses are validated one by one, so a re-extraction
+only re-validates the courses it changed (see CoursesValidator).
 """
-from jsonschema import validate, ValidationError, Draft7Validator
-from typing import List
+import json
+import re
+from numbers import Number
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -160,19 +166,262 @@ CURRICULUM_SCHEMA = {
     "required": ["metadata", "ciclos"],
 }
 
+# --- Schema compiler ------------------------------------------------------
+
+# A compiled check returns None when the instance is valid, otherwise a list of
+# (path relative to the instance, message). Valid data allocates nothing.
+Errors = Optional[List[Tuple[tuple, str]]]
+Check = Callable[[Any], Errors]
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "null": lambda v: v is None,
+    "boolean": lambda v: isinstance(v, bool),
+    "number": lambda v: isinstance(v, Number) and not isinstance(v, bool),
+    # Draft 7 counts 1.0 as an integer
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def _equal(a, b) -> bool:
+    # As in jsonschema, True/False never equal 1/0
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    return a == b
+
+
+def _too_short(n: int) -> str:
+    return "should be non-empty" if n == 1 else "is too short"
+
+
+# JSON types that are exactly one Python type, checked with a single isinstance
+_PY_TYPES = {"object": dict, "array": list, "string": str, "null": type(None)}
+
+
+def _type(types, schema) -> Check:
+    types = [types] if isinstance(types, str) else list(types)
+    plain = tuple(_PY_TYPES[t] for t in types if t in _PY_TYPES)
+    tests = tuple(_TYPES[t] for t in types if t not in _PY_TYPES)
+    reprs = ", ".join(repr(t) for t in types)
+
+    def check(v):
+        if not isinstance(v, plain) and not any(test(v) for test in tests):
+            return [((), f"{v!r} is not of type {reprs}")]
+    return check
+
+
+def _enum(enums, schema) -> Check:
+    hashable = all(isinstance(e, str) for e in enums)
+    allowed = frozenset(enums) if hashable else None
+
+    def check(v):
+        if hashable and isinstance(v, str):
+            if v in allowed:
+                return None
+        elif any(_equal(e, v) for e in enums):
+            return None
+        return [((), f"{v!r} is not one of {enums!r}")]
+    return check
+
+
+def _pattern(pattern, schema) -> Check:
+    search = re.compile(pattern).search
+
+    def check(v):
+        if isinstance(v, str) and not search(v):
+            return [((), f"{v!r} does not match {pattern!r}")]
+    return check
+
+
+def _min_length(n, schema) -> Check:
+    def check(v):
+        if isinstance(v, str) and len(v) < n:
+            return [((), f"{v!r} {_too_short(n)}")]
+    return check
+
+
+def _min_items(n, schema) -> Check:
+    def check(v):
+        if isinstance(v, list) and len(v) < n:
+            return [((), f"{v!r} {_too_short(n)}")]
+    return check
+
+
+def _minimum(minimum, schema) -> Check:
+    def check(v):
+        if _TYPES["number"](v) and v < minimum:
+            return [((), f"{v!r} is less than the minimum of {minimum!r}")]
+    return check
+
+
+def _required(names, schema) -> Check:
+    def check(v):
+        if isinstance(v, dict):
+            missing = [((), f"{name!r} is a required property") for name in names if name not in v]
+            return missing or None
+    return check
+
+
+def _properties(properties, schema) -> Check:
+    checks = [(name, compile_schema(sub)) for name, sub in properties.items()]
+
+    def check(v):
+        if not isinstance(v, dict):
+            return None
+        out = None
+        for name, sub in checks:
+            if name in v:
+                errors = sub(v[name])
+                if errors:
+                    out = out or []
+                    out.extend(((name,) + path, msg) for path, msg in errors)
+        return out
+    return check
+
+
+def _items(items, schema) -> Check:
+    sub = compile_schema(items)
+
+    def check(v):
+        if not isinstance(v, list):
+            return None
+        out = None
+        for i, item in enumerate(v):
+            errors = sub(item)
+            if errors:
+                out = out or []
+                out.extend(((i,) + path, msg) for path, msg in errors)
+        return out
+    return check
+
+
+def _one_of(subschemas, schema) -> Check:
+    checks = [compile_schema(sub) for sub in subschemas]
+
+    def check(v):
+        valid = [i for i, sub in enumerate(checks) if not sub(v)]
+        if not valid:
+            return [((), f"{v!r} is not valid under any of the given schemas")]
+        if len(valid) > 1:
+            # jsonschema lists the later matches first, then the first one
+            reprs = ", ".join(repr(subschemas[i]) for i in valid[1:] + valid[:1])
+            return [((), f"{v!r} is valid under each of {reprs}")]
+    return check
+
+
+_KEYWORDS: Dict[str, Callable[[Any, dict], Check]] = {
+    "type": _type,
+    "enum": _enum,
+    "pattern": _pattern,
+    "minLength": _min_length,
+    "minItems": _min_items,
+    "minimum": _minimum,
+    "required": _required,
+    "properties": _properties,
+    "items": _items,
+    "oneOf": _one_of,
+}
+
+
+def compile_schema(schema: dict) -> Check:
+    """
+    Compiles a schema (the Draft 7 keywords used in this module) into a single check.
+    Keywords are checked in the schema's order, like Draft7Validator.iter_errors.
+    """
+    unsupported = set(schema) - set(_KEYWORDS)
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unsupported)}")
+    checks = [_KEYWORDS[keyword](value, schema) for keyword, value in schema.items()]
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(v):
+        out = None
+        for c in checks:
+            errors = c(v)
+            if errors:
+                out = out or []
+                out.extend(errors)
+        return out
+    return check
+
+
+def _format(errors: Iterable[Tuple[tuple, str]]) -> List[str]:
+    ordered = sorted(errors, key=lambda e: list(e[0]))
+    return [f"{'.'.join(str(p) for p in path)}: {msg}" for path, msg in ordered]
+
+
 # --- Validator Functions --------------------------------------------------
 
+_check_course = compile_schema(COURSE_SCHEMA)
+# COURSES_SCHEMA without the per-course part, which CoursesValidator handles
+_check_courses_document = compile_schema({
+    **COURSES_SCHEMA,
+    "properties": {**COURSES_SCHEMA["properties"],
+                   "cursos": {k: v for k, v in COURSES_SCHEMA["properties"]["cursos"].items() if k != "items"}},
+})
+_check_curriculum = compile_schema(CURRICULUM_SCHEMA)
+
+
+class CoursesValidator:
+    """
+    Validates courses documents course by course, remembering each course's errors by
+    its code and content. Validating a re-extraction again only checks the courses that
+    were added or changed; pass `changed` (codes) to skip even the content comparison
+    for courses the caller knows are untouched.
+    """
+
+    def __init__(self):
+        # codigo -> (serialized course, errors relative to the course)
+        self._results: Dict[Any, Tuple[str, list]] = {}
+        self.checked = 0
+        self.reused = 0
+
+    def validate(self, data: dict, changed: Optional[Iterable[str]] = None) -> List[str]:
+        """Returns every error of the document (empty list = valid), in one pass."""
+        errors = list(_check_courses_document(data) or ())
+        cursos = data.get("cursos") if isinstance(data, dict) else None
+        if isinstance(cursos, list):
+            changed = set(changed) if changed is not None else None
+            for i, course in enumerate(cursos):
+                errors.extend((("cursos", i) + path, msg) for path, msg in self._course_errors(course, changed))
+        return _format(errors)
+
+    def _course_errors(self, course, changed: Optional[set]) -> list:
+        code = course.get("codigo") if isinstance(course, dict) else None
+        if not isinstance(code, str):
+            self.checked += 1
+            return _check_course(course) or []
+        cached = self._results.get(code)
+        if changed is not None and code not in changed and cached is not None:
+            self.reused += 1
+            return cached[1]
+        key = json.dumps(course, ensure_ascii=False, default=repr)
+        if cached is not None and cached[0] == key:
+            self.reused += 1
+            return cached[1]
+        self.checked += 1
+        result = _check_course(course) or []
+        self._results[code] = (key, result)
+        return result
+
+    def clear(self):
+        self._results.clear()
+
+
+# Shared by validate_courses_json, so repeated extractions in one process reuse results
+_courses_validator = CoursesValidator()
+
 
-def validate_courses_json(data: dict) -> List[str]:
+def validate_courses_json(data: dict, changed: Optional[Iterable[str]] = None) -> List[str]:
     """
     Validate courses extraction output against COURSES_SCHEMA.
     Returns list of error messages (empty list = valid).
     """
-    validator = Draft7Validator(COURSES_SCHEMA)
-    errors = sorted(validator.iter_errors(data), key=lambda e: list(e.path))
-    if not errors:
-        return []
-    return [f"{'.'.join(str(p) for p in e.path)}: {e.message}" for e in errors]
+    return _courses_validator.validate(data, changed)
 
 
 def validate_curriculum_json(data: dict) -> List[str]:
@@ -180,8 +429,4 @@ def validate_curriculum_json(data: dict) -> List[str]:
     Validate curriculum extraction output against CURRICULUM_SCHEMA.
     Returns list of error messages (empty list = valid).
     """
-    validator = Draft7Validator(CURRICULUM_SCHEMA)
-    errors = sorted(validator.iter_errors(data), key=lambda e: list(e.path))
-    if not errors:
-        return []
-    return [f"{'.'.join(str(p) for p in e.path)}: {e.message}" for e in errors]
+    return _format(_check_curriculum(data) or ())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Synthetic course-offering generator for scale testing.
+
+Learns the distributions of a real catalog (sections per course, session patterns,
+start times, durations, rooms, quotas, professor names, credits and prerequisite tree
+shapes) and samples a new catalog of any size in the COURSES_SCHEMA format.
+The same template, scale and seed always produce the same catalog.
+
+Usage:
+  python scripts/generate_catalog.py --scale 10 --seed 1
+  python scripts/generate_catalog.py --courses 50000 --output input/synthetic.json --validate
+"""
+import argparse
+import copy
+import json
+import random
+import string
+import sys
+from collections import Counter, defaultdict
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path so 'scripts.extractors' imports work
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_TEMPLATE = Path(__file__).parent.parent / "input" / "courses_2026-1_v4.json"
+
+# Codes are a 3-character prefix drawn from the template (e.g. "138", "1MN") plus 3 digits
+_CODE_SUFFIXES = 1000
+_MAX_PREFIXES = 1000
+
+
+def _minutes(hhmm: str) -> int:
+    h, m = hhmm.split(":")
+    return int(h) * 60 + int(m)
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class Distribution:
+    """Empirical distribution of hashable values, sampled with a caller-supplied Random."""
+
+    def __init__(self, values=()):
+        self.counts = Counter(values)
+        self._values: List[Any] = []
+        self._cum_weights: List[int] = []
+
+    def add(self, value):
+        self.counts[value] += 1
+        self._values = []
+
+    def sample(self, rng: random.Random):
+        if not self._values:
+            items = sorted(self.counts.items(), key=repr)
+            self._values = [value for value, _ in items]
+            self._cum_weights = list(accumulate(count for _, count in items))
+        return rng.choices(self._values, cum_weights=self._cum_weights)[0]
+
+
+class CatalogProfile:
+    """Statistics of a real catalog that the generator reproduces."""
+
+    def __init__(self, data: dict):
+        cursos = data["cursos"]
+        self.metadata = data.get("metadata", {})
+        self.n_courses = len(cursos)
+        self.names = [c["nombre"] for c in cursos]
+        self.code_prefixes = Distribution(c["codigo"][:3] for c in cursos)
+        self.credits = Distribution(c["creditos"] for c in cursos)
+        self.sections = Distribution(len(c["secciones"]) for c in cursos)
+        # Prerequisite trees with their codes stripped, so only the shape is reused
+        self.prereq_shapes = Distribution(json.dumps(self._shape(c.get("prerequisitos"))) for c in cursos)
+
+        # Session pattern of a section: sorted (tipo, sessions of that tipo, duration) groups
+        self.patterns = Distribution()
+        self.starts: Dict[str, Distribution] = defaultdict(Distribution)
+        self.days: Dict[str, Distribution] = defaultdict(Distribution)
+        self.rooms: Dict[str, Distribution] = defaultdict(Distribution)
+        self.quotas = Distribution()
+        self.jps = Distribution()
+        self.notes = Distribution()
+        surnames, given = Counter(), Counter()
+        professors = set()
+
+        for course in cursos:
+            for section in course["secciones"]:
+                groups = defaultdict(list)
+                for s in section["sesiones"]:
+                    groups[s["tipo"]].append(s)
+                    self.starts[s["tipo"]].add(s["hora_inicio"])
+                    self.days[s["tipo"]].add(s["dia"])
+                    self.rooms[s["tipo"]].add(s.get("aula"))
+                self.patterns.add(tuple(sorted(
+                    (tipo, len(ss), _minutes(ss[0]["hora_fin"]) - _minutes(ss[0]["hora_inicio"]))
+                    for tipo, ss in groups.items()
+                )))
+                quotas = [s.get("cupos") for s in section["sesiones"]]
+                self.quotas.add(quotas[0] if quotas else None)
+                self.jps.add(len(section.get("jps", [])))
+                self.notes.add(section.get("observaciones") or "")
+                for name in section.get("docentes", []):
+                    professors.add(name)
+                    if "," in name:
+                        last, first = name.split(",", 1)
+                        surnames[last.strip()] += 1
+                        given[first.strip()] += 1
+
+        self.n_professors = max(1, len(professors))
+        self.surnames = Distribution(surnames.elements()) if surnames else Distribution(["DOCENTE"])
+        self.given_names = Distribution(given.elements()) if given else Distribution(["Por Asignar"])
+
+    @classmethod
+    def _shape(cls, tree):
+        if isinstance(tree, dict):
+            if "code" in tree:
+                return {"code": None}
+            if "items" in tree:
+                items = [cls._shape(item) for item in tree["items"]]
+                shape = {"items": [item for item in items if item is not None]}
+                if "op" in tree:
+                    shape["op"] = tree["op"]
+                return shape
+            return None
+        return None
+
+
+class CatalogGenerator:
+    """Samples synthetic catalogs that follow a CatalogProfile."""
+
+    def __init__(self, profile: CatalogProfile, seed: int = 0):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        # prefix -> suffixes not used yet, in a seeded random order
+        self._free_suffixes: Dict[str, List[int]] = {}
+        self._overflow: Optional[List[str]] = None
+        self._names: Counter = Counter()
+
+    def generate(self, n_courses: int, ciclo: Optional[str] = None) -> dict:
+        p = self.profile
+        # Professor pool grows with the catalog, with a few very busy professors (Zipf-like)
+        n_prof = max(1, round(p.n_professors * n_courses / max(p.n_courses, 1)))
+        professors = [self._professor() for _ in range(n_prof)]
+        prof_weights = list(accumulate(1.0 / (rank + 1) ** 0.8 for rank in range(n_prof)))
+
+        cursos: List[dict] = []
+        for _ in range(n_courses):
+            code = self._code()
+            cursos.append({
+                "codigo": code,
+                "nombre": self._name(),
+                "creditos": p.credits.sample(self.rng),
+                "prerequisitos": self._prerequisites(cursos),
+                "secciones": [self._section(i, professors, prof_weights)
+                              for i in range(p.sections.sample(self.rng))],
+            })
+
+        metadata = dict(p.metadata)
+        metadata.update({
+            "ciclo": ciclo or p.metadata.get("ciclo", "2026-1"),
+            # From the template, so the output depends only on template, size and seed
+            "fecha_extraccion": p.metadata.get("fecha_extraccion", "1970-01-01"),
+            "version": "synthetic",
+            "fecha_version": None,
+        })
+        return {"metadata": metadata, "cursos": cursos}
+
+    def _code(self) -> str:
+        prefix = self.profile.code_prefixes.sample(self.rng)
+        if not self._suffixes(prefix):
+            # Prefix exhausted: fall back to the numeric prefixes, in a seeded random order
+            prefix = self._overflow_prefix()
+        return f"{prefix}{self._free_suffixes[prefix].pop():03d}"
+
+    def _overflow_prefix(self) -> str:
+        if self._overflow is None:
+            self._overflow = [f"{n:03d}" for n in self.rng.sample(range(_MAX_PREFIXES), _MAX_PREFIXES)]
+        while self._overflow and not self._suffixes(self._overflow[-1]):
+            self._overflow.pop()
+        if not self._overflow:
+            raise ValueError("No course codes left for a catalog this large")
+        return self._overflow[-1]
+
+    def _suffixes(self, prefix: str) -> List[int]:
+        free = self._free_suffixes.get(prefix)
+        if free is None:
+            free = self._free_suffixes[prefix] = self.rng.sample(range(_CODE_SUFFIXES), _CODE_SUFFIXES)
+        return free
+
+    def _name(self) -> str:
+        base = self.rng.choice(self.profile.names)
+        self._names[base] += 1
+        n = self._names[base]
+        return base if n == 1 else f"{base} ({n})"
+
+    def _professor(self) -> str:
+        return f"{self.profile.surnames.sample(self.rng)}, {self.profile.given_names.sample(self.rng)}"
+
+    def _prerequisites(self, earlier: List[dict]):
+        shape = json.loads(self.profile.prereq_shapes.sample(self.rng))
+        if shape is None or not earlier:
+            return None
+
+        def fill(node):
+            if "code" in node:
+                course = self.rng.choice(earlier)
+                return {"code": course["codigo"], "name": course["nombre"][:40]}
+            filled = copy.copy(node)
+            filled["items"] = [fill(item) for item in node["items"]]
+            return filled
+
+        return fill(shape)
+
+    def _section(self, index: int, professors: List[str], cum_weights: List[float]) -> dict:
+        p, rng = self.profile, self.rng
+        principal = rng.choices(professors, cum_weights=cum_weights)[0]
+        jps = [rng.choice(professors) for _ in range(p.jps.sample(rng))]
+        quota = p.quotas.sample(rng)
+
+        sesiones = []
+        for tipo, count, duration in p.patterns.sample(rng):
+            # Sessions of one type share the start time and fall on different days
+            start = _minutes(p.starts[tipo].sample(rng))
+            start = min(start, 23 * 60 - duration) if duration < 23 * 60 else 0
+            days: List[str] = []
+            for _ in range(count * 4):
+                if len(days) == count:
+                    break
+                day = p.days[tipo].sample(rng)
+                if day not in days:
+                    days.append(day)
+            for day in days:
+                sesiones.append({
+                    "tipo": tipo, "dia": day,
+                    "hora_inicio": _hhmm(start), "hora_fin": _hhmm(start + duration),
+                    "aula": p.rooms[tipo].sample(rng), "cupos": quota,
+                })
+
+        return {
+            "seccion": self._section_label(index),
+            "docentes": [principal] + jps,
+            "docente_principal": principal,
+            "jps": jps,
+            "observaciones": p.notes.sample(rng),
+            "sesiones": sesiones,
+        }
+
+    @staticmethod
+    def _section_label(index: int) -> str:
+        label = ""
+        index += 1
+        while index:
+            index, rem = divmod(index - 1, 26)
+            label = string.ascii_uppercase[rem] + label
+        return label
+
+
+def generate_catalog(n_courses: int, seed: int = 0, template: Path = DEFAULT_TEMPLATE) -> dict:
+    """Synthetic catalog of n_courses courses, statistically similar to `template`."""
+    with open(template, encoding="utf-8") as f:
+        profile = CatalogProfile(json.load(f))
+    return CatalogGenerator(profile, seed).generate(n_courses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MatriculaUp synthetic catalog generator")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", type=float, default=1.0,
+                      help="Size as a multiple of the template catalog (default: 1)")
+    size.add_argument("--courses", type=int, help="Exact number of courses")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--template", default=str(DEFAULT_TEMPLATE),
+                        help="Real courses JSON to learn distributions from")
+    parser.add_argument("--output", help="Output path (default: input/courses_synthetic_x<scale>_s<seed>.json)")
+    parser.add_argument("--validate", action="store_true", help="Validate against COURSES_SCHEMA")
+    args = parser.parse_args()
+
+    with open(args.template, encoding="utf-8") as f:
+        profile = CatalogProfile(json.load(f))
+    n_courses = args.courses if args.courses is not None else max(1, round(profile.n_courses * args.scale))
+    data = CatalogGenerator(profile, args.seed).generate(n_courses)
+
+    if args.validate:
+        from scripts.extractors.validators import validate_courses_json
+        errors = validate_courses_json(data)
+        if errors:
+            for err in errors[:20]:
+                print(f"x {err}", file=sys.stderr)
+            sys.exit(1)
+
+    scale_tag = f"{n_courses}c" if args.courses is not None else f"x{args.scale:g}"
+    out_path = Path(args.output or f"input/courses_synthetic_{scale_tag}_s{args.seed}.json")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    n_sections = sum(len(c["secciones"]) for c in data["cursos"])
+    print(f"Output written to {out_path} ({n_courses} courses, {n_sections} sections)")
+
+
+if __name__ == "__main__":
+    main()
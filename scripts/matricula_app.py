@@ -1,16 +1,41 @@
+import atexit
 import gradio as gr
+import functools
+import hashlib
+import inspect
+import io
+import numpy as np
 import pandas as pd
 import json
+import multiprocessing
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 import unicodedata
-from datetime import datetime, timedelta
-from typing import Dict, List, Set, Tuple, Optional
-import io
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from PIL import Image
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Set, Tuple, Optional
+from PIL import Image, ImageDraw, ImageFont
+try:
+    import pyarrow as pa
+except ImportError:  # sin pyarrow no hay catálogo compartido (cada proceso lee el archivo)
+    pa = None
 WORKSPACE_ROOT = os.path.dirname(os.path.dirname(__file__))
 
+# Utilidades compartidas con la app de escritorio (src/matriculaup)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from matriculaup.core.timeutil import hhmm_to_minutes
+# Lectura de CSV/Excel compartida con convert_excel_to_csv.py
+from schedule_io import read_csv_flexible, to_columnar_frame
+
 
 # Mapeo de carreras a sus archivos JSON de cursos obligatorios
 CAREER_CURRICULUM_MAP = {
@@ -42,6 +67,567 @@ def match_keywords(text: str, keywords: List[str]) -> bool:
     return all(kw in text_norm for kw in keywords)
 
 
+def _entry_slots(e: dict) -> List[dict]:
+    """Retorna los slots de un bloque (formato con 'slots' o legacy de un solo slot)."""
+    if 'slots' in e and isinstance(e['slots'], list):
+        return e['slots']
+    if e.get('inicio') and e.get('fin'):
+        return [{'dia': e.get('dia'), 'inicio': e.get('inicio'), 'fin': e.get('fin'), 'tipo': e.get('tipo')}]
+    return []
+
+
+class BoundedCache:
+    """
+    Caché LRU acotada por cantidad de entradas y, opcionalmente, por bytes (según `sizeof`)
+    y por antigüedad (`ttl` en segundos). Lleva contadores de aciertos, fallos y
+    desalojos, y es segura para usar desde varios hilos del servidor.
+    """
+
+    # Todas las cachés vivas, para reportar métricas agregadas por nombre
+    _registry: 'weakref.WeakSet[BoundedCache]' = weakref.WeakSet()
+
+    def __init__(self, name: str, max_entries: int = 256, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizeof: Callable[[object], int] = sys.getsizeof,
+                 on_evict: Optional[Callable[[object, object], None]] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        # Se llama con (key, valor) cuando una entrada sale por LRU, bytes o TTL
+        self._on_evict = on_evict
+        # key -> (valor, bytes, momento de inserción); orden de uso menos a más reciente
+        self._data: "OrderedDict[object, Tuple[object, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        BoundedCache._registry.add(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Un valor más grande que toda la caché no se guarda
+                return
+            self._data[key] = (value, size, time.monotonic())
+            self.nbytes += size
+            while self._data and (len(self._data) > self.max_entries
+                                  or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                self._evict(next(iter(self._data)))
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._drop(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            dropped = list(self._data.items())
+            self._data.clear()
+            self.nbytes = 0
+        # Mismo aviso que un desalojo, para que el dueño libere lo asociado (p.ej. archivos)
+        if self._on_evict is not None:
+            for key, (value, _, _) in dropped:
+                self._on_evict(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._data),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, int]]:
+        """Métricas sumadas de todas las cachés vivas con el mismo nombre (p.ej. de todas las sesiones)."""
+        totals: Dict[str, Dict[str, int]] = {}
+        for cache in list(cls._registry):
+            agg = totals.setdefault(cache.name, {'instances': 0})
+            agg['instances'] += 1
+            for k, v in cache.stats().items():
+                agg[k] = agg.get(k, 0) + v
+        return totals
+
+    def _live_entry(self, key) -> Optional[Tuple[object, int, float]]:
+        entry = self._data.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+            self._evict(key)
+            return None
+        return entry
+
+    def _evict(self, key):
+        value = self._data[key][0]
+        self._drop(key)
+        self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def _drop(self, key):
+        _, size, _ = self._data.pop(key)
+        self.nbytes -= size
+
+
+class BackgroundJobs:
+    """
+    Pool acotado de procesos para el trabajo pesado de CPU (dibujar y exportar horarios).
+    El handler de Gradio espera el resultado sin retener el GIL, así que el render o la
+    exportación de un usuario no frena las búsquedas de los demás. Si ya hay `max_pending`
+    trabajos en curso, los siguientes esperan su turno.
+
+    Sin start() (p.ej. al importar el módulo desde tests o scripts) todo corre en línea.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._lock = threading.Lock()
+        self._max_workers = 0
+        self.pending = 0
+        self.restarts = 0
+
+    @property
+    def active(self) -> bool:
+        return self._executor is not None
+
+    def start(self, max_workers: int, max_pending: Optional[int] = None):
+        if max_workers <= 0 or self._executor is not None:
+            return
+        self._max_workers = max_workers
+        self._executor = self._new_executor()
+        self._slots = threading.BoundedSemaphore(max_pending or max_workers * 4)
+        atexit.register(self.shutdown)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # 'spawn' en todas las plataformas: hacer fork de un servidor con hilos no es seguro
+        executor = ProcessPoolExecutor(self._max_workers, mp_context=multiprocessing.get_context('spawn'))
+        # Arrancar los workers de una vez: cada uno importa pandas/PIL y tarda unos segundos
+        for _ in range(self._max_workers):
+            executor.submit(int)
+        return executor
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Cambia un pool roto por uno nuevo (una sola vez aunque varios hilos lo vean roto)."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self.restarts += 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def run(self, fn, *args):
+        """Ejecuta fn(*args) en el pool (o en línea si no está iniciado) y retorna su resultado."""
+        executor = self._executor
+        if executor is None:
+            return fn(*args)
+        with self._lock:
+            self.pending += 1
+        try:
+            with self._slots:
+                return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # Un worker murió (p.ej. sin memoria): el pool queda inservible, se reemplaza
+            # para los próximos trabajos y este se hace en línea
+            self._restart(executor)
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+
+background_jobs = BackgroundJobs()
+
+
+class WeekScheduleRenderer:
+    """
+    Dibuja la vista semanal (7:30 AM - 11:00 PM) directamente con PIL.
+
+    La grilla (fondo, encabezados de días, líneas y horas) se dibuja una sola vez por
+    tipo de vista y se copia en cada render; solo se pintan los bloques de cursos.
+    """
+
+    # Subir al cambiar cualquier cosa del dibujo: invalida las imágenes guardadas en RenderCache
+    RENDER_VERSION = 1
+
+    DAYS = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO']
+    START_MIN = 7 * 60 + 30
+    END_MIN = 23 * 60
+    SLOT_MIN = 30
+
+    # Geometría en píxeles (equivalente a la figura de 16" a 150 dpi que usaba matplotlib)
+    MARGIN = 16
+    TITLE_H = 64
+    HEADER_H = 56
+    TIME_COL_W = 140
+    DAY_W = 372
+    ROW_H = 44
+    BLOCK_PAD = 12
+
+    BG_COLOR = '#f8f9fa'
+    GRID_COLOR = '#dee2e6'
+    GRID_COLOR_HALF = '#ebedef'
+    HEADER_BG = '#4a5568'
+    TEXT_COLOR = '#2d3748'
+
+    STYLES = {
+        'CLASE': {'ok': ('#4dabf7', '#1971c2'), 'conf': ('#ff6b6b', '#c92a2a'), 'title': "Clases y Prácticas"},
+        'EXAM': {'ok': ('#ffd43b', '#f59f00'), 'conf': ('#ff8787', '#c92a2a'), 'title': "Exámenes"},
+    }
+
+    def __init__(self):
+        self._templates: Dict[str, Image.Image] = {}
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+        """Carga (una sola vez por tamaño) DejaVu/Arial; si no existen, la fuente por defecto de PIL."""
+        names = ['DejaVuSans-Bold.ttf', 'arialbd.ttf'] if bold else ['DejaVuSans.ttf', 'arial.ttf']
+        for name in names:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            return ImageFont.load_default()
+
+    @property
+    def n_rows(self) -> int:
+        return (self.END_MIN - self.START_MIN) // self.SLOT_MIN
+
+    @property
+    def grid_top(self) -> int:
+        return self.MARGIN + self.TITLE_H + self.HEADER_H
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        width = self.TIME_COL_W + len(self.DAYS) * self.DAY_W + self.MARGIN
+        height = self.grid_top + self.n_rows * self.ROW_H + self.MARGIN
+        return width, height
+
+    def day_x(self, d_index: int) -> int:
+        return self.TIME_COL_W + d_index * self.DAY_W
+
+    def minute_y(self, minutes: int) -> float:
+        return self.grid_top + (minutes - self.START_MIN) / self.SLOT_MIN * self.ROW_H
+
+    def template(self, filter_types: str) -> Image.Image:
+        """Grilla base para 'CLASE' o 'EXAM' (se construye una vez y se reutiliza)."""
+        img = self._templates.get(filter_types)
+        if img is not None:
+            return img
+
+        width, height = self.size
+        img = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(img)
+        grid_right = self.day_x(len(self.DAYS))
+        grid_bottom = self.grid_top + self.n_rows * self.ROW_H
+
+        # Título
+        draw.text(((self.TIME_COL_W + grid_right) / 2, self.MARGIN + self.TITLE_H / 2),
+                  self.STYLES[filter_types]['title'], font=self.font(29, True),
+                  fill=self.TEXT_COLOR, anchor='mm')
+
+        # Fondo y encabezados de días
+        draw.rectangle([self.TIME_COL_W, self.grid_top, grid_right, grid_bottom], fill=self.BG_COLOR)
+        header_top = self.grid_top - self.HEADER_H
+        for i, d in enumerate(self.DAYS):
+            x = self.day_x(i)
+            draw.rectangle([x, header_top, x + self.DAY_W, self.grid_top], fill=self.HEADER_BG)
+            draw.text((x + self.DAY_W / 2, header_top + self.HEADER_H / 2), d,
+                      font=self.font(23, True), fill='white', anchor='mm')
+
+        # Líneas horizontales: más gruesas cada hora, con la etiqueta de hora
+        for b in range(self.n_rows + 1):
+            y = self.grid_top + b * self.ROW_H
+            if b % 2 == 0:
+                draw.line([self.TIME_COL_W, y, grid_right, y], fill=self.GRID_COLOR, width=3)
+                minutes = self.START_MIN + b * self.SLOT_MIN
+                label = datetime.strptime(f"{minutes // 60:02d}:{minutes % 60:02d}", '%H:%M').strftime('%I:%M %p')
+                draw.text((self.TIME_COL_W - 14, y), label, font=self.font(19, True),
+                          fill=self.TEXT_COLOR, anchor='rm')
+            else:
+                draw.line([self.TIME_COL_W, y, grid_right, y], fill=self.GRID_COLOR_HALF, width=1)
+
+        # Columnas de días
+        for i in range(len(self.DAYS) + 1):
+            x = self.day_x(i)
+            draw.line([x, self.grid_top, x, grid_bottom], fill=self.GRID_COLOR, width=2)
+
+        self._templates[filter_types] = img
+        return img
+
+    def _wrap(self, text: str, font: ImageFont.ImageFont, max_width: float) -> str:
+        lines: List[str] = []
+        current = ''
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            if current and font.getlength(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return '\n'.join(lines)
+
+    def render(self, blocks: List[dict], filter_types: str) -> Image.Image:
+        """
+        Dibuja los bloques sobre una copia de la grilla.
+        Cada bloque: {'day': índice de día, 'start'/'end': minutos, 'curso', 'secc', 'overlap'}.
+        """
+        img = self.template(filter_types).copy()
+        draw = ImageDraw.Draw(img)
+        style = self.STYLES[filter_types]
+        text_w = self.DAY_W - 2 * self.BLOCK_PAD - 12
+
+        for blk in blocks:
+            face, edge = style['conf'] if blk['overlap'] else style['ok']
+            x1 = self.day_x(blk['day']) + self.BLOCK_PAD
+            x2 = x1 + self.DAY_W - 2 * self.BLOCK_PAD
+            y1 = self.minute_y(blk['start'])
+            y2 = self.minute_y(blk['end'])
+            draw.rounded_rectangle([x1, y1, x2, y2], radius=4, fill=face, outline=edge,
+                                   width=5 if blk['overlap'] else 4)
+
+            # Texto del curso: ajustar tamaño de fuente según altura
+            curso_text = str(blk['curso'])
+            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+            height = y2 - y1
+            if height > 4.3 * self.ROW_H:
+                font = self.font(19, True)
+                draw.multiline_text((cx, cy - 14), self._wrap(curso_text, font, text_w), font=font,
+                                    fill='white', anchor='md', align='center')
+                draw.text((cx, cy + 14), f"Secc. {blk['secc']}", font=self.font(17),
+                          fill='white', anchor='mt')
+            elif height > 2 * self.ROW_H:
+                font = self.font(17, True)
+                draw.multiline_text((cx, cy), self._wrap(curso_text, font, text_w), font=font,
+                                    fill='white', anchor='mm', align='center')
+            else:
+                short_name = curso_text[:15] + '...' if len(curso_text) > 15 else curso_text
+                draw.text((cx, cy), short_name, font=self.font(15), fill='white', anchor='mm')
+
+        return img
+
+    def png_bytes(self, blocks: List[dict], filter_types: str) -> bytes:
+        buf = io.BytesIO()
+        self.render(blocks, filter_types).save(buf, 'PNG', compress_level=1)
+        return buf.getvalue()
+
+
+# Plantillas y fuentes compartidas por todas las instancias
+schedule_renderer = WeekScheduleRenderer()
+
+
+def render_png_job(blocks: List[dict], filter_types: str) -> bytes:
+    """Trabajo de BackgroundJobs: dibuja una vista con el renderer del proceso worker."""
+    return schedule_renderer.png_bytes(blocks, filter_types)
+
+
+class RenderCache:
+    """
+    Imágenes de horario ya dibujadas, guardadas como PNG comprimido y direccionadas por
+    contenido: la clave es el hash de los bloques a dibujar + la vista + la versión del
+    renderer, así que un mismo horario se dibuja una sola vez aunque esté en otro slot
+    (1-3) o en la sesión de otro usuario.
+
+    Los PNG se guardan en memoria (acotada por bytes) y como archivos en `directory`, que
+    es lo que se entrega a Gradio: así la UI no vuelve a codificar la imagen en cada
+    respuesta. Con un `directory` fijo los archivos sobreviven a reinicios y se comparten
+    entre procesos; sin él se usa una carpeta temporal del proceso. El límite de disco solo
+    cuenta (y al desalojar solo borra) los archivos que escribió este proceso.
+    """
+
+    BLOCK_FIELDS = ('day', 'start', 'end', 'curso', 'secc', 'overlap')
+
+    def __init__(self, renderer: WeekScheduleRenderer, max_bytes: int = 64 * 1024 * 1024,
+                 directory: Optional[str] = None, max_disk_bytes: int = 512 * 1024 * 1024,
+                 jobs: Optional[BackgroundJobs] = None):
+        self.renderer = renderer
+        # Con un pool activo los renders nuevos se hacen en los workers (con el renderer del módulo)
+        self.jobs = jobs
+        self._directory = directory
+        self._memory = BoundedCache('rendered_png', max_entries=4096, max_bytes=max_bytes, sizeof=len)
+        # key -> (ruta, bytes); al salir de la caché se borra el archivo
+        self._files = BoundedCache('rendered_files', max_entries=100000, max_bytes=max_disk_bytes,
+                                   sizeof=lambda v: v[1], on_evict=lambda _, v: self._remove(v[0]))
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='matriculaup_render_')
+            atexit.register(shutil.rmtree, self._directory, ignore_errors=True)
+        return self._directory
+
+    def key(self, blocks: List[dict], filter_types: str) -> str:
+        canonical = json.dumps(
+            [self.renderer.RENDER_VERSION, filter_types, self._canonical_blocks(blocks)],
+            ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _canonical_blocks(blocks: List[dict]) -> List[list]:
+        rows = [[b['day'], b['start'], b['end'], str(b['curso']), str(b['secc']), bool(b['overlap'])] for b in blocks]
+        return sorted(rows)
+
+    def render(self, blocks: List[dict], filter_types: str, key: Optional[str] = None) -> Image.Image:
+        """Imagen PIL de la vista (decodificada del PNG guardado si ya se dibujó antes)."""
+        key = key or self.key(blocks, filter_types)
+        png = self._stored_png(key)
+        if png is None:
+            img, png = self._draw(key, blocks, filter_types)
+            if img is not None:
+                return img
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        return img
+
+    def image(self, key: str) -> Optional[Image.Image]:
+        """Imagen ya dibujada con esa clave, o None si ya no está guardada."""
+        png = self._stored_png(key)
+        if png is None:
+            return None
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        return img
+
+    def render_png(self, blocks: List[dict], filter_types: str) -> bytes:
+        """PNG de la vista; solo se dibuja si ningún horario idéntico se dibujó antes."""
+        key = self.key(blocks, filter_types)
+        png = self._stored_png(key)
+        if png is None:
+            _, png = self._draw(key, blocks, filter_types)
+        return png
+
+    def render_file(self, blocks: List[dict], filter_types: str):
+        """
+        Ruta a un archivo PNG con la vista, listo para devolver a un gr.Image. Si el archivo
+        no se puede escribir (carpeta llena o de solo lectura), la imagen PIL en su lugar.
+        """
+        key = self.key(blocks, filter_types)
+        entry = self._files.get(key)
+        if entry is not None and os.path.exists(entry[0]):
+            return entry[0]
+        path = self._path(key)
+        if os.path.exists(path):
+            # Dibujado por otro proceso (o en una ejecución anterior): se sirve sin adueñarse de él
+            return path
+        png = self._memory.get(key)
+        if png is None:
+            _, png = self._draw(key, blocks, filter_types)
+        elif self._write(path, png):
+            self._files.put(key, (path, len(png)))
+        if os.path.exists(path):
+            return path
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        return img
+
+    def _draw(self, key: str, blocks: List[dict], filter_types: str) -> Tuple[Optional[Image.Image], bytes]:
+        # Se dibuja en el orden canónico para que la imagen dependa solo de la clave
+        ordered = [dict(zip(self.BLOCK_FIELDS, row)) for row in self._canonical_blocks(blocks)]
+        if self.jobs is not None and self.jobs.active:
+            img = None
+            png = self.jobs.run(render_png_job, ordered, filter_types)
+        else:
+            img = self.renderer.render(ordered, filter_types)
+            buf = io.BytesIO()
+            img.save(buf, 'PNG', compress_level=1)
+            png = buf.getvalue()
+        self._memory.put(key, png)
+        path = self._path(key)
+        if self._write(path, png):
+            self._files.put(key, (path, len(png)))
+        return img, png
+
+    def _stored_png(self, key: str) -> Optional[bytes]:
+        png = self._memory.get(key)
+        if png is not None:
+            return png
+        try:
+            with open(self._path(key), 'rb') as f:
+                png = f.read()
+        except OSError:
+            return None
+        self._memory.put(key, png)
+        return png
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.png")
+
+    @staticmethod
+    def _write(path: str, png: bytes) -> bool:
+        """
+        Escribe el PNG sin pisar uno existente. True solo si este proceso creó el archivo:
+        solo esos se borran al desalojarlos, los demás pueden estar sirviéndose desde otro
+        proceso que comparte la carpeta.
+        """
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            try:
+                # link falla si el archivo ya existe (a diferencia de replace)
+                os.link(tmp_path, path)
+            except FileExistsError:
+                return False
+            except OSError:
+                # Sistema de archivos sin enlaces duros
+                if os.path.exists(path):
+                    return False
+                os.replace(tmp_path, path)
+            return True
+        except OSError:
+            return False
+        finally:
+            RenderCache._remove(tmp_path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+render_cache = RenderCache(schedule_renderer, directory=os.environ.get('MATRICULA_RENDER_CACHE_DIR') or None,
+                           jobs=background_jobs)
+
+
 class CurriculumData:
     """Gestiona los datos de currículo de una carrera."""
 
@@ -83,11 +669,395 @@ class CurriculumData:
         return None
 
 
+# Caché de lecturas: copia tipada en Feather de cada CSV/Excel ya leído (requiere pyarrow;
+# sin él se lee siempre el archivo original). Cada archivo subido deja su copia, así que la
+# carpeta se acota: al pasar los límites se borran las copias usadas hace más tiempo
+READ_CACHE_DIR = os.environ.get('MATRICULA_CACHE_DIR', os.path.join(WORKSPACE_ROOT, 'output', '.cache'))
+READ_CACHE_VERSION = 1
+READ_CACHE_MAX_FILES = 64
+READ_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# ruta -> (tamaño, mtime_ns, sha256): evita volver a hashear un archivo que no cambió
+# (acotada: cada archivo subido llega con una ruta temporal distinta)
+_source_hashes = BoundedCache('source_hashes', max_entries=1024)
+
+
+def file_sha256(path: str) -> str:
+    """Hash del contenido del archivo, recalculado solo si cambian su tamaño o mtime."""
+    st = os.stat(path)
+    cached = _source_hashes.get(path)
+    if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _source_hashes.put(path, (st.st_size, st.st_mtime_ns, digest))
+    return digest
+
+
+def _read_cache_path(path: str) -> str:
+    return os.path.join(READ_CACHE_DIR, f"{file_sha256(path)[:32]}.v{READ_CACHE_VERSION}.feather")
+
+
+def _write_read_cache(df: pd.DataFrame, cache_path: str):
+    """Guarda la copia en Feather; es solo una optimización, así que cualquier fallo se ignora."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        to_columnar_frame(df).to_feather(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    _prune_read_cache()
+
+
+def _prune_read_cache():
+    """
+    Deja la carpeta dentro de READ_CACHE_MAX_FILES / READ_CACHE_MAX_BYTES borrando las copias
+    usadas hace más tiempo (la fecha de modificación se renueva en cada lectura). La carpeta
+    puede estar compartida entre procesos, así que se mira el disco y no un registro propio.
+    """
+    try:
+        entries = []
+        for entry in os.scandir(READ_CACHE_DIR):
+            if entry.name.endswith('.feather'):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if i >= READ_CACHE_MAX_FILES or total > READ_CACHE_MAX_BYTES:
+            RenderCache._remove(path)
+
+
+def read_schedule_file(file_obj) -> Tuple[pd.DataFrame, str]:
+    """
+    Lee un archivo de horarios (ruta o archivo subido). Retorna (DataFrame, tipo de archivo).
+    Los CSV/Excel se leen una sola vez: la primera lectura deja una copia en Feather
+    (clave: hash del contenido) y las siguientes cargas leen esa copia directamente.
+    """
+    filename = file_obj.name if hasattr(file_obj, 'name') else str(file_obj)
+    source = file_obj.name if hasattr(file_obj, 'name') and os.path.exists(file_obj.name) else file_obj
+    ext = os.path.splitext(filename)[1].lower()
+
+    # Formatos columnares (p.ej. generados con convert_excel_to_csv.py --feather)
+    if ext == '.feather':
+        return pd.read_feather(source), "Feather"
+    if ext == '.parquet':
+        return pd.read_parquet(source), "Parquet"
+
+    file_type = "CSV" if ext == '.csv' else "Excel"
+    cache_path = _read_cache_path(source) if isinstance(source, str) else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            df = pd.read_feather(cache_path)
+        except Exception:
+            df = None
+        if df is not None:
+            try:
+                # Marca la copia como usada recién (ver _prune_read_cache)
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return df, f"{file_type}, caché"
+
+    if file_type == "CSV":
+        df = read_csv_flexible(source)
+    else:
+        df = pd.read_excel(source, engine='openpyxl')
+
+    if cache_path:
+        _write_read_cache(df, cache_path)
+    return df, file_type
+
+
+class CourseCatalog:
+    """
+    Datos de horarios ya normalizados junto con sus índices de secciones y búsqueda.
+    Se construye una sola vez y no se modifica después: la misma instancia se comparte
+    entre todas las sesiones sin locks, y cada sesión guarda solo su propio estado.
+    """
+
+    EXPECTED_COLS = ['Curso', 'Secc', 'Docentes', 'Cred', 'Día', 'Horario_Inicio', 'Horario_Cierre', 'Tipo']
+    # Largo máximo de los n-gramas del índice de búsqueda por subcadena
+    SEARCH_GRAM = 3
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = self.normalize_columns(df)
+
+        # (Curso, Secc) -> {'prof', 'tipo', 'cred', 'slots', 'days'}
+        self.section_index: Dict[Tuple[str, str], dict] = {}
+        # Curso -> etiquetas "Curso__Secc|Display" para el dropdown de secciones
+        self.course_sections: Dict[str, List[str]] = {}
+        self.course_names: List[str] = []
+        self.course_norm: Dict[str, str] = {}
+        self.search_postings: Dict[str, Set[str]] = {}
+        # n-grama (1 a SEARCH_GRAM caracteres) -> tokens de search_postings que lo contienen
+        self.search_grams: Dict[str, Set[str]] = {}
+
+        self._build_course_index()
+        self._build_search_index()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @classmethod
+    def normalize_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Normaliza nombres de columnas del DataFrame."""
+        df_cols = {normalize_str(c): c for c in df.columns}
+        col_map = {}
+
+        mapping = {
+            'curso': 'Curso', 'nombre': 'Curso', 'course': 'Curso',
+            'secc': 'Secc', 'seccion': 'Secc', 'sección': 'Secc',
+            'docente': 'Docentes', 'docentes': 'Docentes', 'profesor': 'Docentes',
+            'cred': 'Cred', 'creditos': 'Cred', 'créditos': 'Cred',
+            'dia': 'Día', 'día': 'Día',
+            'inicio': 'Horario_Inicio', 'horario_inicio': 'Horario_Inicio',
+            'fin': 'Horario_Cierre', 'cierre': 'Horario_Cierre', 'horario_cierre': 'Horario_Cierre',
+            'tipo': 'Tipo'
+        }
+
+        for low, orig in df_cols.items():
+            if low in mapping:
+                col_map[orig] = mapping[low]
+
+        if col_map:
+            df = df.rename(columns=col_map)
+
+        # Asegurar que existan las columnas esperadas
+        for col in cls.EXPECTED_COLS:
+            if col not in df.columns:
+                df[col] = ''
+
+        return df
+
+    def _build_course_index(self):
+        """
+        Agrupa el DataFrame una sola vez por (Curso, Secc) con los slots ya extraídos,
+        para que las consultas interactivas sean un acceso a diccionario en vez de
+        filtrar toda la tabla con máscaras booleanas e iterrows.
+        """
+        df = self.df
+        section_index = self.section_index
+
+        for curso, secc, prof, cred, dia, ini, fin, tipo in df[self.EXPECTED_COLS].itertuples(index=False, name=None):
+            if pd.isna(curso):
+                continue
+            key = (str(curso), str(secc))
+            entry = section_index.get(key)
+            if entry is None:
+                # La primera fila de la sección define profesor, tipo y créditos
+                entry = {
+                    'prof': prof,
+                    'tipo': tipo,
+                    'cred': parse_credits(cred),
+                    'slots': [],
+                    'days': [],
+                }
+                section_index[key] = entry
+            if not dia and not ini and not fin:
+                continue
+            entry['slots'].append({'dia': dia, 'inicio': ini, 'fin': fin, 'tipo': tipo})
+            info = f"{dia} {ini}-{fin} ({tipo})"
+            if info not in entry['days']:
+                entry['days'].append(info)
+
+        # Etiquetas de secciones por curso: una por Secc + Docentes + Cred
+        # (NO agrupar por 'Tipo' para no listar CLASE/PARCIAL/FINAL por separado)
+        grouped = df.groupby(['Curso', 'Secc', 'Docentes', 'Cred'], dropna=False).size()
+        for curso, secc, prof, cred in grouped.index:
+            if pd.isna(curso):
+                continue
+            display = f"Secc {secc} — {prof} ({cred} cr)"
+            label = f"{curso}__{secc}|{display}"
+            opts = self.course_sections.setdefault(str(curso), [])
+            if label not in opts:
+                opts.append(label)
+
+    def _build_search_index(self):
+        """
+        Construye el índice de búsqueda: nombre normalizado de cada curso, un mapa
+        token -> cursos sobre el texto normalizado de curso + docentes/JPs y, para buscar
+        subcadenas, un mapa n-grama -> tokens.
+        """
+        docs: Dict[str, Set[str]] = {}
+        for curso, docente in self.df[['Curso', 'Docentes']].itertuples(index=False, name=None):
+            if pd.isna(curso):
+                continue
+            names = docs.setdefault(curso, set())
+            if not pd.isna(docente):
+                d = str(docente).strip()
+                if d:
+                    names.add(d)
+
+        for curso, names in docs.items():
+            self.course_norm[curso] = normalize_str(curso)
+            blob = normalize_str(f"{curso} {' '.join(sorted(names))}")
+            for token in blob.split():
+                self.search_postings.setdefault(token, set()).add(curso)
+
+        self.course_names = sorted(docs)
+
+        n = self.SEARCH_GRAM
+        for token in self.search_postings:
+            for size in range(1, n + 1):
+                for i in range(len(token) - size + 1):
+                    self.search_grams.setdefault(token[i:i + size], set()).add(token)
+
+    def _tokens_containing(self, kw: str) -> Set[str]:
+        """
+        Tokens del vocabulario que contienen `kw`. Una palabra corta es en sí un n-grama del
+        índice; una larga solo puede estar en tokens que tengan todos sus n-gramas, así que se
+        cruzan esas listas (la más corta primero) y solo se verifican esos candidatos.
+        """
+        n = self.SEARCH_GRAM
+        if len(kw) <= n:
+            return self.search_grams.get(kw, set())
+        postings = sorted((self.search_grams.get(kw[i:i + n], set()) for i in range(len(kw) - n + 1)), key=len)
+        return {token for token in postings[0].intersection(*postings[1:]) if kw in token}
+
+    def search(self, search_term: str) -> Set[str]:
+        """
+        Retorna los cursos cuyo texto contiene todas las palabras buscadas.
+        Cada palabra no tiene espacios, así que está contenida en el texto solo si lo está
+        en alguno de sus tokens: se buscan esos tokens en el índice y se cruzan sus cursos.
+        """
+        result: Optional[Set[str]] = None
+        for kw in normalize_str(search_term).split():
+            matches: Set[str] = set()
+            for token in self._tokens_containing(kw):
+                matches |= self.search_postings[token]
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result if result is not None else set(self.course_names)
+
+    def lookup_sections(self, curso: str, secc: str) -> List[dict]:
+        """Busca la sección en el índice; si no existe, cae a las secciones cuyo curso contiene el texto."""
+        entry = self.section_index.get((curso, secc))
+        if entry is not None:
+            return [entry]
+        return [e for (c, _), e in self.section_index.items() if curso in c]
+
+    # ----- Catálogo compartido entre procesos (Arrow IPC abierto con mmap) -----
+
+    ARROW_VERSION = '1'
+
+    def save_arrow(self, path: str, source_stamp: str, file_type: str):
+        """
+        Guarda la tabla del catálogo como archivo Arrow IPC sin comprimir, con el texto como
+        large_string, que es el formato de las columnas de texto de pandas con pyarrow: al
+        abrirlo con open_arrow las columnas apuntan directo al archivo mapeado en memoria.
+        """
+        table = pa.Table.from_pandas(to_columnar_frame(self.df), preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata.update({b'matricula_catalog': self.ARROW_VERSION.encode(),
+                         b'source': source_stamp.encode('utf-8'),
+                         b'file_type': file_type.encode('utf-8')})
+        schema = pa.schema([pa.field(f.name, pa.large_string()) if pa.types.is_string(f.type) else f
+                            for f in table.schema], metadata=metadata)
+        table = table.cast(schema)
+
+        # Escritura atómica: un worker que lo abre a la vez ve el archivo viejo o el nuevo completo
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def open_arrow(cls, path: str, source_stamp: str) -> Optional[Tuple['CourseCatalog', str]]:
+        """
+        Abre un catálogo guardado con save_arrow. El archivo se mapea en memoria y las columnas
+        de texto del DataFrame usan esas páginas sin copiarlas (solo se copian las numéricas),
+        así que todos los workers que lo abren comparten una sola copia de la tabla. Los índices
+        se siguen armando en cada proceso. Retorna None si no existe o no corresponde al origen.
+        """
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+            meta = reader.schema.metadata or {}
+            if (meta.get(b'matricula_catalog') != cls.ARROW_VERSION.encode()
+                    or meta.get(b'source') != source_stamp.encode('utf-8')):
+                return None
+            table = reader.read_all()
+        except (OSError, ValueError):
+            return None
+        # Mismo tipo de texto que read_csv en pandas 3 (faltantes como NaN), sin copiar los datos
+        text = pd.StringDtype('pyarrow', na_value=np.nan)
+        df = table.to_pandas(types_mapper=lambda t: text if t == pa.large_string() else None)
+        return cls(df), meta[b'file_type'].decode('utf-8')
+
+
+def _source_stamp(path: str) -> str:
+    st = os.stat(path)
+    return f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+
+# Catálogo por defecto (output/Horarios_UP_V6_Perfecto.*), cargado una vez por proceso
+_default_catalog: Optional[Tuple[str, CourseCatalog, str]] = None
+_default_catalog_lock = threading.Lock()
+
+
+def load_default_catalog() -> Tuple[CourseCatalog, str]:
+    """
+    Retorna (catálogo, tipo de archivo) del archivo de horarios en output/ (Feather o CSV
+    primero, más rápidos, luego Excel). Se reutiliza entre sesiones mientras el archivo no cambie.
+
+    El primer proceso que lo lee lo guarda como Arrow IPC junto al archivo de origen
+    (*.catalog.arrow) y los demás workers lo abren con mmap (CourseCatalog.open_arrow): la
+    tabla queda una sola vez en memoria, compartida por el sistema entre todos los procesos.
+    """
+    global _default_catalog
+    base = os.path.join(WORKSPACE_ROOT, "output", "Horarios_UP_V6_Perfecto")
+    candidates = [f"{base}.feather", f"{base}.csv", f"{base}.xlsx"]
+    path = next((p for p in candidates if os.path.exists(p)), None)
+    if path is None:
+        raise FileNotFoundError("No se encontró archivo de horarios (CSV o Excel)")
+
+    with _default_catalog_lock:
+        stamp = _source_stamp(path)
+        cached = _default_catalog
+        if cached is None or cached[0] != stamp:
+            arrow_path = os.path.splitext(path)[0] + '.catalog.arrow'
+            loaded = CourseCatalog.open_arrow(arrow_path, stamp) if pa is not None else None
+            if loaded is None:
+                df, file_type = read_schedule_file(path)
+                loaded = (CourseCatalog(df), file_type)
+                if pa is not None:
+                    try:
+                        loaded[0].save_arrow(arrow_path, stamp, file_type)
+                        # También este proceso pasa a usar la copia compartida
+                        loaded = CourseCatalog.open_arrow(arrow_path, stamp) or loaded
+                    except Exception:
+                        # Es solo una optimización (p.ej. carpeta de solo lectura): se sigue en memoria
+                        pass
+            cached = (stamp, loaded[0], loaded[1])
+            _default_catalog = cached
+        return cached[1], cached[2]
+
+
 class MatriculaApp:
     """Lógica principal de la aplicación de matrícula."""
 
-    def __init__(self):
-        self.courses_df: Optional[pd.DataFrame] = None
+    GROUP_CLASES = 0
+    GROUP_EXAMENES = 1
+
+    def __init__(self, catalog: Optional['CourseCatalog'] = None, work_dir: Optional[str] = None):
+        # Catálogo de horarios (solo lectura, puede estar compartido con otras sesiones)
+        self.catalog: Optional[CourseCatalog] = catalog
+        # Carpeta de los archivos de esta sesión (progreso, Excel, PNG); SessionStore da una por sesión
+        self.work_dir = work_dir or '.'
         self.schedules: Dict[int, List[dict]] = {1: [], 2: [], 3: []}
         self.credits: Dict[int, float] = {1: 0.0, 2: 0.0, 3: 0.0}
         self.taken_courses: Set[str] = set()
@@ -101,13 +1071,15 @@ class MatriculaApp:
         # Conjuntos normalizados (sin acentos/espacios, en mayúsculas) para comparaciones robustas
         self._CLASES_NORM = {normalize_str(x).upper() for x in self.CLASES_SET}
         self._EXAMENES_NORM = {normalize_str(x).upper() for x in self.EXAMENES_SET}
+        # tipo -> grupo (GROUP_CLASES / GROUP_EXAMENES / -1), normalizado una sola vez por valor
+        self._tipo_groups: Dict[str, int] = {}
 
-        # Cache para imágenes de horarios (evita regenerar si no hay cambios)
-        self._schedule_image_cache: Dict[int, Tuple[Optional[Image.Image], Optional[Image.Image], str]] = {}
-        # Cache de búsquedas de cursos
-        self._course_search_cache: Dict[str, List[str]] = {}
-        # Cache de secciones por curso
-        self._sections_cache: Dict[str, List[str]] = {}
+        # Cache de horarios ya dibujados (evita recalcular bloques si no hay cambios):
+        # schedule_index -> (clave RenderCache de clases, de exámenes, hash del horario).
+        # Solo claves: los PNG viven una sola vez en render_cache, compartidos por todas las sesiones
+        self._schedule_image_cache = BoundedCache('schedule_images', max_entries=3)
+        # Cache de búsquedas de cursos (una entrada por texto tecleado, así que se acota)
+        self._course_search_cache = BoundedCache('course_search', max_entries=512, ttl=3600)
 
     def set_career(self, career: str) -> Tuple[str, List[str], List[str]]:
         """Establece la carrera actual y carga su currículo."""
@@ -140,120 +1112,39 @@ class MatriculaApp:
         """
         Carga archivo Excel o CSV con datos de horarios.
         CSV es ~10x más rápido que Excel para archivos grandes.
+        Sin archivo subido se usa el catálogo de output/, compartido entre sesiones.
         """
         try:
             # Limpiar caché al cargar nuevos datos
             self._invalidate_all_caches()
 
-            def _try_read_csv(source):
-                """Try several pandas CSV parsing modes to handle inconsistent separators/quotes."""
-                # Try C engine (fast); then fall back to python engine with common separators
-                attempts = [
-                    {'engine': 'c', 'encoding': 'utf-8'},
-                    {'engine': 'python', 'encoding': 'utf-8', 'sep': ';'},
-                    {'engine': 'python', 'encoding': 'utf-8', 'sep': ','},
-                    {'engine': 'python', 'encoding': 'utf-8', 'sep': None},
-                ]
-                for kw in attempts:
-                    try:
-                        # The 'low_memory' option is only supported by the C engine
-                        if kw.get('engine') == 'c':
-                            return pd.read_csv(source, low_memory=False, **kw)
-                        else:
-                            return pd.read_csv(source, **kw)
-                    except Exception:
-                        continue
-                # Last resort: try with universal newlines and no quoting
-                try:
-                    return pd.read_csv(source, engine='python', quoting=3, low_memory=False)
-                except Exception as e:
-                    raise e
-
             if file_obj is None:
-                # Intentar cargar CSV primero (más rápido), luego Excel
-                csv_path = os.path.join(WORKSPACE_ROOT, "output", "Horarios_UP_V6_Perfecto.csv")
-                xlsx_path = os.path.join(WORKSPACE_ROOT, "output", "Horarios_UP_V6_Perfecto.xlsx")
-
-                if os.path.exists(csv_path):
-                    try:
-                        df = _try_read_csv(csv_path)
-                    except Exception as e:
-                        return f"✗ Error al cargar CSV: {e}"
-                    file_type = "CSV"
-                elif os.path.exists(xlsx_path):
-                    df = pd.read_excel(xlsx_path, engine='openpyxl')
-                    file_type = "Excel"
-                else:
+                try:
+                    catalog, file_type = load_default_catalog()
+                except FileNotFoundError:
                     return "⚠ No se encontró archivo de horarios (CSV o Excel)"
             else:
-                # Detectar tipo de archivo subido
-                filename = file_obj.name if hasattr(file_obj, 'name') else str(file_obj)
-
-                if filename.lower().endswith('.csv'):
-                    try:
-                        if hasattr(file_obj, 'name') and os.path.exists(file_obj.name):
-                            df = _try_read_csv(file_obj.name)
-                        else:
-                            df = _try_read_csv(file_obj)
-                    except Exception as e:
-                        return f"✗ Error al cargar CSV subido: {e}"
-                    file_type = "CSV"
-                else:
-                    if hasattr(file_obj, 'name') and os.path.exists(file_obj.name):
-                        df = pd.read_excel(file_obj.name, engine='openpyxl')
-                    else:
-                        df = pd.read_excel(file_obj, engine='openpyxl')
-                    file_type = "Excel"
-
-            # Normalizar nombres de columnas
-            df = self._normalize_columns(df)
-            self.courses_df = df
+                # Un archivo subido solo afecta a la sesión que lo subió
+                df, file_type = read_schedule_file(file_obj)
+                catalog = CourseCatalog(df)
 
-            return f"✓ Datos cargados ({file_type}): {len(df)} registros"
+            self.catalog = catalog
+            return f"✓ Datos cargados ({file_type}): {len(catalog)} registros"
         except Exception as e:
             return f"✗ Error al cargar: {e}"
 
+    @property
+    def courses_df(self) -> Optional[pd.DataFrame]:
+        return self.catalog.df if self.catalog is not None else None
+
     def _invalidate_all_caches(self):
         """Limpia todos los cachés."""
         self._schedule_image_cache.clear()
         self._course_search_cache.clear()
-        self._sections_cache.clear()
 
     def _invalidate_schedule_cache(self, schedule_index: int):
         """Invalida el caché de imágenes para un horario específico."""
-        if schedule_index in self._schedule_image_cache:
-            del self._schedule_image_cache[schedule_index]
-
-    def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Normaliza nombres de columnas del DataFrame."""
-        df_cols = {normalize_str(c): c for c in df.columns}
-        col_map = {}
-
-        mapping = {
-            'curso': 'Curso', 'nombre': 'Curso', 'course': 'Curso',
-            'secc': 'Secc', 'seccion': 'Secc', 'sección': 'Secc',
-            'docente': 'Docentes', 'docentes': 'Docentes', 'profesor': 'Docentes',
-            'cred': 'Cred', 'creditos': 'Cred', 'créditos': 'Cred',
-            'dia': 'Día', 'día': 'Día',
-            'inicio': 'Horario_Inicio', 'horario_inicio': 'Horario_Inicio',
-            'fin': 'Horario_Cierre', 'cierre': 'Horario_Cierre', 'horario_cierre': 'Horario_Cierre',
-            'tipo': 'Tipo'
-        }
-
-        for low, orig in df_cols.items():
-            if low in mapping:
-                col_map[orig] = mapping[low]
-
-        if col_map:
-            df = df.rename(columns=col_map)
-
-        # Asegurar que existan las columnas esperadas
-        expected_cols = ['Curso', 'Secc', 'Docentes', 'Cred', 'Día', 'Horario_Inicio', 'Horario_Cierre', 'Tipo']
-        for col in expected_cols:
-            if col not in df.columns:
-                df[col] = ''
-
-        return df
+        self._schedule_image_cache.pop(schedule_index)
 
     def get_mandatory_courses_status(self) -> Tuple[List[str], List[str], List[str]]:
         """
@@ -283,45 +1174,25 @@ class MatriculaApp:
             filter_mandatory_only: Solo cursos obligatorios
             filter_pending_only: Solo cursos obligatorios pendientes
         """
-        if self.courses_df is None:
+        if self.catalog is None:
             return []
 
-        # Crear clave de caché
-        cache_key = f"{search_term}|{filter_mandatory_only}|{filter_pending_only}|{len(self.taken_courses)}"
+        # Crear clave de caché (con el set completo de cursos llevados: ni su cantidad ni su
+        # hash bastan, dos sets distintos pueden coincidir y devolver resultados de otro)
+        cache_key = (search_term, filter_mandatory_only, filter_pending_only, self.current_career,
+                     frozenset(self.taken_courses))
 
         # Verificar si está en caché
-        if cache_key in self._course_search_cache:
-            return self._course_search_cache[cache_key]
+        cached = self._course_search_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        df = self.courses_df
-        names = sorted(df['Curso'].dropna().unique().tolist())
+        names = list(self.catalog.course_names)
 
         # Aplicar filtro de búsqueda
-        if search_term:
-            kws = [w for w in normalize_str(search_term).split() if w]
-            # Buscar por nombre de curso y también por docentes/JPs de sus secciones
-            grouped_docs = (
-                df.groupby('Curso', dropna=False)['Docentes']
-                .apply(
-                    lambda s: " ".join(
-                        sorted(
-                            {
-                                str(v).strip()
-                                for v in s.fillna('')
-                                if str(v).strip()
-                            }
-                        )
-                    )
-                )
-                .to_dict()
-            )
-
-            def _matches(name: str) -> bool:
-                blob = f"{name} {grouped_docs.get(name, '')}"
-                blob_norm = normalize_str(blob)
-                return all(kw in blob_norm for kw in kws)
-
-            names = [n for n in names if _matches(n)]
+        if search_term.strip():
+            matched = self.catalog.search(search_term)
+            names = [n for n in names if n in matched]
 
         # Aplicar filtros de cursos obligatorios
         if filter_mandatory_only or filter_pending_only:
@@ -333,55 +1204,25 @@ class MatriculaApp:
             if filter_pending_only:
                 # Solo cursos obligatorios que NO han sido llevados
                 pending = mandatory_normalized - self.taken_courses
-                names = [n for n in names if normalize_str(n) in pending]
+                names = [n for n in names if self.catalog.course_norm[n] in pending]
             elif filter_mandatory_only:
                 # Solo cursos obligatorios (llevados o no)
-                names = [n for n in names if normalize_str(n) in mandatory_normalized]
+                names = [n for n in names if self.catalog.course_norm[n] in mandatory_normalized]
 
         # Guardar en caché
-        self._course_search_cache[cache_key] = names
+        self._course_search_cache.put(cache_key, names)
 
         return names
 
     def get_sections_for_course(self, course_name: str) -> List[str]:
-        """Retorna lista de secciones disponibles para un curso (con caché)."""
-        if self.courses_df is None:
+        """Retorna lista de secciones disponibles para un curso (precalculada en load_excel)."""
+        if self.catalog is None:
             return []
-        # Verificar caché
-        if course_name in self._sections_cache:
-            return self._sections_cache[course_name]
-
-        df = self.courses_df
-        rows = df[df['Curso'] == course_name]
-
-        # Agrupar por Secc + Docentes + Cred para evitar duplicados por día
-        # (NO agrupar por 'Tipo' para no listar CLASE/PARCIAL/FINAL por separado)
-        grouped = rows.groupby(['Secc', 'Docentes', 'Cred'], dropna=False)
-        opts = []
-
-        for (secc, prof, cred), g in grouped:
-            display = f"Secc {secc} — {prof} ({cred} cr)"
-            label = f"{course_name}__{secc}|{display}"
-            opts.append(label)
-
-        # Dedupe preserving order (some files may have near-duplicate rows causing repeated labels)
-        seen = set()
-        unique_opts = []
-        for o in opts:
-            if o not in seen:
-                seen.add(o)
-                unique_opts.append(o)
-
-        opts = unique_opts
-
-        # Guardar en caché
-        self._sections_cache[course_name] = opts
-
-        return opts
+        return list(self.catalog.course_sections.get(course_name, []))
 
     def get_days_for_section(self, section_label: str) -> List[str]:
         """Dado un label de sección (Course__Secc|...), retorna los días/horarios asociados."""
-        if self.courses_df is None or not section_label:
+        if self.catalog is None or not section_label:
             return []
 
         # Extraer curso y secc
@@ -391,27 +1232,8 @@ class MatriculaApp:
         else:
             return []
 
-        df = self.courses_df
-        rows = df[(df['Curso'] == curso) & (df['Secc'] == secc)]
-        infos = []
-        for idx, r in rows.iterrows():
-            dia = r.get('Día', '')
-            ini = r.get('Horario_Inicio', '')
-            fin = r.get('Horario_Cierre', '')
-            tipo = r.get('Tipo', '')
-            if not dia and not ini and not fin:
-                continue
-            infos.append(f"{dia} {ini}-{fin} ({tipo})")
-
-        # dedupe preserving order
-        seen = set()
-        unique = []
-        for i in infos:
-            if i not in seen:
-                seen.add(i)
-                unique.append(i)
-
-        return unique
+        entry = self.catalog.section_index.get((curso, secc))
+        return list(entry['days']) if entry else []
 
     def add_to_schedule(self, course_labels: List[str], schedule_index: int,
                        force_replace: bool = False) -> str:
@@ -419,7 +1241,7 @@ class MatriculaApp:
         if not course_labels:
             return "⚠ Selecciona al menos un curso"
 
-        if self.courses_df is None:
+        if self.catalog is None:
             return "⚠ Carga primero los datos"
 
         # Construir lista de nuevos bloques a añadir (cada bloque puede tener múltiples 'slots')
@@ -442,33 +1264,21 @@ class MatriculaApp:
             if any(b['block'] == block_id for b in self.schedules[schedule_index]):
                 continue
 
-            rows = self.courses_df[(self.courses_df['Curso'] == curso) & (self.courses_df['Secc'] == secc)]
-            if rows.empty:
-                rows = self.courses_df[self.courses_df['Curso'].str.contains(curso, na=False)]
+            entries = self.catalog.lookup_sections(curso, secc)
 
-            if not rows.empty:
+            if entries:
                 # Collect all slots (days/times) for this section
-                slots = []
-                for _, rr in rows.iterrows():
-                    dia = rr.get('Día', '')
-                    ini = rr.get('Horario_Inicio', '')
-                    fin = rr.get('Horario_Cierre', '')
-                    tipo = rr.get('Tipo', '')
-                    if not dia and not ini and not fin:
-                        continue
-                    slots.append({'dia': dia, 'inicio': ini, 'fin': fin, 'tipo': tipo})
-
-                first = rows.iloc[0]
-                cred_val = parse_credits(first.get('Cred', 0))
+                slots = [dict(slot) for e in entries for slot in e['slots']]
+                first = entries[0]
 
                 new_rows.append({
                     'block': block_id,
                     'curso': curso,
                     'secc': secc,
-                    'prof': first.get('Docentes', ''),
-                    'tipo': first.get('Tipo', ''),
+                    'prof': first['prof'],
+                    'tipo': first['tipo'],
                     'slots': slots,
-                    'cred': cred_val
+                    'cred': first['cred']
                 })
 
         # Detectar conflictos
@@ -476,10 +1286,10 @@ class MatriculaApp:
 
         if conflicts and not force_replace:
             msg_lines = ["⚠ Conflictos detectados:"]
-            for nr, eb in conflicts:
+            for nr, ns, eb, es in conflicts:
                 msg_lines.append(
-                    f"  • Nuevo: {nr['block']} ({nr['dia']} {nr['inicio']}-{nr['fin']}) "
-                    f"choca con {eb['block']} ({eb['dia']} {eb['inicio']}-{eb['fin']})"
+                    f"  • Nuevo: {nr['block']} ({ns.get('dia')} {ns.get('inicio')}-{ns.get('fin')}) "
+                    f"choca con {eb['block']} ({es.get('dia')} {es.get('inicio')}-{es.get('fin')})"
                 )
             msg_lines.append("\n✓ Marca 'Reemplazar conflictos' para forzar la inserción.")
             return "\n".join(msg_lines)
@@ -509,63 +1319,115 @@ class MatriculaApp:
 
         return f"✓ {len(new_rows)} curso(s) añadido(s)"
 
-    def _detect_conflicts_with_new(self, schedule_index: int,
-                                   new_rows: List[dict]) -> List[Tuple[dict, dict]]:
-        """Detecta conflictos entre nuevos cursos y cursos existentes."""
-        conflicts = []
-        existing = self.schedules[schedule_index]
-        # Normalize existing entries into slot lists
-        def entry_slots(e):
-            if 'slots' in e and isinstance(e['slots'], list):
-                return e['slots']
-            # legacy single-slot entries
-            return [{'dia': e.get('dia'), 'inicio': e.get('inicio'), 'fin': e.get('fin'), 'tipo': e.get('tipo')}]
+    def _tipo_group(self, tipo) -> int:
+        """Grupo de comparación de un tipo de sesión: clases vs exámenes (-1 si no aplica)."""
+        key = str(tipo or '')
+        group = self._tipo_groups.get(key)
+        if group is None:
+            norm = normalize_str(key).upper().strip()
+            if norm in self._CLASES_NORM:
+                group = self.GROUP_CLASES
+            elif norm in self._EXAMENES_NORM:
+                group = self.GROUP_EXAMENES
+            else:
+                group = -1
+            self._tipo_groups[key] = group
+        return group
 
-        for nr in new_rows:
-            nr_slots = entry_slots(nr)
-            for nslot in nr_slots:
-                inicio_n = nslot.get('inicio')
-                fin_n = nslot.get('fin')
-                if not inicio_n or not fin_n:
+    def _slot_arrays(self, entries: List[dict], day_codes: Dict[str, int]) -> dict:
+        """
+        Convierte los slots de una lista de bloques en arreglos enteros paralelos
+        (block, day, start, end, group). Los slots sin día, sin horas válidas o de un
+        tipo que no se compara quedan fuera. 'slots' guarda (bloque, slot) para reportar.
+        """
+        block, day, start, end, group, refs = [], [], [], [], [], []
+        for bi, e in enumerate(entries):
+            for slot in _entry_slots(e):
+                dia = str(slot.get('dia') or '').upper().strip()
+                g = self._tipo_group(slot.get('tipo'))
+                if not dia or g < 0:
                     continue
-                try:
-                    start_n = datetime.strptime(str(inicio_n), '%H:%M')
-                    end_n = datetime.strptime(str(fin_n), '%H:%M')
-                except:
+                ini = slot.get('inicio')
+                fin = slot.get('fin')
+                if not ini or not fin:
                     continue
-                tipo_n = normalize_str(nslot.get('tipo') or '').upper().strip()
-                for eb in existing:
-                    for eslot in entry_slots(eb):
-                        tipo_e = normalize_str(eslot.get('tipo') or '').upper().strip()
-                        # Solo comparar si son del mismo grupo (clases vs clases, exámenes vs exámenes)
-                        same_group = (
-                            (tipo_n in self._CLASES_NORM and tipo_e in self._CLASES_NORM) or
-                            (tipo_n in self._EXAMENES_NORM and tipo_e in self._EXAMENES_NORM)
-                        )
-                        if not same_group:
-                            continue
-                        # Verificar mismo día
-                        if str(nslot.get('dia')).upper().strip() != str(eslot.get('dia')).upper().strip():
-                            continue
-                        inicio_e = eslot.get('inicio')
-                        fin_e = eslot.get('fin')
-                        if not inicio_e or not fin_e:
-                            continue
-                        try:
-                            s_e = datetime.strptime(str(inicio_e), '%H:%M')
-                            e_e = datetime.strptime(str(fin_e), '%H:%M')
-                        except:
-                            continue
-                        if start_n < e_e and end_n > s_e:
-                            conflicts.append((nr, eb))
-
-        return conflicts
+                s_min = hhmm_to_minutes(str(ini))
+                e_min = hhmm_to_minutes(str(fin))
+                if s_min is None or e_min is None:
+                    continue
+                block.append(bi)
+                day.append(day_codes.setdefault(dia, len(day_codes)))
+                start.append(s_min)
+                end.append(e_min)
+                group.append(g)
+                refs.append((e, slot))
+        return {
+            'block': np.array(block, dtype=np.int32),
+            'day': np.array(day, dtype=np.int32),
+            'start': np.array(start, dtype=np.int32),
+            'end': np.array(end, dtype=np.int32),
+            'group': np.array(group, dtype=np.int8),
+            'n_blocks': len(entries),
+            'slots': refs,
+        }
+
+    @staticmethod
+    def _interval_overlaps(a: dict, b: Optional[dict] = None,
+                           group: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Solapamiento vectorizado de slots (mismo día, mismo grupo, intervalos que se cruzan).
+
+        Con un solo conjunto compara los bloques entre sí; con dos compara a contra b.
+        Retorna (pares, flags): pares es un arreglo (k, 2) de índices de slot (i en a, j en b),
+        ordenado como los bucles originales; flags marca por bloque de a si tiene algún cruce.
+        """
+        same = b is None
+        if same:
+            b = a
+        mask = (
+            (a['day'][:, None] == b['day'][None, :]) &
+            (a['group'][:, None] == b['group'][None, :]) &
+            (a['start'][:, None] < b['end'][None, :]) &
+            (a['end'][:, None] > b['start'][None, :])
+        )
+        if group is not None:
+            mask &= (a['group'] == group)[:, None]
+        if same:
+            mask &= a['block'][:, None] != b['block'][None, :]
+
+        flags = np.zeros(a['n_blocks'], dtype=bool)
+        flags[a['block'][mask.any(axis=1)]] = True
+
+        if same:
+            # Cada par de bloques una sola vez (i < j), en orden bloque i, bloque j, slot i, slot j
+            pairs = np.argwhere(mask & (a['block'][:, None] < b['block'][None, :]))
+            if len(pairs):
+                order = np.lexsort((pairs[:, 1], pairs[:, 0],
+                                    b['block'][pairs[:, 1]], a['block'][pairs[:, 0]]))
+                pairs = pairs[order]
+        else:
+            pairs = np.argwhere(mask)
+        return pairs, flags
+
+    def _detect_conflicts_with_new(self, schedule_index: int,
+                                   new_rows: List[dict]) -> List[Tuple[dict, dict, dict, dict]]:
+        """Detecta conflictos entre nuevos cursos y cursos existentes: (nuevo, slot, existente, slot)."""
+        day_codes: Dict[str, int] = {}
+        new_arr = self._slot_arrays(new_rows, day_codes)
+        existing_arr = self._slot_arrays(self.schedules[schedule_index], day_codes)
+
+        # Solo se compara dentro del mismo grupo (clases vs clases, exámenes vs exámenes)
+        pairs, _ = self._interval_overlaps(new_arr, existing_arr)
+        return [
+            new_arr['slots'][i] + existing_arr['slots'][j]
+            for i, j in pairs
+        ]
 
     def _remove_conflicting_blocks(self, schedule_index: int,
-                                   conflicts: List[Tuple[dict, dict]]):
+                                   conflicts: List[Tuple[dict, dict, dict, dict]]):
         """Remueve bloques conflictivos del horario."""
         to_remove = set()
-        for nr, eb in conflicts:
+        for _, _, eb, _ in conflicts:
             to_remove.add(eb['block'])
 
         new_existing = []
@@ -583,56 +1445,16 @@ class MatriculaApp:
     def detect_conflicts(self, schedule_index: int) -> Tuple[List, str]:
         """Detecta conflictos dentro de un horario."""
         rows = self.schedules.get(schedule_index, [])
-        conflicts = []
-
-        def entry_slots(e):
-            if 'slots' in e and isinstance(e['slots'], list):
-                return e['slots']
-            if e.get('inicio') and e.get('fin'):
-                return [{'dia': e.get('dia'), 'inicio': e.get('inicio'), 'fin': e.get('fin'), 'tipo': e.get('tipo')}]
-            return []
+        arr = self._slot_arrays(rows, {})
+        pairs, _ = self._interval_overlaps(arr)
 
-        for i in range(len(rows)):
-            for j in range(i+1, len(rows)):
-                a, b = rows[i], rows[j]
-
-                # comparar todas las combinaciones de slots entre ambos bloques
-                for sa in entry_slots(a):
-                    for sb in entry_slots(b):
-                        dia_a = str(sa.get('dia') or '').upper().strip()
-                        dia_b = str(sb.get('dia') or '').upper().strip()
-                        if dia_a != dia_b or not dia_a:
-                            continue
-
-                        tipo_a = normalize_str(sa.get('tipo') or '').upper().strip()
-                        tipo_b = normalize_str(sb.get('tipo') or '').upper().strip()
-
-                        # Solo comparar si son del mismo grupo
-                        same_group = (
-                            (tipo_a in self._CLASES_NORM and tipo_b in self._CLASES_NORM) or
-                            (tipo_a in self._EXAMENES_NORM and tipo_b in self._EXAMENES_NORM)
-                        )
-                        if not same_group:
-                            continue
-
-                        inicio_a = sa.get('inicio')
-                        fin_a = sa.get('fin')
-                        inicio_b = sb.get('inicio')
-                        fin_b = sb.get('fin')
-
-                        if not all([inicio_a, fin_a, inicio_b, fin_b]):
-                            continue
-
-                        try:
-                            ta_s = datetime.strptime(str(inicio_a), '%H:%M')
-                            ta_e = datetime.strptime(str(fin_a), '%H:%M')
-                            tb_s = datetime.strptime(str(inicio_b), '%H:%M')
-                            tb_e = datetime.strptime(str(fin_b), '%H:%M')
-                        except:
-                            continue
-
-                        if ta_s < tb_e and ta_e > tb_s:
-                            conflicts.append((a['block'], b['block'], dia_a, inicio_a, fin_a, inicio_b, fin_b))
+        conflicts = []
+        for i, j in pairs:
+            a, sa = arr['slots'][i]
+            b, sb = arr['slots'][j]
+            dia = str(sa.get('dia') or '').upper().strip()
+            conflicts.append((a['block'], b['block'], dia,
+                              sa.get('inicio'), sa.get('fin'), sb.get('inicio'), sb.get('fin')))
 
         if not conflicts:
             return [], ""
@@ -725,286 +1547,82 @@ class MatriculaApp:
         schedule_hash = str(sorted([_row_hash(r) for r in rows]))
 
         # Verificar si tenemos caché válido
-        if schedule_index in self._schedule_image_cache:
-            cached_classes, cached_exams, cached_hash = self._schedule_image_cache[schedule_index]
-            if cached_hash == schedule_hash and cached_classes and cached_exams:
-                # Cache hit! No necesitamos regenerar
-                return cached_classes, cached_exams
-
-        # Cache miss o cambió el horario - generar nuevas imágenes
-        days = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO']
-        day_map = {d: i for i, d in enumerate(days)}
-
-        base_time = datetime.strptime('07:30', '%H:%M')
-        end_time = datetime.strptime('23:00', '%H:%M')  # 11:00 PM
-        total_minutes = int((end_time - base_time).seconds / 60)
-        total_blocks = total_minutes // 30  # bloques de 30 min
-
-        def make_fig(filter_types: str) -> Image.Image:
-            """Crea figura mejorada para un tipo de sesión (CLASE o EXAM)."""
-            # Configuración de estilo
-            plt.style.use('default')
-            fig_height = max(10, total_blocks * 0.15)
-            fig, ax = plt.subplots(figsize=(16, fig_height), facecolor='white')
-
-            cell_h = 0.35
-            full_h = total_blocks * cell_h
-            cell_w = 1.5
-
-            # Colores mejorados
-            bg_color = '#f8f9fa'
-            grid_color = '#dee2e6'
-            header_bg = '#4a5568'
-            text_color = '#2d3748'
-
-            # Fondo
-            ax.add_patch(patches.Rectangle(
-                (0, 0), len(days) * cell_w, full_h,
-                facecolor=bg_color, zorder=0
-            ))
-
-            # Dibujar grid de días con headers mejorados
-            for i, d in enumerate(days):
-                x = i * cell_w
-                # Columna del día
-                ax.add_patch(patches.Rectangle(
-                    (x, 0), cell_w, full_h,
-                    fill=False, edgecolor=grid_color, linewidth=1, zorder=1
-                ))
-                # Header del día
-                ax.add_patch(patches.Rectangle(
-                    (x, full_h), cell_w, 0.6,
-                    facecolor=header_bg, edgecolor='none', zorder=2
-                ))
-                ax.text(
-                    x + cell_w/2, full_h + 0.3, d,
-                    ha='center', va='center', fontsize=11,
-                    fontweight='bold', color='white', zorder=3
-                )
-
-            # Dibujar líneas horizontales y etiquetas de tiempo mejoradas
-            for b in range(total_blocks + 1):
-                y = b * cell_h
-                # Línea más gruesa cada hora
-                if b % 2 == 0:
-                    ax.hlines(y, 0, len(days) * cell_w, colors=grid_color, linewidth=1.5, zorder=1)
-                    # Etiqueta de hora
-                    t = (base_time + timedelta(minutes=b * 30)).strftime('%I:%M %p')
-                    ax.text(
-                        -0.15, y, t,
-                        ha='right', va='center', fontsize=9,
-                        color=text_color, fontweight='600'
-                    )
-                else:
-                    ax.hlines(y, 0, len(days) * cell_w, colors=grid_color, linewidth=0.5, alpha=0.5, zorder=1)
-            # Dibujar bloques de cursos con soporte para múltiples slots por bloque
-            for r in rows:
-                # Determine slots for this block (new format) or fallback to single slot
-                if 'slots' in r and isinstance(r['slots'], list) and r['slots']:
-                    r_slots = r['slots']
-                else:
-                    r_slots = [{'dia': r.get('dia', ''), 'inicio': r.get('inicio', ''), 'fin': r.get('fin', ''), 'tipo': r.get('tipo', '')}]
-
-                # For color/overlap determination we can check if any slot overlaps
-                overlap = self._check_overlap_in_schedule(r, rows, filter_types)
-
-                # Determine colors based on filter_types and overlap
-                if filter_types == 'CLASE':
-                    face_color_ok = '#4dabf7'
-                    face_color_conf = '#ff6b6b'
-                    edge_ok = '#1971c2'
-                    edge_conf = '#c92a2a'
-                else:
-                    face_color_ok = '#ffd43b'
-                    face_color_conf = '#ff8787'
-                    edge_ok = '#f59f00'
-                    edge_conf = '#c92a2a'
-
-                for slot in r_slots:
-                    tipo = normalize_str(slot.get('tipo') or '').upper()
-                    # Filtrar por tipo (usar conjuntos normalizados)
-                    if filter_types == 'CLASE' and tipo not in self._CLASES_NORM:
-                        continue
-                    if filter_types == 'EXAM' and tipo not in self._EXAMENES_NORM:
-                        continue
-
-                    dia = str(slot.get('dia') or '').upper()
-                    # Mapear día a índice
-                    d_index = None
-                    for k, v in day_map.items():
-                        if dia.startswith(k[:3]):
-                            d_index = v
-                            break
-                    if d_index is None:
-                        continue
-
-                    inicio = slot.get('inicio')
-                    fin = slot.get('fin')
-                    if not inicio or not fin:
-                        continue
-                    try:
-                        st = datetime.strptime(str(inicio), '%H:%M')
-                        en = datetime.strptime(str(fin), '%H:%M')
-                    except:
-                        continue
-
-                    start_minutes = (st - base_time).seconds / 60
-                    end_minutes = (en - base_time).seconds / 60
-                    if start_minutes < 0 or end_minutes > total_minutes:
-                        continue
-
-                    start_blocks = start_minutes / 30
-                    end_blocks = end_minutes / 30
-                    y1 = start_blocks * cell_h
-                    y2 = end_blocks * cell_h
-
-                    # choose colors depending on whether this block has overlap
-                    face_color = face_color_conf if overlap else face_color_ok
-                    edge_color = edge_conf if overlap else edge_ok
-                    lw = 2.5 if overlap else 2
-
-                    x_pos = d_index * cell_w
-                    rect = patches.Rectangle(
-                        (x_pos + 0.05, y1), cell_w - 0.1, y2 - y1,
-                        facecolor=face_color, edgecolor=edge_color,
-                        linewidth=lw, alpha=0.9, zorder=3
-                    )
-                    ax.add_patch(rect)
-
-                    # Texto del curso con mejor formato
-                    curso_text = r.get('curso', '')
-                    secc_text = r.get('secc', '')
-                    height = y2 - y1
-
-                    # Ajustar tamaño de fuente según altura
-                    if height > 1.5:
-                        fontsize = 9
-                        ax.text(
-                            x_pos + cell_w/2, y1 + height/2 + 0.15,
-                            curso_text,
-                            ha='center', va='center', fontsize=fontsize,
-                            fontweight='bold', color='white', zorder=4,
-                            wrap=True
-                        )
-                        ax.text(
-                            x_pos + cell_w/2, y1 + height/2 - 0.15,
-                            f"Secc. {secc_text}",
-                            ha='center', va='center', fontsize=fontsize-1,
-                            color='white', alpha=0.9, zorder=4
-                        )
-                    elif height > 0.7:
-                        fontsize = 8
-                        ax.text(
-                            x_pos + cell_w/2, y1 + height/2,
-                            curso_text,
-                            ha='center', va='center', fontsize=fontsize,
-                            fontweight='bold', color='white', zorder=4,
-                            wrap=True
-                        )
-                    else:
-                        fontsize = 7
-                        short_name = curso_text[:15] + '...' if len(curso_text) > 15 else curso_text
-                        ax.text(
-                            x_pos + cell_w/2, y1 + height/2,
-                            short_name,
-                            ha='center', va='center', fontsize=fontsize,
-                            color='white', zorder=4
-                        )
-
-            # Configuración de ejes
-            ax.set_xlim(-0.3, len(days) * cell_w + 0.1)
-            ax.set_ylim(-0.1, full_h + 0.7)
-            # Invertir el eje Y para que las horas tempranas aparezcan arriba
-            ax.invert_yaxis()
-            ax.set_xticks([])
-            ax.set_yticks([])
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['bottom'].set_visible(False)
-            ax.spines['left'].set_visible(False)
-
-            # Título
-            title_text = "Clases y Prácticas" if filter_types == 'CLASE' else "Exámenes"
-            ax.text(
-                len(days) * cell_w / 2, full_h + 0.9,
-                title_text,
-                ha='center', va='center', fontsize=14,
-                fontweight='bold', color=text_color
-            )
-
-            buf = io.BytesIO()
-            fig.tight_layout(pad=0.5)
-            fig.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            plt.close(fig)
-            buf.seek(0)
-
-            img = Image.open(buf).convert('RGB')
-
-            # Guardar si se especifica path
-            if save_path:
-                filename = f"{save_path}_{filter_types.lower()}.png"
-                img.save(filename, 'PNG', quality=95)
-
-            return img
-
-        classes_img = make_fig('CLASE')
-        exams_img = make_fig('EXAM')
-
-        # Guardar en caché
-        self._schedule_image_cache[schedule_index] = (classes_img, exams_img, schedule_hash)
+        classes_img = exams_img = None
+        cached = self._schedule_image_cache.get(schedule_index)
+        if cached and cached[2] == schedule_hash:
+            # Cache hit: se decodifican los PNG guardados (None si la caché global ya los soltó)
+            classes_img, exams_img = render_cache.image(cached[0]), render_cache.image(cached[1])
+        if classes_img is None or exams_img is None:
+            # Cache miss o cambió el horario: la caché global ya puede tenerlo dibujado
+            # (mismo horario en otro slot o en otra sesión); si no, se genera
+            keys = []
+            images = []
+            for view in ('CLASE', 'EXAM'):
+                blocks = self._render_blocks(rows, view)
+                keys.append(render_cache.key(blocks, view))
+                images.append(render_cache.render(blocks, view, key=keys[-1]))
+            classes_img, exams_img = images
+
+            # Guardar en caché
+            self._schedule_image_cache.put(schedule_index, (keys[0], keys[1], schedule_hash))
+
+        # Guardar si se especifica path (se copian los PNG ya comprimidos de la caché global)
+        if save_path:
+            save_path = self.work_path(save_path)
+            for suffix, view in (('clase', 'CLASE'), ('exam', 'EXAM')):
+                with open(f"{save_path}_{suffix}.png", 'wb') as f:
+                    f.write(render_cache.render_png(self._render_blocks(rows, view), view))
 
         return classes_img, exams_img
 
-    def _check_overlap_in_schedule(self, current: dict, all_rows: List[dict],
-                                   filter_types: str) -> bool:
-        """Verifica si un bloque se solapa con otros del mismo tipo."""
-        # Normalize helper to return list of slots for an entry
-        def slots_of(e):
-            if 'slots' in e and isinstance(e['slots'], list):
-                return e['slots']
-            if e.get('inicio') and e.get('fin'):
-                return [{'dia': e.get('dia'), 'inicio': e.get('inicio'), 'fin': e.get('fin'), 'tipo': e.get('tipo')}]
-            return []
-
-        current_slots = slots_of(current)
-        if not current_slots:
-            return False
+    def schedule_image_files(self, schedule_index: int) -> Tuple[str, str]:
+        """
+        Rutas a los PNG (clases, exámenes) del horario, desde la caché global de imágenes.
+        Es lo que se devuelve a la UI: Gradio sirve el archivo tal cual en vez de volver a
+        codificar una imagen PIL en cada respuesta (salvo si no se pudo escribir el archivo).
+        """
+        rows = self.schedules.get(schedule_index, [])
+        return (
+            render_cache.render_file(self._render_blocks(rows, 'CLASE'), 'CLASE'),
+            render_cache.render_file(self._render_blocks(rows, 'EXAM'), 'EXAM'),
+        )
 
-        for cslot in current_slots:
-            try:
-                st = datetime.strptime(str(cslot.get('inicio')), '%H:%M')
-                en = datetime.strptime(str(cslot.get('fin')), '%H:%M')
-            except:
+    def _render_blocks(self, rows: List[dict], filter_types: str) -> List[dict]:
+        """Slots a dibujar para 'CLASE' o 'EXAM', con su día, minutos y si se cruzan con otro bloque."""
+        group = self.GROUP_CLASES if filter_types == 'CLASE' else self.GROUP_EXAMENES
+        arr = self._slot_arrays(rows, {})
+        # Cruces por bloque dentro del grupo dibujado, calculados una sola vez
+        _, overlap_flags = self._interval_overlaps(arr, group=group)
+
+        day_index = {normalize_str(d).upper()[:3]: i for i, d in enumerate(schedule_renderer.DAYS)}
+        blocks = []
+        for k, (r, slot) in enumerate(arr['slots']):
+            if arr['group'][k] != group:
                 continue
-            dia = str(cslot.get('dia')).upper().strip()
-            tipo = (cslot.get('tipo') or '').upper()
-
-            for other in all_rows:
-                if other is current:
-                    continue
-                for oslot in slots_of(other):
-                    if str(oslot.get('dia')).upper().strip() != dia:
-                        continue
-                    tipo = normalize_str(oslot.get('tipo') or '').upper()
-                    # Verificar mismo grupo
-                    if filter_types == 'CLASE':
-                        if tipo not in self._CLASES_NORM or normalize_str(otipo).upper() not in self._CLASES_NORM:
-                            continue
-                    elif filter_types == 'EXAM':
-                        if tipo not in self._EXAMENES_NORM or normalize_str(otipo).upper() not in self._EXAMENES_NORM:
-                            continue
-                    try:
-                        ost = datetime.strptime(str(oslot.get('inicio')), '%H:%M')
-                        oen = datetime.strptime(str(oslot.get('fin')), '%H:%M')
-                    except:
-                        continue
-                    if st < oen and en > ost:
-                        return True
-
-        return False
+            d_index = day_index.get(normalize_str(slot.get('dia')).upper().strip()[:3])
+            if d_index is None:
+                continue
+            start, end = int(arr['start'][k]), int(arr['end'][k])
+            if start < schedule_renderer.START_MIN or end > schedule_renderer.END_MIN:
+                continue
+            blocks.append({
+                'day': d_index,
+                'start': start,
+                'end': end,
+                'curso': r.get('curso', ''),
+                'secc': r.get('secc', ''),
+                'overlap': bool(overlap_flags[arr['block'][k]]),
+            })
+        return blocks
+
+    def work_path(self, filename: str) -> str:
+        """Ruta de un archivo de la sesión: los nombres relativos van dentro de work_dir."""
+        os.makedirs(self.work_dir, exist_ok=True)
+        return os.path.join(self.work_dir, filename)
 
     def save_progress(self, filename: str = "matricula_progress.json") -> str:
         """Guarda progreso actual en archivo JSON."""
+        filename = self.work_path(filename)
         data = {
             'schedules': self.schedules,
             'credits': self.credits,
@@ -1021,6 +1639,7 @@ class MatriculaApp:
 
     def load_progress(self, filename: str = "matricula_progress.json") -> str:
         """Carga progreso desde archivo JSON."""
+        filename = self.work_path(filename)
         if not os.path.exists(filename):
             return f"⚠ No existe {filename}"
 
@@ -1044,18 +1663,290 @@ class MatriculaApp:
         """Exporta horario a archivo Excel."""
         df = self.get_schedule_table(schedule_index)
 
-        if filename is None:
-            filename = f"schedule_{schedule_index}.xlsx"
+        filename = self.work_path(filename or f"schedule_{schedule_index}.xlsx")
 
-        try:
-            df.to_excel(filename, index=False)
-            return f"✓ Exportado: {filename}"
-        except Exception as e:
-            return f"✗ Error al exportar: {e}"
+        # openpyxl es lento: se escribe en el pool de procesos si está activo
+        return background_jobs.run(export_excel_job, df, filename)
 
 
-# Instancia global de la aplicación
-app_logic = MatriculaApp()
+def export_excel_job(df: pd.DataFrame, filename: str) -> str:
+    """Trabajo de BackgroundJobs: escribe un horario a Excel."""
+    try:
+        df.to_excel(filename, index=False)
+        return f"✓ Exportado: {filename}"
+    except Exception as e:
+        return f"✗ Error al exportar: {e}"
+
+
+class SessionStore:
+    """
+    Un MatriculaApp por sesión del navegador (gr.Request.session_hash), para que los
+    horarios, créditos y cursos llevados de un usuario no se mezclen con los de otro.
+    Las sesiones sin actividad por más de `ttl` segundos se descartan; el catálogo de
+    horarios no se copia, cada sesión solo guarda una referencia al compartido.
+
+    Los archivos de cada sesión (progreso guardado, Excel y PNG exportados) van en su propia
+    carpeta dentro de `directory`, que se borra al descartar la sesión. Sin `directory` se
+    usa una carpeta temporal del proceso.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_sessions: int = 1000, directory: Optional[str] = None):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._directory = directory
+        # session_hash -> (app, último acceso); ordenado del acceso más antiguo al más reciente
+        self._sessions: "OrderedDict[str, Tuple[MatriculaApp, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='matriculaup_sessions_')
+            atexit.register(shutil.rmtree, self._directory, ignore_errors=True)
+        return self._directory
+
+    def session_dir(self, key: str) -> str:
+        # session_hash es alfanumérico, pero no se confía en lo que llega del navegador
+        safe = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in key)
+        return os.path.join(self.directory, safe)
+
+    @staticmethod
+    def _key(request: Optional[gr.Request]) -> str:
+        # Sin request (p.ej. llamadas directas fuera de Gradio) todo cae en una sesión local
+        return getattr(request, 'session_hash', None) or 'local'
+
+    def get(self, request: Optional[gr.Request]) -> MatriculaApp:
+        """Retorna el estado de la sesión del request, creándolo si no existe."""
+        key = self._key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(key, None)
+            app = entry[0] if entry else MatriculaApp(work_dir=self.session_dir(key))
+            self._sessions[key] = (app, now)
+            self._evict(now)
+        return app
+
+    def discard(self, request: gr.Request):
+        """Libera el estado de una sesión (al cerrar la pestaña del navegador)."""
+        with self._lock:
+            entry = self._sessions.pop(self._key(request), None)
+        if entry:
+            shutil.rmtree(entry[0].work_dir, ignore_errors=True)
+
+    def _evict(self, now: float):
+        while self._sessions:
+            _, (_, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen <= self.ttl and len(self._sessions) <= self.max_sessions:
+                break
+            _, (app, _) = self._sessions.popitem(last=False)
+            shutil.rmtree(app.work_dir, ignore_errors=True)
+
+
+# Estado por sesión de la aplicación
+sessions = SessionStore(ttl=float(os.environ.get('MATRICULA_SESSION_TTL', '3600')))
+
+
+class ServerMetrics:
+    """
+    Latencias por handler de Gradio (histogramas de buckets fijos), más el estado del
+    servidor al momento de consultar: aciertos de las cachés (BoundedCache.all_stats()),
+    sesiones activas y trabajos esperando en BackgroundJobs.
+
+    Se leen en formato de texto de Prometheus con serve(puerto) (solo en 127.0.0.1) o
+    como una línea periódica en la salida con log_every(segundos). Medir cuesta dos
+    perf_counter y un lock por evento, así que los handlers se miden siempre.
+    """
+
+    # Límites superiores de los buckets, en segundos (+Inf va implícito)
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, sessions: 'SessionStore', jobs: 'BackgroundJobs'):
+        self._sessions = sessions
+        self._jobs = jobs
+        self._lock = threading.Lock()
+        # (métrica, handler) -> [conteo por bucket..., conteo +Inf]; y su suma en segundos
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+        self._sums: Dict[Tuple[str, str], float] = {}
+        self._errors: Dict[str, int] = {}
+        self.in_flight = 0
+
+    def observe(self, handler: str, seconds: float, metric: str = 'handler'):
+        key = (metric, handler)
+        i = next((i for i, bound in enumerate(self.BUCKETS) if seconds <= bound), len(self.BUCKETS))
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.BUCKETS) + 1)
+                self._sums[key] = 0.0
+            counts[i] += 1
+            self._sums[key] += seconds
+
+    def track(self, name: str) -> Callable:
+        """
+        Decorador que mide cada llamada del handler. Los handlers generadores se miden
+        de principio a fin (y aparte hasta su primera actualización), y el wrapper sigue
+        siendo generador para que Gradio los trate igual.
+        """
+        def decorate(func):
+            if inspect.isgeneratorfunction(func):
+                @functools.wraps(func)
+                def wrapper(*args, **kwargs):
+                    t0 = self._enter()
+                    ok = False
+                    try:
+                        gen = func(*args, **kwargs)
+                        first = True
+                        for update in gen:
+                            if first:
+                                self.observe(name, time.perf_counter() - t0, metric='first_update')
+                                first = False
+                            yield update
+                        ok = True
+                    except GeneratorExit:
+                        # El cliente se fue a mitad de camino: no es un error del handler
+                        ok = True
+                        gen.close()
+                        raise
+                    finally:
+                        self._exit(name, t0, ok)
+            else:
+                @functools.wraps(func)
+                def wrapper(*args, **kwargs):
+                    t0 = self._enter()
+                    ok = False
+                    try:
+                        result = func(*args, **kwargs)
+                        ok = True
+                        return result
+                    finally:
+                        self._exit(name, t0, ok)
+            return wrapper
+        return decorate
+
+    def _enter(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def _exit(self, name: str, t0: float, ok: bool):
+        self.observe(name, time.perf_counter() - t0)
+        with self._lock:
+            self.in_flight -= 1
+            if not ok:
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def _snapshot(self):
+        with self._lock:
+            return ({k: list(v) for k, v in self._counts.items()}, dict(self._sums),
+                    dict(self._errors), self.in_flight)
+
+    def quantile(self, handler: str, q: float, metric: str = 'handler') -> Optional[float]:
+        """Cota superior del bucket donde cae el percentil q (None sin datos; inf si pasa el último)."""
+        with self._lock:
+            counts = list(self._counts.get((metric, handler), ()))
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for bound, n in zip(self.BUCKETS + (float('inf'),), counts):
+            seen += n
+            if seen >= q * total:
+                return bound
+        return float('inf')
+
+    def prometheus_text(self) -> str:
+        """Todas las métricas en el formato de exposición de texto de Prometheus."""
+        counts, sums, errors, in_flight = self._snapshot()
+        lines = []
+        for metric, help_text in (('handler', 'Duración total de cada handler de Gradio'),
+                                  ('first_update', 'Tiempo hasta la primera actualización de los handlers generadores')):
+            name = f'matricula_{metric}_seconds'
+            lines += [f'# HELP {name} {help_text}.', f'# TYPE {name} histogram']
+            for (m, handler), bucket_counts in sorted(counts.items()):
+                if m != metric:
+                    continue
+                cumulative = 0
+                for bound, n in zip(self.BUCKETS + (float('inf'),), bucket_counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{{handler="{handler}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{handler="{handler}"}} {sums[(m, handler)]:.6f}')
+                lines.append(f'{name}_count{{handler="{handler}"}} {cumulative}')
+
+        lines += ['# HELP matricula_handler_errors_total Handlers que terminaron con excepción.',
+                  '# TYPE matricula_handler_errors_total counter']
+        lines += [f'matricula_handler_errors_total{{handler="{h}"}} {n}' for h, n in sorted(errors.items())]
+
+        caches = BoundedCache.all_stats()
+        for field, kind, help_text in (('hits', 'counter', 'Aciertos'), ('misses', 'counter', 'Fallos'),
+                                       ('evictions', 'counter', 'Desalojos'),
+                                       ('entries', 'gauge', 'Entradas guardadas'),
+                                       ('bytes', 'gauge', 'Bytes ocupados'),
+                                       ('instances', 'gauge', 'Instancias vivas')):
+            name = f'matricula_cache_{field}' + ('_total' if kind == 'counter' else '')
+            lines += [f'# HELP {name} {help_text} por caché (sumado entre sesiones).', f'# TYPE {name} {kind}']
+            lines += [f'{name}{{cache="{c}"}} {stats.get(field, 0)}' for c, stats in sorted(caches.items())]
+
+        for name, value, help_text in (
+                ('matricula_active_sessions', len(self._sessions), 'Sesiones de navegador con estado en memoria'),
+                ('matricula_background_jobs_pending', self._jobs.pending, 'Trabajos en curso o en cola en BackgroundJobs'),
+                ('matricula_handlers_in_flight', in_flight, 'Handlers ejecutándose en este momento')):
+            lines += [f'# HELP {name} {help_text}.', f'# TYPE {name} gauge', f'{name} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def log_line(self) -> str:
+        """Resumen de una línea: sesiones, cola, p50/p95 por handler y tasa de aciertos por caché."""
+        counts, _, errors, in_flight = self._snapshot()
+        parts = [f'sesiones={len(self._sessions)} cola={self._jobs.pending} en_curso={in_flight}']
+        for metric, handler in sorted(k for k in counts if k[0] == 'handler'):
+            p50, p95 = self.quantile(handler, 0.5), self.quantile(handler, 0.95)
+            parts.append(f'{handler} n={sum(counts[(metric, handler)])} p50<={p50:g}s p95<={p95:g}s'
+                         + (f' err={errors[handler]}' if errors.get(handler) else ''))
+        for name, stats in sorted(BoundedCache.all_stats().items()):
+            lookups = stats['hits'] + stats['misses']
+            if lookups:
+                parts.append(f'{name} {100 * stats["hits"] / lookups:.0f}% de {lookups}')
+        return '[métricas] ' + ' | '.join(parts)
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Expone /metrics en un hilo aparte (solo local por defecto)."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Sin una línea por cada scrape
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        return server
+
+    def log_every(self, interval: float, stream=None):
+        """Escribe log_line() cada `interval` segundos en un hilo aparte."""
+        def loop():
+            while True:
+                time.sleep(interval)
+                print(self.log_line(), file=stream or sys.stdout, flush=True)
+
+        threading.Thread(target=loop, name='metrics-log', daemon=True).start()
+
+
+# Métricas del servidor (MATRICULA_METRICS_PORT / MATRICULA_METRICS_LOG_INTERVAL para verlas)
+metrics = ServerMetrics(sessions, background_jobs)
 
 
 def build_ui():
@@ -1084,7 +1975,7 @@ def build_ui():
 
                     upload = gr.File(
                         label="📁 Archivo de horarios (CSV recomendado - 10x más rápido)",
-                        file_types=[".csv", ".xlsx", ".xls"]
+                        file_types=[".csv", ".xlsx", ".xls", ".feather", ".parquet"]
                     )
                     btn_load = gr.Button("Cargar Datos de Horarios", size="sm")
                     status = gr.Textbox(label="Estado", interactive=False, show_label=False)
@@ -1228,7 +2119,7 @@ def build_ui():
 
         # ========== CALLBACKS ==========
 
-        def blocks_choices(idx: int) -> List[str]:
+        def blocks_choices(app_logic: MatriculaApp, idx: int) -> List[str]:
             """Helper: retorna lista de bloques para dropdown de eliminación."""
             # return unique block ids (one per section)
             blocks = [b.get('block') for b in app_logic.schedules.get(idx, [])]
@@ -1240,8 +2131,9 @@ def build_ui():
                     out.append(b)
             return out
 
-        def handle_load_career(selected_career):
+        def handle_load_career(selected_career, request: gr.Request):
             """Maneja la carga de una carrera."""
+            app_logic = sessions.get(request)
             if not selected_career:
                 return "⚠ Selecciona una carrera", gr.update(), gr.update(), ""
 
@@ -1274,8 +2166,9 @@ def build_ui():
             outputs=[cycle_selector, btn_select_cycle, btn_deselect_cycle]
         )
 
-        def clear_all_taken():
+        def clear_all_taken(request: gr.Request):
             """Limpia todos los cursos marcados."""
+            app_logic = sessions.get(request)
             app_logic.update_taken_courses([])
             all_m, taken, pending = app_logic.get_mandatory_courses_status()
             stats_text = f"**Llevados:** {len(taken)} / {len(all_m)} | **Pendientes:** {len(pending)}"
@@ -1287,8 +2180,9 @@ def build_ui():
             outputs=[taken_multiselect, mandatory_stats]
         )
 
-        def select_cycle_courses(cycle):
+        def select_cycle_courses(cycle, request: gr.Request):
             """Marca todos los cursos del ciclo seleccionado."""
+            app_logic = sessions.get(request)
             if not cycle or not app_logic.curriculum:
                 return gr.update(), ""
 
@@ -1301,8 +2195,9 @@ def build_ui():
 
             return gr.update(value=list(app_logic.taken_courses)), stats_text
 
-        def deselect_cycle_courses(cycle):
+        def deselect_cycle_courses(cycle, request: gr.Request):
             """Desmarca todos los cursos del ciclo seleccionado."""
+            app_logic = sessions.get(request)
             if not cycle or not app_logic.curriculum:
                 return gr.update(), ""
 
@@ -1327,19 +2222,20 @@ def build_ui():
             outputs=[taken_multiselect, mandatory_stats]
         )
 
-        def handle_load_data(uploaded):
+        def handle_load_data(uploaded, request: gr.Request):
             """Maneja la carga de datos de horarios."""
+            app_logic = sessions.get(request)
             msg = app_logic.load_excel(uploaded)
             opts = app_logic.list_courses("")
 
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(1)
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(1)
 
             return (
                 msg,
                 gr.update(choices=opts, value=None),
-                gr.update(choices=blocks_choices(1), value=None),
-                gr.update(choices=blocks_choices(2), value=None),
-                gr.update(choices=blocks_choices(3), value=None),
+                gr.update(choices=blocks_choices(app_logic, 1), value=None),
+                gr.update(choices=blocks_choices(app_logic, 2), value=None),
+                gr.update(choices=blocks_choices(app_logic, 3), value=None),
                 gr.update(value=""),
                 classes_img_b,
                 exams_img_b
@@ -1351,8 +2247,9 @@ def build_ui():
             outputs=[status, course_dropdown, remove_dd1, remove_dd2, remove_dd3, section_info, classes_img, exams_img]
         )
 
-        def update_taken_courses(selected):
+        def update_taken_courses(selected, request: gr.Request):
             """Actualiza lista de cursos llevados."""
+            app_logic = sessions.get(request)
             app_logic.update_taken_courses(selected)
 
             all_m, taken, pending = app_logic.get_mandatory_courses_status()
@@ -1366,8 +2263,10 @@ def build_ui():
             outputs=[mandatory_stats]
         )
 
-        def search_change(t, filter_m, filter_p):
+        @metrics.track('search_change')
+        def search_change(t, filter_m, filter_p, request: gr.Request):
             """Maneja cambios en búsqueda."""
+            app_logic = sessions.get(request)
             opts = app_logic.list_courses(t, filter_m, filter_p)
             return gr.update(choices=opts, value=None)
 
@@ -1389,8 +2288,9 @@ def build_ui():
             outputs=[course_dropdown]
         )
 
-        def on_course_select(course):
+        def on_course_select(course, request: gr.Request):
             """Maneja selección de curso."""
+            app_logic = sessions.get(request)
             if not course:
                 return gr.update(choices=[], value=[]), gr.update(value="")
 
@@ -1403,8 +2303,9 @@ def build_ui():
             outputs=[section_dropdown, section_info]
         )
 
-        def on_section_select(selected):
+        def on_section_select(selected, request: gr.Request):
             """Cuando se selecciona una o más secciones, mostrar días/horarios."""
+            app_logic = sessions.get(request)
             if not selected:
                 return gr.update(value="")
             # selected puede ser lista o string
@@ -1427,8 +2328,10 @@ def build_ui():
             outputs=[section_info]
         )
 
-        def add_and_refresh(selected_sections, sched, replace):
+        @metrics.track('add_and_refresh')
+        def add_and_refresh(selected_sections, sched, replace, request: gr.Request):
             """Añade secciones al horario y refresca vistas."""
+            app_logic = sessions.get(request)
             idx = int(sched)
             msg = app_logic.add_to_schedule(selected_sections, idx, force_replace=bool(replace))
 
@@ -1437,19 +2340,21 @@ def build_ui():
             if conflicts_msg:
                 msg = f"{msg}\n\n{conflicts_msg}"
 
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(idx)
-
-            return (
+            # Primero tablas y mensaje (inmediato); las imágenes llegan cuando termina el render
+            yield (
                 app_logic.get_schedule_table(1), f"**Créditos:** {app_logic.credits[1]:.1f} / 25.0",
                 app_logic.get_schedule_table(2), f"**Créditos:** {app_logic.credits[2]:.1f} / 25.0",
                 app_logic.get_schedule_table(3), f"**Créditos:** {app_logic.credits[3]:.1f} / 25.0",
                 msg,
-                classes_img_b, exams_img_b,
-                gr.update(choices=blocks_choices(1), value=None),
-                gr.update(choices=blocks_choices(2), value=None),
-                gr.update(choices=blocks_choices(3), value=None)
+                gr.update(), gr.update(),
+                gr.update(choices=blocks_choices(app_logic, 1), value=None),
+                gr.update(choices=blocks_choices(app_logic, 2), value=None),
+                gr.update(choices=blocks_choices(app_logic, 3), value=None)
             )
 
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(idx)
+            yield (*[gr.update()] * 7, classes_img_b, exams_img_b, *[gr.update()] * 3)
+
         btn_add.click(
             add_and_refresh,
             inputs=[section_dropdown, add_schedule, replace_conflicts],
@@ -1460,10 +2365,12 @@ def build_ui():
             ]
         )
 
-        def update_schedule_view(sched_idx):
+        @metrics.track('update_schedule_view')
+        def update_schedule_view(sched_idx, request: gr.Request):
             """Actualiza la visualización del horario seleccionado."""
+            app_logic = sessions.get(request)
             idx = int(sched_idx)
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(idx)
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(idx)
             return classes_img_b, exams_img_b
 
         current_schedule_view.change(
@@ -1472,33 +2379,38 @@ def build_ui():
             outputs=[classes_img, exams_img]
         )
 
-        def save_schedule_images(sched_idx):
+        @metrics.track('save_schedule_images')
+        def save_schedule_images(sched_idx, request: gr.Request):
             """Guarda las imágenes del horario como PNG."""
+            app_logic = sessions.get(request)
             idx = int(sched_idx)
-            save_path = f"horario_{idx}"
+            save_path = app_logic.work_path(f"horario_{idx}")
+            yield "⏳ Guardando imágenes..."
             app_logic.draw_week_schedule(idx, save_path=save_path)
-            return f"✓ Horarios guardados: {save_path}_clase.png y {save_path}_exam.png"
+            yield f"✓ Horarios guardados: {save_path}_clase.png y {save_path}_exam.png"
 
         btn_save_classes_png.click(
-            lambda s: save_schedule_images(s),
+            save_schedule_images,
             inputs=[current_schedule_view],
             outputs=[status]
         )
 
         btn_save_exams_png.click(
-            lambda s: save_schedule_images(s),
+            save_schedule_images,
             inputs=[current_schedule_view],
             outputs=[status]
         )
 
-        def save_progress_click():
+        def save_progress_click(request: gr.Request):
             """Guarda progreso."""
+            app_logic = sessions.get(request)
             return app_logic.save_progress()
 
         btn_save.click(save_progress_click, inputs=[], outputs=[status])
 
-        def load_progress_click():
+        def load_progress_click(request: gr.Request):
             """Carga progreso."""
+            app_logic = sessions.get(request)
             msg = app_logic.load_progress()
 
             # Actualizar cursos llevados si hay carrera cargada
@@ -1515,11 +2427,10 @@ def build_ui():
                 app_logic.get_schedule_table(2), f"**Créditos:** {app_logic.credits[2]:.1f} / 25.0",
                 app_logic.get_schedule_table(3), f"**Créditos:** {app_logic.credits[3]:.1f} / 25.0",
                 msg,
-                app_logic.draw_week_schedule(1)[0],
-                app_logic.draw_week_schedule(1)[1],
-                gr.update(choices=blocks_choices(1), value=None),
-                gr.update(choices=blocks_choices(2), value=None),
-                gr.update(choices=blocks_choices(3), value=None),
+                *app_logic.schedule_image_files(1),
+                gr.update(choices=blocks_choices(app_logic, 1), value=None),
+                gr.update(choices=blocks_choices(app_logic, 2), value=None),
+                gr.update(choices=blocks_choices(app_logic, 3), value=None),
                 gr.update(choices=cycles, value=None),
                 stats_text
             )
@@ -1536,81 +2447,90 @@ def build_ui():
         )
 
         # Exports
-        def export1():
-            return app_logic.export_schedule(1)
+        def export1(request: gr.Request):
+            app_logic = sessions.get(request)
+            yield "⏳ Exportando..."
+            yield app_logic.export_schedule(1)
 
-        def export2():
-            return app_logic.export_schedule(2)
+        def export2(request: gr.Request):
+            app_logic = sessions.get(request)
+            yield "⏳ Exportando..."
+            yield app_logic.export_schedule(2)
 
-        def export3():
-            return app_logic.export_schedule(3)
+        def export3(request: gr.Request):
+            app_logic = sessions.get(request)
+            yield "⏳ Exportando..."
+            yield app_logic.export_schedule(3)
 
         btn_export1.click(export1, inputs=[], outputs=[status])
         btn_export2.click(export2, inputs=[], outputs=[status])
         btn_export3.click(export3, inputs=[], outputs=[status])
 
         # Removes
-        def remove_sched1(block_id):
+        def remove_sched1(block_id, request: gr.Request):
+            app_logic = sessions.get(request)
             if not block_id:
                 return (
                     app_logic.get_schedule_table(1),
                     f"**Créditos:** {app_logic.credits[1]:.1f} / 25.0",
                     "⚠ Selecciona un bloque",
                     None, None,
-                    gr.update(choices=blocks_choices(1), value=None)
+                    gr.update(choices=blocks_choices(app_logic, 1), value=None)
                 )
 
             app_logic.remove_from_schedule(block_id, 1)
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(1)
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(1)
 
             return (
                 app_logic.get_schedule_table(1),
                 f"**Créditos:** {app_logic.credits[1]:.1f} / 25.0",
                 f"✓ Eliminado: {block_id}",
                 classes_img_b, exams_img_b,
-                gr.update(choices=blocks_choices(1), value=None)
+                gr.update(choices=blocks_choices(app_logic, 1), value=None)
             )
 
-        def remove_sched2(block_id):
+        def remove_sched2(block_id, request: gr.Request):
+            app_logic = sessions.get(request)
             if not block_id:
                 return (
                     app_logic.get_schedule_table(2),
                     f"**Créditos:** {app_logic.credits[2]:.1f} / 25.0",
                     "⚠ Selecciona un bloque",
                     None, None,
-                    gr.update(choices=blocks_choices(2), value=None)
+                    gr.update(choices=blocks_choices(app_logic, 2), value=None)
                 )
 
             app_logic.remove_from_schedule(block_id, 2)
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(2)
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(2)
 
             return (
                 app_logic.get_schedule_table(2),
                 f"**Créditos:** {app_logic.credits[2]:.1f} / 25.0",
                 f"✓ Eliminado: {block_id}",
                 classes_img_b, exams_img_b,
-                gr.update(choices=blocks_choices(2), value=None)
+                gr.update(choices=blocks_choices(app_logic, 2), value=None)
             )
 
-        def remove_sched3(block_id):
+        def remove_sched3(block_id, request: gr.Request):
+            app_logic = sessions.get(request)
             if not block_id:
                 return (
                     app_logic.get_schedule_table(3),
                     f"**Créditos:** {app_logic.credits[3]:.1f} / 25.0",
                     "⚠ Selecciona un bloque",
                     None, None,
-                    gr.update(choices=blocks_choices(3), value=None)
+                    gr.update(choices=blocks_choices(app_logic, 3), value=None)
                 )
 
             app_logic.remove_from_schedule(block_id, 3)
-            classes_img_b, exams_img_b = app_logic.draw_week_schedule(3)
+            classes_img_b, exams_img_b = app_logic.schedule_image_files(3)
 
             return (
                 app_logic.get_schedule_table(3),
                 f"**Créditos:** {app_logic.credits[3]:.1f} / 25.0",
                 f"✓ Eliminado: {block_id}",
                 classes_img_b, exams_img_b,
-                gr.update(choices=blocks_choices(3), value=None)
+                gr.update(choices=blocks_choices(app_logic, 3), value=None)
             )
 
         btn_remove1.click(
@@ -1631,10 +2551,26 @@ def build_ui():
             outputs=[df3, text3, status, classes_img, exams_img, remove_dd3]
         )
 
+        # Liberar el estado de la sesión al cerrar la pestaña (el TTL cubre el resto)
+        demo.unload(sessions.discard)
+
     return demo
 
 
 if __name__ == '__main__':
     demo = build_ui()
+    # Render y exportación en procesos aparte (MATRICULA_WORKERS=0 para hacerlo en línea)
+    background_jobs.start(int(os.environ.get('MATRICULA_WORKERS', '2')))
+    # Cada sesión tiene su propio estado, así que los eventos de distintos usuarios
+    # pueden atenderse en paralelo en vez de uno a la vez
+    demo.queue(default_concurrency_limit=int(os.environ.get('GRADIO_CONCURRENCY_LIMIT', '16')))
+    # Métricas para ver la carga en semana de matrícula: texto de Prometheus en
+    # http://127.0.0.1:<puerto>/metrics y/o una línea de resumen cada N segundos
+    metrics_port = int(os.environ.get('MATRICULA_METRICS_PORT', '0'))
+    if metrics_port:
+        metrics.serve(metrics_port)
+    metrics_interval = float(os.environ.get('MATRICULA_METRICS_LOG_INTERVAL', '0'))
+    if metrics_interval > 0:
+        metrics.log_every(metrics_interval)
     port = int(os.environ.get('GRADIO_SERVER_PORT', '7860'))
     demo.launch(share=False, server_name="127.0.0.1", server_port=port)
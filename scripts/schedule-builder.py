@@ -1,11 +1,18 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+from itertools import count, islice
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from PIL import Image, ImageGrab
+from PIL import Image, ImageDraw, ImageFont
 import unicodedata
 from tkinter import PhotoImage
 
+# Utilidades compartidas con la app de escritorio (src/matriculaup)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from matriculaup.core.timeutil import hhmm_to_minutes, hhmm_array_to_minutes
+
 def parse_credits(value):
     s = str(value).strip().replace(',', '.')
     try:
@@ -25,6 +32,213 @@ def match_keywords(text, keywords):
     text_norm = normalize_str(text)
     return all(kw in text_norm for kw in keywords)
 
+# Grupos de tipo: solo se comparan cruces dentro del mismo grupo
+CLASES_SET = {"CLASE", "PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"}
+EXAMENES_SET = {"FINAL", "PARCIAL"}
+GRUPO_CLASE, GRUPO_EXAMEN, GRUPO_OTRO = 0, 1, -1
+
+GROUP_KEYS = ["Curso", "Secc", "Docentes", "Cred", "Prerequisitos"]
+
+def tipo_grupo(tipo):
+    t = (str(tipo) or "").upper().strip()
+    if t in CLASES_SET:
+        return GRUPO_CLASE
+    if t in EXAMENES_SET:
+        return GRUPO_EXAMEN
+    return GRUPO_OTRO
+
+def time_to_minutes(value):
+    # 'HH:MM' -> minutos desde medianoche; -1 si no es una hora válida
+    return hhmm_to_minutes(value, -1)
+
+# Geometría de la grilla, compartida por los canvas y la exportación a imagen
+DAYS = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO']
+DAY_INDEX = {
+    'LUN': 0, 'LUNES': 0,
+    'MAR': 1, 'MARTES': 1,
+    'MIE': 2, 'MIÉRCOLES': 2,
+    'JUE': 3, 'JUEVES': 3,
+    'VIE': 4, 'VIERNES': 4,
+    'SAB': 5, 'SÁBADO': 5
+}
+CELL_WIDTH = 120
+CELL_HEIGHT = 30
+FIRST_COL_WIDTH = 80
+HEADER_HEIGHT = 40
+GRID_START = 7 * 60 + 30   # 07:30
+GRID_END = 23 * 60 + 30    # 23:30 (última fila)
+GRID_WIDTH = FIRST_COL_WIDTH + len(DAYS) * CELL_WIDTH
+GRID_HEIGHT = HEADER_HEIGHT + ((GRID_END - GRID_START) // 30 + 1) * CELL_HEIGHT
+
+def block_color(tipo):
+    if tipo == "CLASE":
+        return '#7ecbff'  # celeste
+    if tipo in {"PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"}:
+        return '#2ecc40'  # verde oscuro
+    if tipo in {"FINAL", "PARCIAL"}:
+        return 'red'
+    return 'gray90'
+
+def block_label(block_id, prof):
+    # block_id: "Nombre del Curso__Seccion" -> "Curso abreviado (Secc), APELLIDO"
+    curso, secc = block_id.split("__", 1) if "__" in block_id else (block_id, "")
+    curso = curso.strip()
+    # Abrevia el nombre si es muy largo
+    if len(curso) > 22:
+        palabras = curso.split()
+        curso_abrev = ""
+        for p in palabras:
+            if len(curso_abrev) + len(p) + 1 > 18:
+                curso_abrev += p[:4] + ". "
+                break
+            curso_abrev += p[:8] + " "
+        curso = curso_abrev.strip()
+    secc = secc.strip()
+    secc_txt = f"({secc})" if secc else ""
+    # Apellido del profesor (primera palabra del campo)
+    apellido = prof.split(",")[0].strip().upper() if prof else ""
+    return f"{curso} {secc_txt}, {apellido}"
+
+def block_box(dia, ini, fin):
+    # (x1, y1, x2, y2) del bloque en la grilla; None si el día o las horas no son válidos
+    d = (dia or "").upper().strip()
+    start, end = time_to_minutes(ini), time_to_minutes(fin)
+    if d not in DAY_INDEX or start < 0 or end < 0:
+        return None
+    x1 = FIRST_COL_WIDTH + DAY_INDEX[d] * CELL_WIDTH
+    y1 = HEADER_HEIGHT + (start - GRID_START) / 30 * CELL_HEIGHT
+    y2 = HEADER_HEIGHT + (end - GRID_START) / 30 * CELL_HEIGHT
+    return x1, y1, x1 + CELL_WIDTH, y2
+
+def schedule_rows(tree):
+    # Filas (block_id, valores) de un Treeview de horario
+    return [(tree.item(sid)['text'], tree.item(sid)['values']) for sid in tree.get_children()]
+
+class ScheduleImageRenderer:
+    """
+    Dibuja los horarios con PIL, sin ventana: misma grilla, colores y textos que los canvas
+    de Clases y Exámenes, pero a partir de las filas del horario (no de la pantalla).
+    La grilla vacía se dibuja una sola vez y cada imagen parte de una copia; cada bloque
+    (rectángulo + texto) se dibuja una vez y se pega, porque en una exportación en lote las
+    mismas secciones se repiten en muchos horarios.
+    """
+
+    FONT_NAMES = ['arialbd.ttf', 'DejaVuSans-Bold.ttf']
+    KINDS = {"clases": CLASES_SET, "examenes": EXAMENES_SET}
+    MAX_TILES = 2048
+
+    def __init__(self, scale=2, png_compress_level=3):
+        self.scale = scale
+        self.png_compress_level = png_compress_level
+        self._grid = None
+        self._fonts = {}
+        self._tiles = {}
+
+    def font(self, size):
+        if size not in self._fonts:
+            self._fonts[size] = None
+            for name in self.FONT_NAMES:
+                try:
+                    self._fonts[size] = ImageFont.truetype(name, size * self.scale)
+                    break
+                except OSError:
+                    continue
+            if self._fonts[size] is None:
+                try:
+                    self._fonts[size] = ImageFont.load_default(size=size * self.scale)
+                except TypeError:
+                    self._fonts[size] = ImageFont.load_default()
+        return self._fonts[size]
+
+    def _xy(self, *coords):
+        return [c * self.scale for c in coords]
+
+    def _wrap(self, text, font, max_width):
+        lines, current = [], ""
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            if current and font.getlength(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return "\n".join(lines)
+
+    def grid_image(self):
+        if self._grid is None:
+            img = Image.new("RGB", tuple(self._xy(GRID_WIDTH, GRID_HEIGHT)), "white")
+            draw = ImageDraw.Draw(img)
+            font = self.font(10)
+            for i, day in enumerate(DAYS):
+                x = FIRST_COL_WIDTH + i * CELL_WIDTH
+                draw.rectangle(self._xy(x, 0, x + CELL_WIDTH, HEADER_HEIGHT), fill="lightgray", outline="black")
+                draw.text(self._xy(x + CELL_WIDTH / 2, HEADER_HEIGHT / 2), day, fill="black", font=font, anchor="mm")
+            for row, minutes in enumerate(range(GRID_START, GRID_END + 1, 30)):
+                y = HEADER_HEIGHT + row * CELL_HEIGHT
+                draw.rectangle(self._xy(0, y, FIRST_COL_WIDTH, y + CELL_HEIGHT), outline="black")
+                draw.text(self._xy(FIRST_COL_WIDTH / 2, y + CELL_HEIGHT / 2),
+                          f"{minutes // 60:02d}:{minutes % 60:02d}", fill="black", font=font, anchor="mm")
+                for i in range(len(DAYS)):
+                    x = FIRST_COL_WIDTH + i * CELL_WIDTH
+                    draw.rectangle(self._xy(x, y, x + CELL_WIDTH, y + CELL_HEIGHT), outline="black")
+            self._grid = img
+        return self._grid
+
+    def render(self, rows, kind="clases"):
+        """rows: (block_id, valores del Treeview); kind: "clases" o "examenes"."""
+        tipos = self.KINDS[kind]
+        img = self.grid_image().copy()
+        for block_id, v in rows:
+            tipo = (v[2] or "").upper().strip()
+            box = block_box(v[3], v[4], v[5]) if tipo in tipos else None
+            if box is None:
+                continue
+            x1, y1, x2, y2 = (round(c) for c in self._xy(*box))
+            img.paste(self._tile(block_label(block_id, v[1]), block_color(tipo), x2 - x1, y2 - y1), (x1, y1))
+        return img
+
+    def _tile(self, label, color, width, height):
+        key = (label, color, width, height)
+        tile = self._tiles.get(key)
+        if tile is None:
+            if len(self._tiles) >= self.MAX_TILES:
+                self._tiles.clear()
+            tile = Image.new("RGB", (width + 1, max(height, 0) + 1), "white")
+            draw = ImageDraw.Draw(tile)
+            draw.rectangle((0, 0, width, max(height, 0)), fill=color, outline="black")
+            font = self.font(9)
+            txt = self._wrap(label, font, (CELL_WIDTH - 12) * self.scale)
+            draw.multiline_text((width / 2, height / 2), txt, fill="black",
+                                font=font, anchor="mm", align="center")
+            self._tiles[key] = tile
+        return tile
+
+    def export(self, schedules, directory, formats=("png",), pdf_name="Horarios.pdf"):
+        """
+        Exporta en lote. schedules: {nombre: filas}. Por cada horario escribe
+        '<nombre>_Clases.png' y '<nombre>_Examenes.png'; con "pdf" escribe además un solo
+        PDF con una página por imagen. Devuelve las rutas escritas.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths, pages = [], []
+        for name, rows in schedules.items():
+            for kind, suffix in (("clases", "Clases"), ("examenes", "Examenes")):
+                img = self.render(rows, kind)
+                if "png" in formats:
+                    path = os.path.join(directory, f"{name}_{suffix}.png")
+                    img.save(path, "PNG", compress_level=self.png_compress_level)
+                    paths.append(path)
+                if "pdf" in formats:
+                    pages.append(img)
+        if pages:
+            path = os.path.join(directory, pdf_name)
+            pages[0].save(path, "PDF", save_all=True, append_images=pages[1:],
+                          resolution=72 * self.scale)
+            paths.append(path)
+        return paths
+
 class ScheduleBuilder:
     def __init__(self, root):
         self.root = root
@@ -34,6 +248,14 @@ class ScheduleBuilder:
         self.root.columnconfigure(0, weight=1)
         self.courses_df = None
         self.schedules_data = {}
+        # Datos por grupo (curso/sección) precalculados en prepare_courses
+        self.course_groups = []
+        self._fill_job = None
+        # Bloques ya dibujados en los canvas, por pestaña
+        self._drawn_blocks = {}  # pestaña -> {block_id: (filas, tag)}
+        self._block_tag_ids = count()
+        # Exportación a imagen sin depender de la ventana
+        self.image_renderer = ScheduleImageRenderer()
 
         # Frame principal con grid
         self.main_frame = ttk.Frame(root, padding="10")
@@ -83,6 +305,10 @@ class ScheduleBuilder:
         self.courses_tree.grid(row=0, column=0, sticky="nsew")
         self.courses_scrollbar.config(command=self.courses_tree.yview)
 
+        # Tags de color para cruces
+        self.courses_tree.tag_configure("conflict", background="#ffcccc")    # rojo claro
+        self.courses_tree.tag_configure("no_conflict", background="#ccffcc") # verde claro
+
         # Columnas y encabezados
         self.courses_tree["columns"] = (
             "Secc", "Profesor", "Tipo", "Dia", "Inicio", "Fin", "Prerequisitos", "Cred"
@@ -232,12 +458,19 @@ class ScheduleBuilder:
         self.schedule_canvas_clases.config(scrollregion=self.schedule_canvas_clases.bbox("all"))
         self.schedule_canvas_examenes.config(scrollregion=self.schedule_canvas_examenes.bbox("all"))
         
-        # Botón para guardar PNG
+        # Botones para guardar PNG / exportar todos los horarios
+        buttons_frame = ttk.Frame(self.right_frame)
+        buttons_frame.grid(row=1, column=0, sticky=tk.W)
         ttk.Button(
-            self.right_frame,
+            buttons_frame,
             text="Guardar Clases y Exámenes como PNG",
             command=self.save_both_canvases
-        ).grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(
+            buttons_frame,
+            text="Exportar los 3 horarios (PNG y PDF)",
+            command=self.export_all_schedules
+        ).pack(side=tk.LEFT, padx=5, pady=5)
         
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
@@ -245,33 +478,21 @@ class ScheduleBuilder:
     def create_schedule_grid(self, canvas):
         canvas.delete("all")
         
-        days = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO']
-        cell_width = 120
-        cell_height = 30
-        first_col_width = 80
-        header_height = 40
-        
-        for i, day in enumerate(days):
-            x = first_col_width + i * cell_width
-            canvas.create_rectangle(x, 0, x + cell_width, header_height, fill='lightgray')
-            canvas.create_text(x + cell_width/2, header_height/2, text=day)
-        
-        current_time = datetime.strptime("07:30", "%H:%M")
-        end_time = datetime.strptime("23:30", "%H:%M")
-        row = 0
-        while current_time <= end_time:
-            y = header_height + row * cell_height
-            time_str = current_time.strftime("%H:%M")
-            
-            canvas.create_rectangle(0, y, first_col_width, y + cell_height)
-            canvas.create_text(40, y + cell_height/2, text=time_str)
+        for i, day in enumerate(DAYS):
+            x = FIRST_COL_WIDTH + i * CELL_WIDTH
+            canvas.create_rectangle(x, 0, x + CELL_WIDTH, HEADER_HEIGHT, fill='lightgray', tags="grid")
+            canvas.create_text(x + CELL_WIDTH/2, HEADER_HEIGHT/2, text=day, tags="grid")
+        
+        for row, minutes in enumerate(range(GRID_START, GRID_END + 1, 30)):
+            y = HEADER_HEIGHT + row * CELL_HEIGHT
+            time_str = f"{minutes // 60:02d}:{minutes % 60:02d}"
             
-            for i in range(len(days)):
-                x = first_col_width + i * cell_width
-                canvas.create_rectangle(x, y, x + cell_width, y + cell_height)
+            canvas.create_rectangle(0, y, FIRST_COL_WIDTH, y + CELL_HEIGHT, tags="grid")
+            canvas.create_text(FIRST_COL_WIDTH/2, y + CELL_HEIGHT/2, text=time_str, tags="grid")
             
-            current_time += timedelta(minutes=30)
-            row += 1
+            for i in range(len(DAYS)):
+                x = FIRST_COL_WIDTH + i * CELL_WIDTH
+                canvas.create_rectangle(x, y, x + CELL_WIDTH, y + CELL_HEIGHT, tags="grid")
 
     # ----------------- load_file / filter_courses -----------------
     def load_file(self):
@@ -281,127 +502,149 @@ class ScheduleBuilder:
         if file_path:
             try:
                 if file_path.endswith('.csv'):
-                    self.courses_df = pd.read_csv(file_path)
+                    df = pd.read_csv(file_path)
                 else:
-                    self.courses_df = pd.read_excel(file_path)
-                
+                    df = pd.read_excel(file_path)
+
+                self.courses_df = self.prepare_courses(df)
                 self.filter_courses()
                 messagebox.showinfo("Éxito", "Datos cargados correctamente!")
             except Exception as e:
                 messagebox.showerror("Error", f"Error al cargar archivo: {str(e)}")
 
+    def prepare_courses(self, df):
+        """
+        Precalcula lo que filter_courses necesita en cada tecla: texto normalizado para la
+        búsqueda, horas como minutos enteros, grupo de tipo y el id de curso/sección de cada
+        fila, además de las filas del árbol ya armadas por grupo.
+        """
+        df = df.copy()
+        if "Prerequisitos" not in df.columns:
+            df["Prerequisitos"] = ""
+
+        df["_curso_norm"] = df["Curso"].map(normalize_str)
+        df["_docente_norm"] = df["Docentes"].map(normalize_str)
+        df["_ini"] = hhmm_array_to_minutes(df["Horario_Inicio"])
+        df["_fin"] = hhmm_array_to_minutes(df["Horario_Cierre"])
+        df["_dia"] = df["Día"].astype(str).str.upper().str.strip()
+        df["_grupo"] = df["Tipo"].map(tipo_grupo).astype(np.int8)
+        df["_grupo_id"] = df.groupby(GROUP_KEYS, dropna=False).ngroup().astype(np.int64)
+
+        # Un registro por grupo, en el mismo orden en que groupby los recorre
+        n_groups = int(df["_grupo_id"].max()) + 1 if len(df) else 0
+        groups = [None] * n_groups
+        cols = GROUP_KEYS + ["_curso_norm", "_docente_norm", "Tipo", "Día",
+                             "Horario_Inicio", "Horario_Cierre", "_grupo_id"]
+        for curso, secc, prof, cred, prereq, curso_n, docente_n, tipo, dia, ini, fin, gid in \
+                df[cols].itertuples(index=False, name=None):
+            g = groups[gid]
+            if g is None:
+                g = groups[gid] = {
+                    "curso": curso,
+                    "values": (secc, prof, "", "", "", "", str(prereq), str(cred)),
+                    "curso_norm": curso_n,
+                    "docente_norm": docente_n,
+                    "children": [],
+                }
+            g["children"].append(("", "", str(tipo), str(dia), str(ini), str(fin), "", ""))
+        self.course_groups = groups
+
+        # Días como enteros para comparar cruces con arrays
+        self._day_codes = {d: i for i, d in enumerate(pd.unique(df["_dia"]))}
+        self._row_day = df["_dia"].map(self._day_codes).to_numpy(np.int32)
+        return df
+
+    def _active_blocks(self):
+        """Bloques del horario activo como arrays (día, grupo, inicio, fin), sin los no comparables."""
+        sel_tree = self.schedules_data[self.get_current_tab()]["tree"]
+        days, grupos, starts, ends = [], [], [], []
+        for sid in sel_tree.get_children():
+            v = sel_tree.item(sid)['values']
+            grupo = tipo_grupo(v[2] or "")
+            ini, fin = time_to_minutes(v[4]), time_to_minutes(v[5])
+            day = self._day_codes.get(str(v[3]).upper().strip())
+            if grupo == GRUPO_OTRO or ini < 0 or fin < 0 or day is None:
+                continue
+            days.append(day)
+            grupos.append(grupo)
+            starts.append(ini)
+            ends.append(fin)
+        return np.array(days), np.array(grupos), np.array(starts), np.array(ends)
+
+    def conflicting_groups(self):
+        """
+        Máscara por grupo (curso/sección): True si alguna de sus filas se cruza con un bloque
+        del mismo día y mismo grupo de tipo en el horario activo. Se calcula de una sola vez
+        comparando todas las filas contra todos los bloques ocupados.
+        """
+        df = self.courses_df
+        n_groups = len(self.course_groups)
+        e_day, e_grupo, e_ini, e_fin = self._active_blocks()
+        if not len(e_day) or not n_groups:
+            return np.zeros(n_groups, dtype=bool)
+
+        ini = df["_ini"].to_numpy()[:, None]
+        fin = df["_fin"].to_numpy()[:, None]
+        grupo = df["_grupo"].to_numpy()
+        valid = (ini[:, 0] >= 0) & (fin[:, 0] >= 0) & (grupo != GRUPO_OTRO)
+
+        overlaps = (
+            (self._row_day[:, None] == e_day)
+            & (grupo[:, None] == e_grupo)
+            & (ini < e_fin)
+            & (fin > e_ini)
+        ).any(axis=1) & valid
+        hits = df["_grupo_id"].to_numpy()[overlaps]
+        return np.bincount(hits, minlength=n_groups) > 0
+
     def filter_courses(self, *args, only_no_conflict=False):
         if self.courses_df is None:
             return
-        for item in self.courses_tree.get_children():
-            self.courses_tree.delete(item)
 
         search_term = normalize_str(self.search_var.get())
         keywords = [w for w in search_term.split() if w]
 
-        filtered_df = self.courses_df.copy()
+        # Curso y Docentes son parte de la clave del grupo, así que la búsqueda se resuelve por grupo
+        groups = self.course_groups
+        selected = np.ones(len(groups), dtype=bool)
         if keywords:
-            mask = filtered_df.apply(
-                lambda row: (
-                    match_keywords(row['Curso'], keywords) or
-                    match_keywords(row['Docentes'], keywords)
-                ),
-                axis=1
-            )
-            filtered_df = filtered_df[mask]
-
-        # Grupos de tipo
-        CLASES_SET = {"CLASE", "PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"}
-        EXAMENES_SET = {"FINAL", "PARCIAL"}
-
-        # Obtener bloques ya seleccionados en el horario activo
-        tab = self.get_current_tab()
-        schedule_info = self.schedules_data[tab]
-        sel_tree = schedule_info["tree"]
-        existing_blocks = []
-        for sid in sel_tree.get_children():
-            v = sel_tree.item(sid)['values']
-            tipo = (v[2] or "").upper().strip()
-            dia = v[3]
-            ini = v[4]
-            fin = v[5]
-            existing_blocks.append((tipo, dia, ini, fin))
-
-        grouped = filtered_df.groupby(
-            ["Curso", "Secc", "Docentes", "Cred", "Prerequisitos"],
-            dropna=False
-        )
-
-        # Configura los tags de color
-        self.courses_tree.tag_configure("conflict", background="#ffcccc")    # rojo claro
-        self.courses_tree.tag_configure("no_conflict", background="#ccffcc") # verde claro
-
-        for (curso, secc, prof, cred, prereq), group_data in grouped:
-            # Verifica si algún bloque de este curso se cruza con los existentes SOLO dentro del mismo grupo
-            has_conflict = False
-            for idx, row in group_data.iterrows():
-                tipo_n = (str(row["Tipo"]) or "").upper().strip()
-                dia_n = str(row["Día"]).upper().strip()
-                try:
-                    start_n = datetime.strptime(row["Horario_Inicio"], '%H:%M')
-                    end_n = datetime.strptime(row["Horario_Cierre"], '%H:%M')
-                except:
-                    continue
-                # Determina el grupo del bloque nuevo
-                if tipo_n in CLASES_SET:
-                    grupo_n = "CLASE"
-                elif tipo_n in EXAMENES_SET:
-                    grupo_n = "EXAMEN"
-                else:
-                    grupo_n = "OTRO"
-                for tipo_e, dia_e, ini_e, fin_e in existing_blocks:
-                    if dia_n != str(dia_e).upper().strip():
-                        continue
-                    # Determina el grupo del bloque existente
-                    if tipo_e in CLASES_SET:
-                        grupo_e = "CLASE"
-                    elif tipo_e in EXAMENES_SET:
-                        grupo_e = "EXAMEN"
-                    else:
-                        grupo_e = "OTRO"
-                    # Solo comparar si son del mismo grupo
-                    if grupo_n != grupo_e or grupo_n == "OTRO":
-                        continue
-                    try:
-                        start_e = datetime.strptime(ini_e, '%H:%M')
-                        end_e = datetime.strptime(fin_e, '%H:%M')
-                    except:
-                        continue
-                    if start_n < end_e and end_n > start_e:
-                        has_conflict = True
-                        break
-                if has_conflict:
-                    break
-
-            tag = "conflict" if has_conflict else "no_conflict"
-            if only_no_conflict and tag == "conflict":
-                continue
-            parent_id = self.courses_tree.insert(
-                "",
-                "end",
-                text=curso,
-                values=(
-                    secc, prof, "", "", "", "", str(prereq), str(cred)
-                ),
-                tags=(tag,)
-            )
-            for idx, row in group_data.iterrows():
-                tipo = str(row["Tipo"]) if "Tipo" in row else ""
-                dia  = str(row["Día"])
-                ini  = str(row["Horario_Inicio"])
-                fin  = str(row["Horario_Cierre"])
-                self.courses_tree.insert(
-                    parent_id,
-                    "end",
-                    text="",
-                    values=("", "", tipo, dia, ini, fin, "", ""),
-                    tags=(tag,)
-                )
+            curso_n = pd.Series([g["curso_norm"] for g in groups], dtype=object)
+            docente_n = pd.Series([g["docente_norm"] for g in groups], dtype=object)
+            in_curso = np.ones(len(groups), dtype=bool)
+            in_docente = np.ones(len(groups), dtype=bool)
+            for kw in keywords:
+                in_curso &= curso_n.str.contains(kw, regex=False).to_numpy()
+                in_docente &= docente_n.str.contains(kw, regex=False).to_numpy()
+            selected = in_curso | in_docente
+
+        conflicts = self.conflicting_groups()
+        if only_no_conflict:
+            selected &= ~conflicts
+
+        rows = [(groups[i], "conflict" if conflicts[i] else "no_conflict") for i in np.flatnonzero(selected)]
+        self._fill_courses_tree(rows)
+
+    # Grupos insertados por tanda: la lista se ve al instante y la UI sigue respondiendo
+    FILL_BATCH = 200
+
+    def _fill_courses_tree(self, rows):
+        if self._fill_job is not None:
+            self.root.after_cancel(self._fill_job)
+            self._fill_job = None
+        self.courses_tree.delete(*self.courses_tree.get_children())
+        self._insert_batch(iter(rows))
+
+    def _insert_batch(self, rows):
+        self._fill_job = None
+        tree = self.courses_tree
+        inserted = 0
+        for group, tag in islice(rows, self.FILL_BATCH):
+            parent_id = tree.insert("", "end", text=group["curso"], values=group["values"], tags=(tag,))
+            for child in group["children"]:
+                tree.insert(parent_id, "end", text="", values=child, tags=(tag,))
+            inserted += 1
+        if inserted == self.FILL_BATCH:
+            self._fill_job = self.root.after(1, self._insert_batch, rows)
 
     # ----------------- Acciones de horario (añadir, eliminar, limpiar) -----------------
     def on_tab_changed(self, event):
@@ -504,20 +747,18 @@ class ScheduleBuilder:
         for idx_new, rn in nd.iterrows():
             tipo_n = (str(rn['Tipo']) or "").upper().strip()
             d_n = str(rn['Día']).upper().strip()
-            try:
-                start_n = datetime.strptime(rn['Horario_Inicio'], '%H:%M')
-                end_n   = datetime.strptime(rn['Horario_Cierre'], '%H:%M')
-            except:
+            start_n = time_to_minutes(rn['Horario_Inicio'])
+            end_n   = time_to_minutes(rn['Horario_Cierre'])
+            if start_n < 0 or end_n < 0:
                 continue
             for idx_ex, re in existing_df.iterrows():
                 tipo_e = (str(re['Tipo']) or "").upper().strip()
                 d_e = str(re['Día']).upper().strip()
                 if d_n != d_e:
                     continue
-                try:
-                    start_e = datetime.strptime(re['Horario_Inicio'], '%H:%M')
-                    end_e   = datetime.strptime(re['Horario_Cierre'], '%H:%M')
-                except:
+                start_e = time_to_minutes(re['Horario_Inicio'])
+                end_e   = time_to_minutes(re['Horario_Cierre'])
+                if start_e < 0 or end_e < 0:
                     continue
                 if start_n < end_e and end_n > start_e:
                     # Solo comparar dentro del mismo grupo
@@ -663,151 +904,87 @@ class ScheduleBuilder:
 
     # ----------------- REFRESH / DRAW -----------------
     def refresh_schedule(self):
-        # Redibuja la grilla base en ambos canvas
-        self.create_schedule_grid(self.schedule_canvas_clases)
-        self.create_schedule_grid(self.schedule_canvas_examenes)
-        
-        # Ajustar scroll
-        self.schedule_canvas_clases.config(scrollregion=self.schedule_canvas_clases.bbox("all"))
-        self.schedule_canvas_examenes.config(scrollregion=self.schedule_canvas_examenes.bbox("all"))
-        
+        """
+        Sincroniza los canvas con el horario activo. La grilla se dibuja una sola vez y cada
+        bloque tiene sus propios items (tags "tab<n>" y uno propio del bloque): solo se crean
+        los bloques nuevos, se borran los quitados y al cambiar de pestaña se ocultan o
+        muestran los grupos de items ya dibujados.
+        """
         tab = self.get_current_tab()
-        schedule_info = self.schedules_data[tab]
-        sel_tree = schedule_info["tree"]
-        
-        CLASES_SET = {"CLASE", "PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"}
-        EXAMENES_SET = {"FINAL", "PARCIAL"}
-        
-        for sid in sel_tree.get_children():
-            v = sel_tree.item(sid)['values']
-            tipo = (v[2] or "").upper().strip()
-            dia  = v[3]
-            ini  = v[4]
-            fin  = v[5]
-            prof = v[1]
-            block_id = sel_tree.item(sid)['text']
-            
-            if tipo in CLASES_SET:
-                self.draw_schedule_block(self.schedule_canvas_clases, dia, ini, fin, block_id, prof)
-            if tipo in EXAMENES_SET:
-                self.draw_schedule_block(self.schedule_canvas_examenes, dia, ini, fin, block_id, prof)
-        
-        # Ajustar scrollregion después de dibujar los rectángulos
-        self.schedule_canvas_clases.config(scrollregion=self.schedule_canvas_clases.bbox("all"))
-        self.schedule_canvas_examenes.config(scrollregion=self.schedule_canvas_examenes.bbox("all"))
-
-    def draw_schedule_block(self, canvas, dia, ini, fin, block_id, prof):
-        day_mapping = {
-            'LUN': 0, 'LUNES': 0,
-            'MAR': 1, 'MARTES': 1,
-            'MIE': 2, 'MIÉRCOLES': 2,
-            'JUE': 3, 'JUEVES': 3,
-            'VIE': 4, 'VIERNES': 4,
-            'SAB': 5, 'SÁBADO': 5
-        }
-        
-        d = (dia or "").upper().strip()
-        if d not in day_mapping:
-            return
-        
-        try:
-            start_time = datetime.strptime(ini, '%H:%M')
-            end_time   = datetime.strptime(fin, '%H:%M')
-        except:
+        sel_tree = self.schedules_data[tab]["tree"]
+        canvases = (self.schedule_canvas_clases, self.schedule_canvas_examenes)
+
+        rows_by_block = {}
+        for block_id, values in schedule_rows(sel_tree):
+            rows_by_block.setdefault(block_id, []).append(values)
+
+        # Un bloque cuyas filas cambiaron se trata como quitado y vuelto a agregar
+        signatures = {b: tuple(map(tuple, rows)) for b, rows in rows_by_block.items()}
+        drawn = self._drawn_blocks.setdefault(tab, {})
+        for block_id in [b for b in drawn if drawn[b][0] != signatures.get(b)]:
+            _, tag = drawn.pop(block_id)
+            for canvas in canvases:
+                canvas.delete(tag)
+
+        for block_id, rows in rows_by_block.items():
+            if block_id in drawn:
+                continue
+            tag = f"block{next(self._block_tag_ids)}"
+            drawn[block_id] = (signatures[block_id], tag)
+            tags = ("block", f"tab{tab}", tag)
+            for v in rows:
+                tipo = (v[2] or "").upper().strip()
+                dia, ini, fin, prof = v[3], v[4], v[5], v[1]
+                if tipo in CLASES_SET:
+                    self.draw_schedule_block(self.schedule_canvas_clases, dia, ini, fin, block_id, prof, tipo, tags)
+                if tipo in EXAMENES_SET:
+                    self.draw_schedule_block(self.schedule_canvas_examenes, dia, ini, fin, block_id, prof, tipo, tags)
+
+        for canvas in canvases:
+            for other in self.schedules_data:
+                canvas.itemconfigure(f"tab{other}", state="normal" if other == tab else "hidden")
+
+    def draw_schedule_block(self, canvas, dia, ini, fin, block_id, prof, tipo="", tags=()):
+        box = block_box(dia, ini, fin)
+        if box is None:
             return
-        
-        base_time = datetime.strptime("07:30", "%H:%M")
-        start_blocks = (start_time - base_time).seconds / 1800
-        end_blocks   = (end_time - base_time).seconds / 1800
-        
-        cell_width = 120
-        cell_height = 30
-        first_col_width = 80
-        header_height = 40
-        
-        day_index = day_mapping[d]
-        x1 = first_col_width + day_index * cell_width
-        y1 = header_height + start_blocks * cell_height
-        x2 = x1 + cell_width
-        y2 = header_height + end_blocks * cell_height
-
-        # --- COLOR SEGÚN TIPO ---
-        tipo = ""
-        # Buscar el tipo usando el block_id y prof
-        for tab in self.schedules_data.values():
-            tree = tab["tree"]
-            for sid in tree.get_children():
-                v = tree.item(sid)['values']
-                t = (v[2] or "").upper().strip()
-                p = v[1]
-                b = tree.item(sid)['text']
-                if b == block_id and p == prof:
-                    tipo = t
-                    break
-
-        if tipo == "CLASE":
-            color = '#7ecbff'  # celeste
-        elif tipo in {"PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"}:
-            color = '#2ecc40'  # verde oscuro
-        elif tipo == "FINAL":
-            color = 'red'
-        elif tipo == "PARCIAL":
-            color = 'red'
-        else:
-            color = 'gray90'
-        # ------------------------
-
-        # --- TEXTO RESUMIDO ---
-        # block_id: "Nombre del Curso__Seccion"
-        curso, secc = block_id.split("__", 1) if "__" in block_id else (block_id, "")
-        curso = curso.strip()
-        # Abrevia el nombre si es muy largo
-        if len(curso) > 22:
-            palabras = curso.split()
-            curso_abrev = ""
-            for p in palabras:
-                if len(curso_abrev) + len(p) + 1 > 18:
-                    curso_abrev += p[:4] + ". "
-                    break
-                curso_abrev += p[:8] + " "
-            curso = curso_abrev.strip()
-        # Sección entre paréntesis
-        secc = secc.strip()
-        secc_txt = f"({secc})" if secc else ""
-        # Apellido del profesor (primera palabra del campo)
-        apellido = ""
-        if prof:
-            apellido = prof.split(",")[0].strip().upper()
-        txt = f"{curso} {secc_txt}, {apellido}"
-        # ----------------------
-
-        canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='black')
+        x1, y1, x2, y2 = box
+        # Color según el tipo de la fila que se dibuja
+        canvas.create_rectangle(x1, y1, x2, y2, fill=block_color(tipo), outline='black', tags=tags)
         canvas.create_text(
             (x1 + x2)/2,
             (y1 + y2)/2,
-            text=txt,
-            width=(cell_width - 12),  # Ajusta el ancho para evitar desbordes
-            font=("Arial", 9, "bold")
+            text=block_label(block_id, prof),
+            width=(CELL_WIDTH - 12),  # Ajusta el ancho para evitar desbordes
+            font=("Arial", 9, "bold"),
+            tags=tags
         )
 
-    # ----------------- GUARDAR IMAGEN (Screenshot) -----------------
+    # ----------------- GUARDAR IMAGEN (sin capturar la pantalla) -----------------
     def save_both_canvases(self):
-        self.save_canvas_via_screenshot(self.schedule_canvas_clases, "HorarioClases.png")
-        self.save_canvas_via_screenshot(self.schedule_canvas_examenes, "HorarioExamenes.png")
+        # Exporta el horario activo a partir de sus filas, aunque la ventana no esté visible
+        rows = schedule_rows(self.schedules_data[self.get_current_tab()]["tree"])
+        self.image_renderer.render(rows, "clases").save("HorarioClases.png", "PNG")
+        self.image_renderer.render(rows, "examenes").save("HorarioExamenes.png", "PNG")
         
         messagebox.showinfo(
             "Guardado",
             "Se guardaron 'HorarioClases.png' y 'HorarioExamenes.png' exitosamente."
         )
 
-    def save_canvas_via_screenshot(self, canvas, filename):
-        x = canvas.winfo_rootx()
-        y = canvas.winfo_rooty()
-        w = x + canvas.winfo_width()
-        h = y + canvas.winfo_height()
-        
-        screenshot = ImageGrab.grab(bbox=(x, y, w, h))
-        screenshot.save(filename, "PNG")
+    def export_all_schedules(self):
+        directory = filedialog.askdirectory(title="Carpeta para exportar los horarios")
+        if not directory:
+            return
+        schedules = {
+            f"Horario{tab}": schedule_rows(info["tree"])
+            for tab, info in self.schedules_data.items()
+        }
+        paths = self.image_renderer.export(schedules, directory, formats=("png", "pdf"))
+        messagebox.showinfo(
+            "Exportado",
+            f"Se exportaron {len(paths)} archivos (PNG y un PDF) en:\n{directory}"
+        )
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,51 @@
+"""
+Lectura de archivos de horarios (CSV/Excel) compartida por matricula_app.py y
+convert_excel_to_csv.py, sin depender de Gradio.
+"""
+
+import pandas as pd
+
+# Excel en configuración regional española exporta CSV separados por ';' y en cp1252
+CSV_ENCODINGS = ('utf-8', 'cp1252')
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def read_csv_flexible(source) -> pd.DataFrame:
+    """Try several pandas CSV parsing modes to handle inconsistent separators/quotes/encodings."""
+    # Try C engine (fast); then fall back to python engine with common separators
+    attempts = [
+        {'engine': 'c', 'low_memory': False},
+        {'engine': 'python', 'sep': ';'},
+        {'engine': 'python', 'sep': ','},
+        {'engine': 'python', 'sep': None},
+    ]
+    for encoding in CSV_ENCODINGS:
+        for kw in attempts:
+            _rewind(source)
+            try:
+                df = pd.read_csv(source, encoding=encoding, **kw)
+            except Exception:
+                continue
+            # A single column means the separator was wrong (e.g. a ';' file read with ',')
+            if len(df.columns) > 1:
+                return df
+    # Last resort: try with universal newlines and no quoting
+    _rewind(source)
+    return pd.read_csv(source, engine='python', quoting=3)
+
+
+def to_columnar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepara un DataFrame para Feather/Parquet: nombres de columna como texto y columnas
+    object con un solo tipo (texto), ya que Arrow no admite columnas mixtas (p.ej. Secc 1 y 'A').
+    """
+    out = df.copy()
+    out.columns = [str(c) for c in out.columns]
+    for col in out.columns:
+        if out[col].dtype == object:
+            out[col] = out[col].map(lambda v: v if pd.isna(v) else str(v))
+    return out.reset_index(drop=True)
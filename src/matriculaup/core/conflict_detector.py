@@ -1,6 +1,7 @@
-from typing import List, Tuple
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+from matriculaup import instrumentation
+from matriculaup.core.timeutil import hhmm_to_minutes
 from matriculaup.models.course import Session, Section, Course
 
 class ConflictDetector:
@@ -10,8 +11,10 @@ class ConflictDetector:
     @staticmethod
     def _parse_time(time_str: str) -> int:
         """Parse HH:MM into total minutes since midnight for easy comparison."""
-        t = datetime.strptime(time_str, "%H:%M")
-        return t.hour * 60 + t.minute
+        minutes = hhmm_to_minutes(time_str)
+        if minutes is None:
+            raise ValueError(f"time data {time_str!r} does not match format '%H:%M'")
+        return minutes
 
     @classmethod
     def sessions_overlap(cls, s1: Session, s2: Session) -> bool:
@@ -30,6 +33,37 @@ class ConflictDetector:
         return max(start1, start2) < min(end1, end2)
 
     @classmethod
+    def occupancy(cls, section: Section) -> Optional[Dict[str, int]]:
+        """
+        Day -> bitmask of the minutes the section's sessions occupy (bit m = minute m of the day).
+        Two sections overlap exactly when some day's masks intersect. None if a time is invalid.
+        """
+        masks: Dict[str, int] = {}
+        try:
+            for sess in section.sesiones:
+                start = cls._parse_time(sess.hora_inicio)
+                end = cls._parse_time(sess.hora_fin)
+                if end > start:
+                    masks[sess.dia] = masks.get(sess.dia, 0) | (((1 << (end - start)) - 1) << start)
+        except ValueError:
+            return None
+        return masks
+
+    @classmethod
+    def sections_overlap(cls, section1: Section, section2: Section) -> bool:
+        """True if any session of section1 overlaps any session of section2."""
+        masks1, masks2 = section1.occupancy, section2.occupancy
+        if masks1 is not None and masks2 is not None:
+            # Precomputed (e.g. by the data bundle): one AND per shared day
+            return any(mask & masks2.get(dia, 0) for dia, mask in masks1.items())
+        for sess1 in section1.sesiones:
+            for sess2 in section2.sesiones:
+                if cls.sessions_overlap(sess1, sess2):
+                    return True
+        return False
+
+    @classmethod
+    @instrumentation.timed("ConflictDetector.find_conflicts")
     def find_conflicts(cls, selected_pairs: List[Tuple[Course, Section]]) -> List[Tuple[Course, Course]]:
         """
         Given a list of (Course, Section) tuples, find all conflicting course pairs.
@@ -44,14 +78,7 @@ class ConflictDetector:
                 course2, section2 = selected_pairs[j]
                 
                 # Check for overlaps between any session of s1 and any session of s2
-                overlap_found = False
-                for sess1 in section1.sesiones:
-                    for sess2 in section2.sesiones:
-                        if cls.sessions_overlap(sess1, sess2):
-                            conflicts.append((course1, course2))
-                            overlap_found = True
-                            break
-                    if overlap_found:
-                        break
-                        
+                if cls.sections_overlap(section1, section2):
+                    conflicts.append((course1, course2))
+
         return conflicts
@@ -0,0 +1,29 @@
+from typing import List
+
+from matriculaup.models.course import Course
+
+# Separates the fields of a search key; a query containing it takes the slow path
+KEY_SEPARATOR = "\x1f"
+
+
+def search_key(course: Course) -> str:
+    """Lowercase name, code and professors joined into one string (Course.search_key)."""
+    fields = [course.nombre, course.codigo] + [doc for section in course.secciones for doc in section.docentes]
+    return KEY_SEPARATOR.join(fields).lower()
+
+
+def course_matches(course: Course, search_text: str) -> bool:
+    """True if the lowercase search_text appears in the course name, code or any professor."""
+    if course.search_key is not None and KEY_SEPARATOR not in search_text:
+        return search_text in course.search_key
+    if search_text in course.nombre.lower() or search_text in course.codigo.lower():
+        return True
+    return any(search_text in doc.lower() for section in course.secciones for doc in section.docentes)
+
+
+def filter_courses(courses: List[Course], search_text: str) -> List[Course]:
+    """Courses matching search_text (case-insensitive); all of them for a blank query."""
+    if not search_text.strip():
+        return list(courses)
+    search_text = search_text.lower()
+    return [course for course in courses if course_matches(course, search_text)]
@@ -0,0 +1,284 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from matriculaup.models.curriculum import Curriculum, CurriculumCourse
+
+# Same limit enforced per schedule by MatriculaApp.add_to_schedule
+DEFAULT_CREDIT_CAP = 25.0
+
+_INF = math.inf
+
+
+def _parse_credits(value) -> float:
+    try:
+        return float(str(value).strip().replace(',', '.'))
+    except ValueError:
+        return 0.0
+
+
+def prerequisite_codes(tree: Any) -> Set[str]:
+    """Returns every course code mentioned anywhere in a parsed prerequisite tree."""
+    if not isinstance(tree, dict):
+        return set()
+    if "code" in tree:
+        return {tree["code"]}
+    codes = set()
+    for item in tree.get("items", []):
+        codes |= prerequisite_codes(item)
+    return codes
+
+
+def required_codes(tree: Any) -> Set[str]:
+    """Returns the codes required by every alternative of the tree (OR branches intersect)."""
+    if not isinstance(tree, dict):
+        return set()
+    if "code" in tree:
+        return {tree["code"]}
+    children = [required_codes(item) for item in tree.get("items", [])]
+    if not children:
+        return set()
+    if tree.get("op") == "OR":
+        return set.intersection(*children)
+    return set.union(*children)
+
+
+def prerequisites_met(tree: Any, completed: Set[str]) -> bool:
+    """
+    Evaluates a prerequisite tree ({"op": "AND"|"OR", "items": [...]}) against completed codes.
+    Missing, free-text and unparsed ({"raw": ..., "parsed": False}) prerequisites count as met,
+    since there is nothing the planner can check them against.
+    """
+    if not isinstance(tree, dict):
+        return True
+    if "code" in tree:
+        return tree["code"] in completed
+    items = tree.get("items")
+    if not items:
+        return True
+    if tree.get("op") == "OR":
+        return any(prerequisites_met(item, completed) for item in items)
+    return all(prerequisites_met(item, completed) for item in items)
+
+
+@dataclass
+class PlannedSemester:
+    numero: int
+    cursos: List[CurriculumCourse]
+    creditos: float
+
+
+@dataclass
+class DegreePlan:
+    semestres: List[PlannedSemester]
+    # Courses whose prerequisites can never be satisfied from the plan (e.g. they depend on
+    # a course outside the curriculum that has not been taken)
+    bloqueados: List[CurriculumCourse]
+    # True only when the plan is a proven minimum: it meets the lower bound, or every
+    # non-dominated semester load was searched. False means "best found", not "suboptimal"
+    optimo: bool
+
+    @property
+    def total_semestres(self) -> int:
+        return len(self.semestres)
+
+
+class DegreePlanner:
+    """
+    Plans the pending courses of a Curriculum into the fewest semesters possible.
+
+    Courses are layered topologically (a course can only be scheduled once its prerequisites
+    were completed in an earlier semester) and each semester is filled up to the credit cap.
+    Choosing which available courses go first is a bounded search: at most `max_branching`
+    candidate loads per state and `max_states` new states per call, pruned by a lower bound
+    (longest remaining prerequisite chain vs. remaining credits / cap).
+
+    Results are memoized by the set of completed courses and the cache is kept across calls,
+    so re-planning after toggling a single taken course mostly reuses earlier states. States
+    cut short by an exhausted budget are dropped before the next call, which searches them again.
+    """
+
+    def __init__(self, curriculum: Curriculum, prerequisites: Dict[str, Optional[Any]],
+                 credit_cap: float = DEFAULT_CREDIT_CAP,
+                 tipos: Sequence[str] = ("obligatorio",),
+                 max_branching: int = 4, max_states: int = 20000):
+        self.credit_cap = credit_cap
+        self.max_branching = max(1, max_branching)
+        self.max_states = max_states
+
+        self._courses: Dict[str, CurriculumCourse] = {}
+        for ciclo in curriculum.ciclos:
+            for course in ciclo.cursos:
+                if course.tipo in tipos and course.codigo not in self._courses:
+                    self._courses[course.codigo] = course
+
+        codes = set(self._courses)
+        self._credits = {code: _parse_credits(c.creditos) for code, c in self._courses.items()}
+        self._trees = {code: prerequisites.get(code) for code in codes}
+
+        # Only codes that appear in the plan or in one of its prerequisites affect planning,
+        # so cache keys are restricted to them
+        self._relevant: Set[str] = set(codes)
+        for tree in self._trees.values():
+            self._relevant |= prerequisite_codes(tree)
+
+        # Dependency edges inside the plan: "mentioned" drives the ordering heuristic,
+        # "required" (AND-only) keeps the lower bound admissible
+        self._dependents: Dict[str, List[str]] = {code: [] for code in codes}
+        self._required_dependents: Dict[str, List[str]] = {code: [] for code in codes}
+        for code, tree in self._trees.items():
+            for pre in prerequisite_codes(tree) & codes:
+                self._dependents[pre].append(code)
+            for pre in required_codes(tree) & codes:
+                self._required_dependents[pre].append(code)
+
+        self._priority = self._chain_heights(codes, self._dependents)
+
+        # completed set -> (semesters left, next semester load, exact, truncated by the budget)
+        self._cache: Dict[FrozenSet[str], Tuple[float, FrozenSet[str], bool, bool]] = {}
+        self._budget = 0
+        self.cache_hits = 0
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_hits = 0
+
+    def plan(self, taken: Iterable[str]) -> DegreePlan:
+        """Returns a minimum-semester plan for the courses not yet in `taken`."""
+        done = frozenset(set(taken) & self._relevant)
+        self._budget = self.max_states
+        # A truncated result depends on the budget left when it was computed; search it again
+        self._cache = {state: result for state, result in self._cache.items() if not result[3]}
+
+        _, _, exact, _ = self._solve(done)
+
+        semestres = []
+        state = done
+        while True:
+            _, load, _, _ = self._cache[state]
+            if not load:
+                break
+            ordered = sorted(load, key=lambda c: (-self._priority[c], c))
+            semestres.append(PlannedSemester(
+                numero=len(semestres) + 1,
+                cursos=[self._courses[c] for c in ordered],
+                creditos=sum(self._credits[c] for c in load),
+            ))
+            state = state | load
+
+        reachable = self._reachable(done)
+        bloqueados = [c for code, c in self._courses.items() if code not in reachable]
+
+        return DegreePlan(semestres=semestres, bloqueados=bloqueados, optimo=exact)
+
+    def _reachable(self, done: FrozenSet[str]) -> Set[str]:
+        """Closure of `done` under every course whose prerequisites eventually become met."""
+        reached = set(done)
+        changed = True
+        while changed:
+            changed = False
+            for code in self._courses:
+                if code not in reached and prerequisites_met(self._trees[code], reached):
+                    reached.add(code)
+                    changed = True
+        return reached
+
+    def _solve(self, done: FrozenSet[str]) -> Tuple[float, FrozenSet[str], bool, bool]:
+        cached = self._cache.get(done)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        remaining = [c for c in self._reachable(done) if c in self._courses and c not in done]
+        if not remaining:
+            result = (0, frozenset(), True, False)
+            self._cache[done] = result
+            return result
+
+        self._budget -= 1
+        available = [c for c in remaining if prerequisites_met(self._trees[c], done)]
+        bound = self._lower_bound(remaining)
+        loads = self._candidate_loads(available)
+
+        best_value, best_load = _INF, frozenset()
+        # Every candidate searched, each sub-plan proven and no other load worth trying
+        exhaustive = self._takes_all(available)
+        truncated = False
+        for load in loads:
+            if best_value < _INF and self._budget <= 0:
+                exhaustive = False
+                truncated = True
+                break
+            sub, _, sub_exact, sub_truncated = self._solve(done | load)
+            exhaustive = exhaustive and sub_exact
+            truncated = truncated or sub_truncated
+            if 1 + sub < best_value:
+                best_value, best_load = 1 + sub, load
+                if best_value <= bound:
+                    # Cannot do better than the lower bound; the remaining candidates are moot
+                    break
+
+        # Every sub-plan is achievable, so meeting the lower bound proves the minimum
+        exact = best_value <= bound or exhaustive
+        result = (best_value, best_load, exact, truncated)
+        self._cache[done] = result
+        return result
+
+    def _takes_all(self, available: List[str]) -> bool:
+        """
+        True when all available courses fit in one semester. Taking a course never delays
+        another one, so that load dominates every other and is the only one worth searching.
+        """
+        return len(available) <= 1 or sum(self._credits[c] for c in available) <= self.credit_cap
+
+    def _candidate_loads(self, available: List[str]) -> List[FrozenSet[str]]:
+        """
+        Greedy first-fit loads, each one forcing a different high-priority course in first.
+        Only a sample of the feasible loads unless _takes_all(available).
+        """
+        order = sorted(available, key=lambda c: (-self._priority[c], -self._credits[c], c))
+        loads: List[FrozenSet[str]] = []
+        for i in range(min(self.max_branching, len(order))):
+            load = self._fill([order[i]] + order[:i] + order[i + 1:])
+            if load not in loads:
+                loads.append(load)
+        return loads
+
+    def _fill(self, sequence: List[str]) -> FrozenSet[str]:
+        total = 0.0
+        load = []
+        for code in sequence:
+            cred = self._credits[code]
+            # A single course above the cap still gets a semester of its own
+            if not load or total + cred <= self.credit_cap:
+                load.append(code)
+                total += cred
+        return frozenset(load)
+
+    def _lower_bound(self, remaining: List[str]) -> int:
+        total = sum(self._credits[c] for c in remaining)
+        by_credits = math.ceil(total / self.credit_cap) if self.credit_cap > 0 else 0
+        by_chain = max(self._chain_heights(set(remaining), self._required_dependents).values())
+        return max(by_credits, by_chain)
+
+    @staticmethod
+    def _chain_heights(codes: Set[str], dependents: Dict[str, List[str]]) -> Dict[str, int]:
+        """Length of the longest dependency chain starting at each course (itself included)."""
+        heights: Dict[str, int] = {}
+        visiting: Set[str] = set()
+
+        def height(code: str) -> int:
+            if code in heights:
+                return heights[code]
+            if code in visiting:
+                # Cyclic prerequisites in the source data; stop the chain here
+                return 1
+            visiting.add(code)
+            h = 1 + max((height(d) for d in dependents[code] if d in codes), default=0)
+            visiting.discard(code)
+            heights[code] = h
+            return h
+
+        for code in codes:
+            height(code)
+        return heights
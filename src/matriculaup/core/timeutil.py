@@ -0,0 +1,58 @@
+import re
+from typing import Dict, Optional
+
+MINUTES_PER_DAY = 24 * 60
+
+# Every valid "HH:MM" (and unpadded "H:MM") string mapped to minutes since midnight
+_HHMM_TABLE: Dict[str, int] = {}
+for _m in range(MINUTES_PER_DAY):
+    _HHMM_TABLE[f"{_m // 60:02d}:{_m % 60:02d}"] = _m
+    _HHMM_TABLE[f"{_m // 60}:{_m % 60:02d}"] = _m
+del _m
+
+# Same inputs datetime.strptime(value, "%H:%M") accepts, e.g. "7:5"
+_HHMM_RE = re.compile(r"([0-9]{1,2}):([0-9]{1,2})")
+
+
+def hhmm_to_minutes(value, default: Optional[int] = None) -> Optional[int]:
+    """Parses "HH:MM" into minutes since midnight; `default` when it is not a valid time."""
+    minutes = _HHMM_TABLE.get(value) if isinstance(value, str) else None
+    if minutes is not None:
+        return minutes
+    match = _HHMM_RE.fullmatch(value) if isinstance(value, str) else None
+    if match:
+        h, m = int(match.group(1)), int(match.group(2))
+        if h < 24 and m < 60:
+            return h * 60 + m
+    return default
+
+
+def hhmm_array_to_minutes(values, default: int = -1):
+    """
+    Vectorized hhmm_to_minutes for a column of times (list, NumPy array or pandas Series).
+    Returns an int32 array; invalid entries get `default`. NumPy is imported here so the
+    scalar helper stays usable without it.
+    """
+    import numpy as np
+
+    text = np.asarray(values, dtype=object).astype(str).ravel()
+    out = np.full(text.shape, default, dtype=np.int32)
+    if not text.size:
+        return out
+
+    # Fast path: exactly "DD:DD", decoded from the UTF-32 code points of each string
+    codes = text.astype("<U5").view(np.uint32).reshape(-1, 5).astype(np.int32) - ord("0")
+    digits = codes[:, [0, 1, 3, 4]]
+    hours = codes[:, 0] * 10 + codes[:, 1]
+    mins = codes[:, 3] * 10 + codes[:, 4]
+    fast = ((np.char.str_len(text) == 5) & (codes[:, 2] == ord(":") - ord("0"))
+            & ((digits >= 0) & (digits <= 9)).all(axis=1) & (hours < 24) & (mins < 60))
+    out[fast] = (hours * 60 + mins)[fast]
+
+    # Anything else ("7:30", "nan", ...) goes through the scalar parser once per distinct value
+    rest = np.flatnonzero(~fast)
+    if rest.size:
+        uniques, inverse = np.unique(text[rest], return_inverse=True)
+        parsed = np.array([hhmm_to_minutes(u, default) for u in uniques], dtype=np.int32)
+        out[rest] = parsed[inverse.ravel()]
+    return out.reshape(np.shape(values))
@@ -0,0 +1,135 @@
+"""
+Opt-in timers and counters for the desktop app's hot paths.
+
+Enabled with MATRICULAUP_PROFILE=1 (read once, at import). When disabled, `timed`
+returns the decorated function itself and `timer`/`count` do nothing, so the
+instrumented code runs exactly as it would without them. When enabled, a summary
+is written on exit to stderr, or appended to MATRICULAUP_PROFILE_LOG if set.
+"""
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional
+
+ENV_VAR = "MATRICULAUP_PROFILE"
+LOG_ENV_VAR = "MATRICULAUP_PROFILE_LOG"
+ENABLED = os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+# Percentiles are computed over the most recent WINDOW calls of each timer
+WINDOW = 256
+
+_NULL = nullcontext()
+
+
+@dataclass
+class TimerStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW))
+
+    def add(self, seconds: float):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_lock = threading.Lock()
+_timers: Dict[str, TimerStats] = {}
+_counters: Counter = Counter()
+
+
+def record(name: str, seconds: float):
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            stats = _timers[name] = TimerStats()
+        stats.add(seconds)
+
+
+@contextmanager
+def _timer(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+def timer(name: str):
+    """Context manager timing its block under `name`."""
+    return _timer(name) if ENABLED else _NULL
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of the function (under `name`, or its qualified name)."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - t0)
+        return wrapper
+    return decorate
+
+
+def count(name: str, n: int = 1):
+    if ENABLED:
+        with _lock:
+            _counters[name] += n
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def summary() -> str:
+    """Table of every timer (calls, total, mean, p50/p95 over recent calls, max) and counter."""
+    with _lock:
+        timers = sorted(_timers.items(), key=lambda kv: -kv[1].total)
+        counters = sorted(_counters.items())
+        lines = [f"{'timer':<40} {'calls':>7} {'total ms':>10} {'mean ms':>9} "
+                 f"{'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for name, s in timers:
+            lines.append(
+                f"{name:<40} {s.calls:>7} {s.total * 1e3:>10.1f} {s.total / s.calls * 1e3:>9.2f} "
+                f"{s.percentile(0.5) * 1e3:>8.2f} {s.percentile(0.95) * 1e3:>8.2f} {s.max * 1e3:>8.2f}")
+    if counters:
+        lines.append("")
+        lines.extend(f"{name:<40} {value:>7}" for name, value in counters)
+    return "\n".join(lines)
+
+
+def dump():
+    text = f"[matriculaup profile] {time.strftime('%Y-%m-%d %H:%M:%S')}\n{summary()}\n"
+    path = os.environ.get(LOG_ENV_VAR)
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stderr.write(text)
+
+
+if ENABLED:
+    atexit.register(dump)
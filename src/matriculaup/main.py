@@ -15,44 +15,33 @@ else:
     base_path = Path(project_root)
 
 from PySide6.QtWidgets import QApplication
-from matriculaup.models.course import load_from_json
-from matriculaup.store.persistence import PersistenceManager
+from matriculaup import instrumentation
+from matriculaup.store.loader import DataLoader
 from matriculaup.ui.app_window import AppWindow
-from matriculaup.models.curriculum import load_curriculum_from_json
 
 def main():
     app = QApplication(sys.path)
-    
-    # 1. Load Data
+
+    # 1. Show the window right away; tabs are built once the data arrives
+    with instrumentation.timer("main.build_window"):
+        window = AppWindow(loading=True)
+    window.show()
+
+    # 2. Load Data (courses, curriculum and saved schedule) on a background thread.
+    # Frozen builds ship matriculaup.bundle (see scripts/build_exe.py) instead of the JSON
     json_path = base_path / "input" / "courses_2026-1.json"
-    print(f"Loading data from {json_path}")
-    
-    try:
-        courses = load_from_json(str(json_path))
-        print(f"Loaded {len(courses)} courses.")
-    except Exception as e:
-        print(f"Error loading courses JSON: {e}")
-        courses = []
-        
     curriculum_path = base_path / "input" / "curricula_economia2017.json"
-    print(f"Loading curriculum from {curriculum_path}")
-    curriculum = None
-    try:
-        curriculum = load_curriculum_from_json(str(curriculum_path))
-        print(f"Loaded Curriculum: {curriculum.metadata.get('carrera')}")
-    except Exception as e:
-        print(f"Error loading curriculum JSON: {e}")
-        
-    # 2. Setup Persistence
-    pm = PersistenceManager()
-    saved_schedule = pm.load_schedule()
-    print(f"Loaded saved schedule with {len(saved_schedule)} items.")
-    
-    # 3. Start UI
-    window = AppWindow(courses=courses, schedule_data=saved_schedule, curriculum=curriculum)
-    window.show()
-    
-    sys.exit(app.exec())
+    bundle_path = base_path / "input" / "matriculaup.bundle"
+    loader = DataLoader(json_path, curriculum_path, bundle_path, parent=window)
+    loader.loaded.connect(
+        lambda data: window.set_data(courses=data.courses, curriculum=data.curriculum,
+                                     schedule_data=data.schedule_data)
+    )
+    loader.start()
+
+    exit_code = app.exec()
+    loader.wait()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
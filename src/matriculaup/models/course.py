@@ -1,5 +1,5 @@
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -48,6 +48,8 @@ class Section:
     docentes: List[str]
     observaciones: str
     sesiones: List[Session]
+    # Day -> minute bitmask (ConflictDetector.occupancy), precomputed by the data bundle
+    occupancy: Optional[Dict[str, int]] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Section":
@@ -65,6 +67,8 @@ class Course:
     creditos: str
     prerequisitos: Optional[Dict[str, Any]]
     secciones: List[Section]
+    # Lowercase text course_search matches against, precomputed by the data bundle
+    search_key: Optional[str] = field(default=None, repr=False, compare=False)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Course":
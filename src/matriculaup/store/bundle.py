@@ -0,0 +1,134 @@
+"""
+Precompiled data bundle for the frozen app.
+
+build_bundle() parses the course offering (regular and EFE courses already merged into
+one catalog by scripts/extractors/merge.py) and the curriculum JSON once, at build time,
+and writes a single file: a fixed header, a table of contents and one pickled section per
+dataset. Every Course already carries its search key and every Section its occupancy
+masks. load_bundle() maps the file once and unpickles the sections straight from the
+mapping, so a launch runs no json.load/from_dict and no index building.
+
+Sections are pickles: only load bundles written by build_bundle for the same build.
+"""
+import dataclasses
+import gc
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Dict, Optional
+
+from matriculaup.core.conflict_detector import ConflictDetector
+from matriculaup.core.course_search import search_key
+from matriculaup.models.course import Course, Section, Session, load_from_json
+from matriculaup.models.curriculum import Curriculum, CurriculumCourse, CurriculumCycle, load_curriculum_from_json
+
+MAGIC = b"MUPBUNDL"
+FORMAT_VERSION = 1
+BUNDLE_NAME = "matriculaup.bundle"
+
+# magic, format version, pickle protocol, number of sections
+_HEADER = struct.Struct("<8sHHI")
+# section name, offset, length
+_ENTRY = struct.Struct("<16sQQ")
+
+
+def _schema() -> Dict[str, list]:
+    """Field names of the pickled models; a bundle built against other models is rejected."""
+    models = (Course, Section, Session, Curriculum, CurriculumCycle, CurriculumCourse)
+    return {cls.__name__: [f.name for f in dataclasses.fields(cls)] for cls in models}
+
+
+def precompute(courses):
+    """Fills Course.search_key and Section.occupancy in place."""
+    for course in courses:
+        course.search_key = search_key(course)
+        for section in course.secciones:
+            section.occupancy = ConflictDetector.occupancy(section)
+    return courses
+
+
+def build_bundle(output, courses_path, curriculum_path=None) -> Path:
+    """Compiles the JSON inputs into one bundle at `output`. A missing curriculum is left empty."""
+    courses = precompute(load_from_json(str(courses_path)))
+    curriculum = None
+    if curriculum_path and Path(curriculum_path).exists():
+        curriculum = load_curriculum_from_json(str(curriculum_path))
+
+    meta = {
+        "schema": _schema(),
+        "sources": {name: Path(p).name for name, p in
+                    (("courses", courses_path), ("curriculum", curriculum_path)) if p},
+        "counts": {"courses": len(courses)},
+    }
+    protocol = pickle.HIGHEST_PROTOCOL
+    sections = {
+        "meta": json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+        "courses": pickle.dumps(courses, protocol=protocol),
+        "curriculum": pickle.dumps(curriculum, protocol=protocol),
+    }
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    table = []
+    for name, blob in sections.items():
+        table.append(_ENTRY.pack(name.encode("ascii"), offset, len(blob)))
+        offset += len(blob)
+
+    tmp = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, protocol, len(sections)))
+        f.writelines(table)
+        f.writelines(sections.values())
+    os.replace(tmp, output)
+    return output
+
+
+def load_bundle(path) -> Optional[dict]:
+    """
+    Returns {"courses", "curriculum", "meta"} from a bundle, or None if the file is
+    missing, truncated, was built by another format version or model schema, or cannot be
+    unpickled for any other reason (e.g. a class that has since moved), so callers fall
+    back to the JSON files.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _read_sections(view)
+    except Exception:
+        return None
+
+
+def _read_sections(view: memoryview) -> Optional[dict]:
+    magic, version, _, count = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    entries = {}
+    try:
+        for i in range(count):
+            name, offset, length = _ENTRY.unpack_from(view, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(view):
+                return None
+            entries[name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+
+        meta = json.loads(bytes(entries["meta"]))
+        if meta.get("schema") != _schema():
+            return None
+        # The sections are tens of thousands of small objects and no cycles: without this the
+        # cyclic GC runs over and over while they are created and takes most of the load time
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            data = {name: pickle.loads(blob) for name, blob in entries.items() if name != "meta"}
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        # The mapping can only be closed once no slice of it is alive
+        for blob in entries.values():
+            blob.release()
+    data["meta"] = meta
+    return data
@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+from matriculaup import instrumentation
+
+
+@dataclass
+class LoadedData:
+    courses: List[Any] = field(default_factory=list)
+    curriculum: Optional[Any] = None
+    schedule_data: List[Any] = field(default_factory=list)
+
+
+class DataLoader(QThread):
+    """
+    Loads the courses, curriculum and saved schedule off the UI thread: from the
+    precompiled bundle when there is one (frozen builds), otherwise from the JSON files.
+    """
+
+    # Emitted once with a LoadedData; missing or broken files leave their field empty
+    loaded = Signal(object)
+
+    def __init__(self, courses_path: Path, curriculum_path: Path, bundle_path: Optional[Path] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.courses_path = courses_path
+        self.curriculum_path = curriculum_path
+        self.bundle_path = bundle_path
+
+    def run(self):
+        # Imported here so none of the loading code is on the startup path
+        from matriculaup.store.persistence import PersistenceManager
+
+        data = LoadedData()
+        try:
+            data = self._load_bundle() or self._load_json()
+            data.schedule_data = PersistenceManager().load_schedule()
+            print(f"Loaded saved schedule with {len(data.schedule_data)} items.")
+        except Exception as e:
+            print(f"Error loading data: {e}")
+        finally:
+            # Always answer, or the window would show its loading label forever
+            self.loaded.emit(data)
+
+    def _load_bundle(self) -> Optional[LoadedData]:
+        if self.bundle_path is None or not self.bundle_path.exists():
+            return None
+        from matriculaup.store.bundle import load_bundle
+
+        with instrumentation.timer("main.load_bundle"):
+            bundle = load_bundle(self.bundle_path)
+        if bundle is None:
+            print(f"Ignoring incompatible data bundle {self.bundle_path}")
+            return None
+        print(f"Loaded {len(bundle['courses'])} courses from {self.bundle_path}")
+        return LoadedData(courses=bundle["courses"], curriculum=bundle["curriculum"])
+
+    def _load_json(self) -> LoadedData:
+        from matriculaup.models.course import load_from_json
+        from matriculaup.models.curriculum import load_curriculum_from_json
+
+        data = LoadedData()
+        print(f"Loading data from {self.courses_path}")
+        try:
+            with instrumentation.timer("main.load_courses"):
+                data.courses = load_from_json(str(self.courses_path))
+            print(f"Loaded {len(data.courses)} courses.")
+        except Exception as e:
+            print(f"Error loading courses JSON: {e}")
+
+        print(f"Loading curriculum from {self.curriculum_path}")
+        try:
+            with instrumentation.timer("main.load_curriculum"):
+                data.curriculum = load_curriculum_from_json(str(self.curriculum_path))
+            print(f"Loaded Curriculum: {data.curriculum.metadata.get('carrera')}")
+        except Exception as e:
+            print(f"Error loading curriculum JSON: {e}")
+        return data
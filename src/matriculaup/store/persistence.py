@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from typing import List
 
+from matriculaup import instrumentation
+
 class PersistenceManager:
     """Manages saving and loading user's schedule to the local AppData/Home directory."""
     
@@ -16,6 +18,7 @@ class PersistenceManager:
             self.app_dir.mkdir(parents=True, exist_ok=True)
             self.file_path = self.app_dir / "schedule.json"
             
+    @instrumentation.timed("PersistenceManager.save_schedule")
     def save_schedule(self, section_codes: List[str]) -> bool:
         """Saves a list of selected section codes to disk."""
         try:
@@ -26,6 +29,7 @@ class PersistenceManager:
             print(f"Error saving schedule: {e}")
             return False
 
+    @instrumentation.timed("PersistenceManager.load_schedule")
     def load_schedule(self) -> List[str]:
         """Loads the list of selected section codes from disk. Returns empty list if not found."""
         if not self.file_path.exists():
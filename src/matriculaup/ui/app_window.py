@@ -1,61 +1,86 @@
 import sys
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QTabWidget, QLabel
 )
-from matriculaup.ui.tabs.search_tab import SearchTab
-from matriculaup.ui.tabs.schedule_tab import ScheduleTab
-from matriculaup.ui.tabs.curriculum_tab import CurriculumTab
+from matriculaup import instrumentation
 from matriculaup.store.state import ScheduleState
 from matriculaup.store.persistence import PersistenceManager
 
 class AppWindow(QMainWindow):
-    def __init__(self, courses=None, schedule_data=None, curriculum=None):
+    def __init__(self, courses=None, schedule_data=None, curriculum=None, loading=False):
         super().__init__()
-        
-        self.courses = courses or []
-        self.schedule_data = schedule_data or []
-        self.curriculum = curriculum
-        
+
+        self.courses = []
+        self.schedule_data = []
+        self.curriculum = None
+
+        # Tabs are built the first time they are shown (see _add_lazy_tab)
+        self.tab_search = None
+        self.tab_schedule = None
+        self.tab_curriculum = None
+        self._tab_factories = {}
+
         # 1. Initialize State
         self.state = ScheduleState(self)
         self.persistence = PersistenceManager()
-        
+
         # 2. Main widget and layout
         self.setWindowTitle("MatriculaUp - Planificador 2026-1")
         self.resize(1024, 768)
-        
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        
+
         layout = QVBoxLayout(central_widget)
+        self.loading_label = QLabel("Cargando cursos...")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.loading_label)
+
         self.tabs = QTabWidget()
+        self.tabs.currentChanged.connect(self._on_tab_activated)
+        self.tabs.hide()
         layout.addWidget(self.tabs)
-        
+
+        # With loading=True the window shows the loading label until set_data() is called
+        # (main.py feeds it from a DataLoader thread)
+        if not loading:
+            self.set_data(courses, curriculum, schedule_data)
+
+    def set_data(self, courses=None, curriculum=None, schedule_data=None):
+        """Installs the loaded data and builds the UI around it."""
+        self.courses = courses or []
+        self.schedule_data = schedule_data or []
+        self.curriculum = curriculum
+
         # 3. Setup UI components
-        self._setup_tabs()
-        
+        with instrumentation.timer("AppWindow.setup_tabs"):
+            self._setup_tabs()
+        self.loading_label.hide()
+        self.tabs.show()
+
         # 4. Wire persistence loading
         self._load_initial_state()
-        
+
         # 5. Connect auto-saving
         self.state.on_sections_changed.connect(self._save_state)
-        
+
     def _load_initial_state(self):
         """Matches saved dictionaries back to Course and Section objects"""
         # Create quick lookup for fast iteration
         course_map = {c.codigo: c for c in self.courses}
-        
-        # Schedule data format originally: ["["123"] (Strings) 
+
+        # Schedule data format originally: ["["123"] (Strings)
         # New format: [{"curso": "123", "seccion": "A"}]
         for item in self.schedule_data:
             if isinstance(item, str):
                 # Legacy data, skip or clear because we changed models
                 print(f"Skipping legacy string schedule item: {item}")
                 continue
-                
+
             course_code = item.get("curso")
             sec_code = item.get("seccion")
-            
+
             if course := course_map.get(course_code):
                 for sec in course.secciones:
                     if sec.seccion == sec_code:
@@ -66,38 +91,72 @@ class AppWindow(QMainWindow):
         # We will save a list of objects like {"curso": "123", "seccion": "A"}
         data_to_save = [{"curso": c.codigo, "seccion": s.seccion} for c, s in sections]
         self.persistence.save_schedule(data_to_save)
-        
+
     def _setup_tabs(self):
         # Tab 1: Buscar Cursos
-        self.tab_search = SearchTab(self.courses)
-        self.tab_search.section_added.connect(self.state.add_section)
-        self.tabs.addTab(self.tab_search, "Buscar Cursos")
-        
+        self._add_lazy_tab("Buscar Cursos", self._build_search_tab)
+
         # Tab 2: Generar Horario
-        self.tab_schedule = ScheduleTab(self)
-        self.tabs.addTab(self.tab_schedule, "Generar Horario")
-        
+        self._add_lazy_tab("Generar Horario", self._build_schedule_tab)
+
         # Connect the state changes to update the visual grid
-        from matriculaup.core.conflict_detector import ConflictDetector
-        
-        def _update_schedule_tab(sections):
-            conflicts = ConflictDetector.find_conflicts(sections)
-            self.tab_schedule.update_schedule(sections, conflicts)
-            
-        self.state.on_sections_changed.connect(_update_schedule_tab)
-        
-        # Connect section removal (right click on grid block) back to state
-        self.tab_schedule.section_removed.connect(
-            lambda c, s: self.state.remove_section(c.codigo, s.seccion)
-        )
-        
+        self.state.on_sections_changed.connect(self._update_schedule_tab)
+
         # Tab 3: Avance Curricular
         if self.curriculum:
-            self.tab_curriculum = CurriculumTab(self.curriculum, self.courses, self)
-            self.tabs.addTab(self.tab_curriculum, "Avance Curricular")
-        
+            self._add_lazy_tab("Avance Curricular", self._build_curriculum_tab)
+
         # Tab 4: Horarios Guardados (Ex Tab 3)
         self.tab_saved = QWidget()
         saved_layout = QVBoxLayout(self.tab_saved)
         saved_layout.addWidget(QLabel("Tab: Horarios Guardados"))
         self.tabs.addTab(self.tab_saved, "Horarios Guardados")
+
+    def _add_lazy_tab(self, title, factory):
+        """Adds an empty page whose content is created by factory() on first activation."""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self._tab_factories[page] = factory
+        self.tabs.addTab(page, title)
+
+    def _on_tab_activated(self, index):
+        page = self.tabs.widget(index)
+        factory = self._tab_factories.pop(page, None)
+        if factory is not None:
+            with instrumentation.timer(f"AppWindow.{factory.__name__}"):
+                page.layout().addWidget(factory())
+
+    def _build_search_tab(self):
+        from matriculaup.ui.tabs.search_tab import SearchTab
+
+        self.tab_search = SearchTab(self.courses)
+        self.tab_search.section_added.connect(self.state.add_section)
+        return self.tab_search
+
+    def _build_schedule_tab(self):
+        from matriculaup.ui.tabs.schedule_tab import ScheduleTab
+
+        self.tab_schedule = ScheduleTab(self)
+        # Connect section removal (right click on grid block) back to state
+        self.tab_schedule.section_removed.connect(
+            lambda c, s: self.state.remove_section(c.codigo, s.seccion)
+        )
+        # Catch up with the sections added before the tab existed
+        self._update_schedule_tab(self.state.get_sections())
+        return self.tab_schedule
+
+    def _build_curriculum_tab(self):
+        from matriculaup.ui.tabs.curriculum_tab import CurriculumTab
+
+        self.tab_curriculum = CurriculumTab(self.curriculum, self.courses, self)
+        return self.tab_curriculum
+
+    def _update_schedule_tab(self, sections):
+        # Nothing to draw until the tab has been opened; _build_schedule_tab catches up
+        if self.tab_schedule is None:
+            return
+        from matriculaup.core.conflict_detector import ConflictDetector
+
+        conflicts = ConflictDetector.find_conflicts(sections)
+        self.tab_schedule.update_schedule(sections, conflicts)
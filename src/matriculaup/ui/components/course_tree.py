@@ -4,6 +4,8 @@ from PySide6.QtWidgets import QTreeView, QMenu, QHeaderView
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QAction
 from PySide6.QtCore import Qt, Signal
 
+from matriculaup import instrumentation
+from matriculaup.core.course_search import filter_courses
 from matriculaup.models.course import Course, Section
 
 class CourseTree(QTreeView):
@@ -31,9 +33,11 @@ class CourseTree(QTreeView):
         
         self.populate_tree(self.courses)
 
+    @instrumentation.timed("CourseTree.populate_tree")
     def populate_tree(self, courses: List[Course]):
         """Populates the QTreeView with a hierarchical view of Courses -> Sections."""
         self.model.removeRows(0, self.model.rowCount())
+        instrumentation.count("CourseTree.populated_courses", len(courses))
         
         for course in courses:
             # Create the Course (Parent) level item
@@ -70,34 +74,14 @@ class CourseTree(QTreeView):
                 
                 course_item.appendRow([section_item, s_empty1, s_empty2, docentes_item, obs_item])
 
+    @instrumentation.timed("CourseTree.filter_tree")
     def filter_tree(self, search_text: str):
         """Filters the displayed courses by matching the search_text against name, code, or professor."""
         if not search_text.strip():
             self.populate_tree(self.all_courses)
             return
             
-        search_text = search_text.lower()
-        filtered_courses = []
-        
-        for course in self.all_courses:
-            match_found = False
-            
-            # Check course-level fields
-            if search_text in course.nombre.lower() or search_text in course.codigo.lower():
-                match_found = True
-            else:
-                # Check section-level fields (like professors)
-                for section in course.secciones:
-                    for doc in section.docentes:
-                        if search_text in doc.lower():
-                            match_found = True
-                            break
-                    if match_found:
-                        break
-                        
-            if match_found:
-                filtered_courses.append(course)
-                
+        filtered_courses = filter_courses(self.all_courses, search_text)
         self.populate_tree(filtered_courses)
         
         # When filtering, expanding all can make results easier to see
@@ -3,6 +3,8 @@ from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush
 from PySide6.QtCore import Qt, QRectF, Signal
 
+from matriculaup import instrumentation
+from matriculaup.core.timeutil import hhmm_to_minutes
 from matriculaup.models.course import Course, Section, Session
 
 class TimetableGrid(QWidget):
@@ -36,14 +38,14 @@ class TimetableGrid(QWidget):
 
     def _time_to_y(self, time_str: str, row_height: float) -> float:
         """Converts an HH:MM string to a Y-coordinate on the canvas based on start_hour."""
-        try:
-            h, m = map(int, time_str.split(':'))
-            # Total hours since self.start_hour
-            hours_elapsed = (h - self.start_hour) + (m / 60.0)
-            return self.header_height + (hours_elapsed * row_height)
-        except ValueError:
+        minutes = hhmm_to_minutes(time_str)
+        if minutes is None:
             return self.header_height
+        # Total hours since self.start_hour
+        hours_elapsed = minutes / 60.0 - self.start_hour
+        return self.header_height + (hours_elapsed * row_height)
 
+    @instrumentation.timed("TimetableGrid.paintEvent")
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
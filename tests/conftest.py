@@ -1,9 +1,57 @@
+import io
+import sys
+from pathlib import Path
+
 import pytest
 from tests.fixtures.sample_rows import (
     COURSE_HEADER_ROW, PREREQ_ROW_TRUNCATED, PREREQ_ROW_CONTINUATION,
     SECTION_ROW_CLASE, PROFESSOR_COMPOUND_ROW
 )
 
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+# A small schedule export in the Gradio app's column layout (one row per session)
+SCHEDULE_CSV = """Curso,Secc,Docentes,Cred,Día,Horario_Inicio,Horario_Cierre,Tipo
+Microeconomía I,A,"Pérez, Juan",4,LUN,08:00,09:50,CLASE
+Microeconomía I,A,"Pérez, Juan",4,MIE,08:00,09:50,CLASE
+Microeconomía I,B,"Díaz, Ana",4,MAR,10:00,11:50,CLASE
+Macroeconomía I,A,,3.0,JUE,14:00,15:50,PRÁCTICA
+Macroeconomía I,A,,3.0,SAB,09:00,11:00,FINAL
+Matemáticas II,C,"Rojas, Luis",5,VIE,16:00,17:50,CLASE
+Estadística I,A,"Rojas, Luis",4,LUN,09:00,10:50,CLASE
+"""
+
+
+@pytest.fixture(scope="session")
+def scripts_path():
+    """Puts scripts/ on sys.path, as when its tools are run directly (python scripts/...)."""
+    if str(SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS))
+    return SCRIPTS
+
+
+@pytest.fixture(scope="session")
+def app_module(scripts_path, tmp_path_factory):
+    """scripts/matricula_app.py (needs gradio), with its read cache in a temporary folder."""
+    pytest.importorskip("gradio")
+    cache_dir = str(tmp_path_factory.mktemp("read_cache"))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MATRICULA_CACHE_DIR", cache_dir)
+        import matricula_app
+        # In case it was imported before the variable was set
+        mp.setattr(matricula_app, "READ_CACHE_DIR", cache_dir)
+        yield matricula_app
+
+
+@pytest.fixture
+def schedule_csv():
+    return SCHEDULE_CSV
+
+
+@pytest.fixture
+def schedule_df(app_module):
+    return app_module.read_csv_flexible(io.StringIO(SCHEDULE_CSV))
+
 
 @pytest.fixture
 def sample_truncated_prereq_rows():
@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+
+def _die_in_worker(value):
+    """Kills the pool worker running it (as an out-of-memory kill would); inline it just returns."""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return value
+
+
+def test_broken_pool_is_replaced(app_module):
+    jobs = app_module.BackgroundJobs()
+    jobs.start(1)
+    try:
+        broken = jobs._executor
+        assert jobs.run(_die_in_worker, 5) == 5
+        assert jobs.restarts == 1
+        assert jobs._executor is not broken
+
+        # Later jobs run in the new pool again, not inline
+        assert jobs.run(os.getpid) != os.getpid()
+        assert jobs.pending == 0
+    finally:
+        jobs.shutdown()
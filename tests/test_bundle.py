@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from matriculaup.core.conflict_detector import ConflictDetector
+from matriculaup.core.course_search import filter_courses
+from matriculaup.models.course import load_from_json
+from matriculaup.store import bundle as bundle_module
+from matriculaup.store.bundle import build_bundle, load_bundle
+
+COURSES = Path(__file__).resolve().parent.parent / "input" / "courses_2026-1_v4.json"
+
+
+def _curriculum(tmp_path):
+    path = tmp_path / "curriculum.json"
+    path.write_text(json.dumps({"metadata": {"carrera": "Economía"}, "ciclos": [
+        {"ciclo": 1, "cursos": [{"codigo": "138201", "nombre": "Micro", "creditos": "4", "tipo": "obligatorio"}]},
+    ]}), encoding="utf-8")
+    return path
+
+
+def test_round_trip_matches_json(tmp_path):
+    path = build_bundle(tmp_path / "data.bundle", COURSES, _curriculum(tmp_path))
+    data = load_bundle(path)
+    assert data["courses"] == load_from_json(str(COURSES))
+    assert data["curriculum"].metadata == {"carrera": "Economía"}
+    assert data["meta"]["counts"]["courses"] == len(data["courses"])
+
+
+def test_precomputed_indexes_match_slow_paths(tmp_path):
+    courses = load_bundle(build_bundle(tmp_path / "data.bundle", COURSES))["courses"]
+    plain = load_from_json(str(COURSES))
+    for query in ("micro", "138", "garcia", "econ", "zzz"):
+        assert filter_courses(courses, query) == filter_courses(plain, query)
+
+    pairs = [(c, s) for c in courses[:40] for s in c.secciones]
+    plain_pairs = [(c, s) for c in plain[:40] for s in c.secciones]
+    assert all(section.occupancy is not None for _, section in pairs)
+    assert ConflictDetector.find_conflicts(pairs) == ConflictDetector.find_conflicts(plain_pairs)
+    assert ConflictDetector.find_conflicts(pairs)
+
+
+def test_missing_or_stale_bundle_is_ignored(tmp_path, monkeypatch):
+    assert load_bundle(tmp_path / "missing.bundle") is None
+    (tmp_path / "empty.bundle").write_bytes(b"")
+    assert load_bundle(tmp_path / "empty.bundle") is None
+
+    path = build_bundle(tmp_path / "data.bundle", COURSES)
+    monkeypatch.setattr(bundle_module, "_schema", lambda: {"Course": ["changed"]})
+    assert load_bundle(path) is None
+
+
+def test_bundle_with_moved_class_is_ignored(tmp_path, monkeypatch):
+    from matriculaup.models import course as course_module
+
+    path = build_bundle(tmp_path / "data.bundle", COURSES)
+    monkeypatch.delattr(course_module, "Course")
+    assert load_bundle(path) is None
+
+
+def test_loader_always_emits(tmp_path, monkeypatch):
+    pytest.importorskip("PySide6")
+    from matriculaup.store import persistence
+    from matriculaup.store.loader import DataLoader, LoadedData
+
+    def broken(self):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(persistence.PersistenceManager, "load_schedule", broken)
+    loader = DataLoader(COURSES, tmp_path / "missing.json", bundle_path=tmp_path / "missing.bundle")
+    emitted = []
+    loader.loaded.connect(emitted.append)
+    loader.run()
+    assert len(emitted) == 1 and isinstance(emitted[0], LoadedData)
+    assert emitted[0].courses
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def render_cache(app_module, tmp_path, monkeypatch):
+    cache = app_module.RenderCache(app_module.schedule_renderer, directory=str(tmp_path / "render"))
+    monkeypatch.setattr(app_module, "render_cache", cache)
+    return cache
+
+
+def test_clear_notifies_on_evict(app_module):
+    evicted = []
+    cache = app_module.BoundedCache("test_clear", on_evict=lambda k, v: evicted.append((k, v)))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.clear()
+    assert sorted(evicted) == [("a", 1), ("b", 2)]
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_clearing_rendered_files_removes_them(render_cache):
+    path = render_cache.render_file([], 'CLASE')
+    assert os.path.exists(path)
+    render_cache._files.clear()
+    assert not os.path.exists(path)
+
+
+def test_session_image_cache_holds_keys_not_images(app_module, render_cache):
+    app = app_module.MatriculaApp()
+    classes, exams = app.draw_week_schedule(1)
+    cached = app._schedule_image_cache.get(1)
+    assert all(isinstance(v, str) for v in cached)
+
+    again = app.draw_week_schedule(1)
+    assert again[0].tobytes() == classes.tobytes() and again[1].tobytes() == exams.tobytes()
+
+    # The shared cache dropped the PNGs: the session redraws instead of failing
+    render_cache._memory.clear()
+    render_cache._files.clear()
+    assert app.draw_week_schedule(1)[0].tobytes() == classes.tobytes()
+
+
+def test_unwritable_render_dir_falls_back_to_image(app_module, render_cache, monkeypatch):
+    monkeypatch.setattr(app_module.RenderCache, "_write", staticmethod(lambda path, png: False))
+    image = render_cache.render_file([], 'EXAM')
+    assert isinstance(image, app_module.Image.Image)
+    assert image.size == app_module.schedule_renderer.size
+
+
+def test_files_from_other_processes_are_not_evicted(render_cache):
+    key = render_cache.key([], 'CLASE')
+    path = render_cache._path(key)
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(render_cache.renderer.png_bytes([], 'CLASE'))
+
+    assert render_cache.render_file([], 'CLASE') == path
+    render_cache._files.clear()
+    assert os.path.exists(path)
+
+
+def _write_schedule(path, n):
+    path.write_text("Curso,Secc\n" + "".join(f"Curso {i},A\n" for i in range(n)), encoding="utf-8")
+    return str(path)
+
+
+def test_read_cache_keeps_recently_used_copies(app_module, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(app_module, "READ_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(app_module, "READ_CACHE_MAX_FILES", 2)
+    first, second, third = (_write_schedule(tmp_path / f"h{n}.csv", n) for n in (1, 2, 3))
+
+    app_module.read_schedule_file(first)
+    app_module.read_schedule_file(second)
+    os.utime(app_module._read_cache_path(first), ns=(0, 0))
+    # Reading the oldest copy again makes the second one the least recently used
+    assert app_module.read_schedule_file(first)[1] == "CSV, caché"
+    app_module.read_schedule_file(third)
+
+    assert len(list(cache_dir.iterdir())) == 2
+    assert not os.path.exists(app_module._read_cache_path(second))
+    assert os.path.exists(app_module._read_cache_path(first))
+    assert os.path.exists(app_module._read_cache_path(third))
+
+
+def test_read_cache_is_bounded_by_bytes(app_module, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(app_module, "READ_CACHE_DIR", str(cache_dir))
+    app_module.read_schedule_file(_write_schedule(tmp_path / "small.csv", 1))
+    monkeypatch.setattr(app_module, "READ_CACHE_MAX_BYTES", sum(p.stat().st_size for p in cache_dir.iterdir()))
+
+    big = _write_schedule(tmp_path / "big.csv", 500)
+    app_module.read_schedule_file(big)
+    # The new copy alone is over the limit, so nothing is kept
+    assert list(cache_dir.iterdir()) == []
+    assert app_module.read_schedule_file(big)[1] == "CSV"
+
+
+def test_source_hashes_are_bounded(app_module, tmp_path, monkeypatch):
+    hashes = app_module.BoundedCache("source_hashes", max_entries=2)
+    monkeypatch.setattr(app_module, "_source_hashes", hashes)
+    paths = [_write_schedule(tmp_path / f"upload{n}.csv", n) for n in range(4)]
+    digests = [app_module.file_sha256(p) for p in paths]
+    assert len(hashes) == 2 and len(set(digests)) == 4
+    assert app_module.file_sha256(paths[-1]) == digests[-1] and hashes.hits == 1
@@ -0,0 +1,142 @@
+from types import SimpleNamespace
+
+import pytest
+
+def test_arrow_catalog_round_trip(app_module, schedule_df, tmp_path):
+    pytest.importorskip("pyarrow")
+    catalog = app_module.CourseCatalog(schedule_df)
+    path = str(tmp_path / "horarios.catalog.arrow")
+    catalog.save_arrow(path, "horarios.csv:1:1", "CSV")
+
+    opened, file_type = app_module.CourseCatalog.open_arrow(path, "horarios.csv:1:1")
+    assert file_type == "CSV"
+    assert opened.section_index == catalog.section_index
+    assert opened.course_sections == catalog.course_sections
+    assert opened.search_postings == catalog.search_postings
+
+    # A catalog saved from another version of the source is not reused
+    assert app_module.CourseCatalog.open_arrow(path, "horarios.csv:2:1") is None
+    assert app_module.CourseCatalog.open_arrow(str(tmp_path / "missing.arrow"), "x") is None
+
+
+def test_arrow_catalog_columns_are_not_copied(app_module, schedule_df, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    big = app_module.pd.concat([schedule_df] * 5000, ignore_index=True)
+    path = str(tmp_path / "big.catalog.arrow")
+    app_module.CourseCatalog(big).save_arrow(path, "stamp", "CSV")
+
+    numeric_bytes = big.select_dtypes("number").memory_usage(index=False).sum()
+    before = pa.total_allocated_bytes()
+    opened, _ = app_module.CourseCatalog.open_arrow(path, "stamp")
+    # Only the (small) numeric columns are copied; the text columns point into the mapped file
+    assert pa.total_allocated_bytes() - before <= numeric_bytes + 4096
+    assert len(opened) == len(big)
+    assert opened.df["Curso"].tolist() == big["Curso"].tolist()
+
+
+def test_default_catalog_is_compiled_once(app_module, schedule_csv, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    (tmp_path / "output").mkdir()
+    (tmp_path / "output" / "Horarios_UP_V6_Perfecto.csv").write_text(schedule_csv, encoding="utf-8")
+    monkeypatch.setattr(app_module, "WORKSPACE_ROOT", str(tmp_path))
+    monkeypatch.setattr(app_module, "_default_catalog", None)
+
+    catalog, file_type = app_module.load_default_catalog()
+    assert (tmp_path / "output" / "Horarios_UP_V6_Perfecto.catalog.arrow").exists()
+    assert file_type == "CSV" and len(catalog) == schedule_csv.count("\n") - 1
+
+    # Another worker opens the compiled file instead of reading the CSV
+    monkeypatch.setattr(app_module, "_default_catalog", None)
+    monkeypatch.setattr(app_module, "read_schedule_file", lambda path: pytest.fail("CSV was re-read"))
+    again, _ = app_module.load_default_catalog()
+    assert again.section_index == catalog.section_index
+
+
+def _linear_search(app_module, df, term):
+    """The baseline list_courses filter: every keyword in the course name + its teachers."""
+    names = sorted(df["Curso"].dropna().unique().tolist())
+    kws = app_module.normalize_str(term).split()
+    docs = {}
+    for curso, docente in zip(df["Curso"], df["Docentes"].fillna("")):
+        if str(docente).strip():
+            docs.setdefault(curso, set()).add(str(docente).strip())
+    return [n for n in names
+            if all(kw in app_module.normalize_str(f"{n} {' '.join(sorted(docs.get(n, ())))}") for kw in kws)]
+
+
+def test_search_matches_linear_filter(app_module, schedule_df):
+    app = app_module.MatriculaApp(app_module.CourseCatalog(schedule_df))
+    blobs = [app_module.normalize_str(f"{c} {d}") for c, d in zip(schedule_df["Curso"], schedule_df["Docentes"])]
+    # Every substring of up to 6 characters, plus misses, accents, case and several words
+    terms = {b[i:i + n].strip() for b in blobs for n in range(1, 7) for i in range(len(b) - n + 1)}
+    terms |= {"", "zz", "economía i", "MICRO pérez", "eco ana", "rojas luis", "mia i", "xyz micro"}
+    for term in sorted(terms):
+        assert app.list_courses(term) == _linear_search(app_module, schedule_df, term), term
+
+
+def test_pending_filter_is_keyed_by_the_taken_set(app_module, schedule_df, monkeypatch):
+    app = app_module.MatriculaApp(app_module.CourseCatalog(schedule_df))
+    mandatory = ["microeconomia i", "macroeconomia i", "matematicas ii"]
+    app.curriculum = SimpleNamespace(get_course_names=lambda: mandatory)
+    # Even if every taken set hashed alike, results must not leak between them
+    monkeypatch.setattr(app_module, "hash", lambda value: 0, raising=False)
+
+    app.taken_courses = {"microeconomia i"}
+    assert app.list_courses(filter_pending_only=True) == ["Macroeconomía I", "Matemáticas II"]
+    app.taken_courses = {"macroeconomia i"}
+    assert app.list_courses(filter_pending_only=True) == ["Matemáticas II", "Microeconomía I"]
+
+
+def _nan_to_none(value):
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    return None if isinstance(value, float) and value != value else value
+
+
+def _linear_block(app_module, df, curso, secc):
+    """The block the baseline add_to_schedule built by filtering the DataFrame."""
+    rows = df[(df["Curso"] == curso) & (df["Secc"] == secc)]
+    if rows.empty:
+        rows = df[df["Curso"].str.contains(curso, na=False)]
+    slots = [{"dia": r["Día"], "inicio": r["Horario_Inicio"], "fin": r["Horario_Cierre"], "tipo": r["Tipo"]}
+             for _, r in rows.iterrows()
+             if r["Día"] or r["Horario_Inicio"] or r["Horario_Cierre"]]
+    first = rows.iloc[0]
+    return {"block": f"{curso}__{secc}", "curso": curso, "secc": secc, "prof": first["Docentes"],
+            "tipo": first["Tipo"], "slots": slots, "cred": app_module.parse_credits(first["Cred"])}
+
+
+def _linear_sections(df, course):
+    """The baseline get_sections_for_course."""
+    rows = df[df["Curso"] == course]
+    labels = [f"{course}__{secc}|Secc {secc} — {prof} ({cred} cr)"
+              for (secc, prof, cred), _ in rows.groupby(["Secc", "Docentes", "Cred"], dropna=False)]
+    return list(dict.fromkeys(labels))
+
+
+def _linear_days(df, curso, secc):
+    """The baseline get_days_for_section."""
+    rows = df[(df["Curso"] == curso) & (df["Secc"] == secc)]
+    infos = [f"{r['Día']} {r['Horario_Inicio']}-{r['Horario_Cierre']} ({r['Tipo']})" for _, r in rows.iterrows()]
+    return list(dict.fromkeys(infos))
+
+
+def test_section_index_matches_linear_filter(app_module, schedule_df):
+    app = app_module.MatriculaApp(app_module.CourseCatalog(schedule_df))
+    for course in app.list_courses():
+        labels = app.get_sections_for_course(course)
+        assert labels == _linear_sections(schedule_df, course)
+        for label in labels:
+            curso, secc = label.split("|")[0].split("__")
+            assert app.get_days_for_section(label) == _linear_days(schedule_df, curso, secc)
+
+    # An exact section, and a label whose section is unknown (falls back to the course name)
+    for label in ["Microeconomía I__B|x", "Macroeconomía I__A|x", "Microeconomía__Z"]:
+        curso, secc = label.split("|")[0].split("__")
+        app.schedules[1] = []
+        app.credits[1] = 0.0
+        assert app.add_to_schedule([label], 1).startswith("✓")
+        block = app.schedules[1][0]
+        assert _nan_to_none(block) == _nan_to_none(_linear_block(app_module, schedule_df, curso, secc))
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+ROWS = [
+    {"Curso": "Microeconomía I", "Secc": "A", "Docentes": "Pérez, Juan", "Cred": 4},
+    {"Curso": "Macroeconomía I", "Secc": 1, "Docentes": "Díaz, Ana", "Cred": 3},
+]
+
+
+@pytest.fixture(scope="module")
+def converter(scripts_path):
+    import convert_excel_to_csv
+    return convert_excel_to_csv
+
+
+def test_spanish_excel_csv_to_feather(converter, tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "horarios.csv"
+    source.write_bytes("Curso;Secc;Docentes;Cred\nMicroeconomía I;A;Pérez, Juan;4\n"
+                       "Macroeconomía I;1;Díaz, Ana;3\n".encode("cp1252"))
+
+    assert converter.convert_to_columnar(str(source))
+    df = pd.read_feather(tmp_path / "horarios.feather")
+    assert list(df.columns) == ["Curso", "Secc", "Docentes", "Cred"]
+    assert df["Curso"].tolist() == ["Microeconomía I", "Macroeconomía I"]
+    assert df["Docentes"].tolist() == ["Pérez, Juan", "Díaz, Ana"]
+
+
+def test_mixed_excel_column_is_stored_as_text(converter, tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "horarios.xlsx"
+    pd.DataFrame(ROWS).to_excel(source, index=False)
+
+    assert converter.convert_to_columnar(str(source), fmt="parquet")
+    df = pd.read_parquet(tmp_path / "horarios.parquet")
+    assert df["Secc"].tolist() == ["A", "1"]
+    assert df["Cred"].tolist() == [4, 3]
+
+
+def test_pick_sources_keeps_one_file_per_name(converter):
+    files = ["b.csv", "a.csv", "a.xlsx", "notes.txt", "c.xls", "c.xlsx"]
+    assert converter.pick_sources(files, (".xlsx", ".xls", ".csv")) == (
+        ["a.xlsx", "b.csv", "c.xlsx"], ["a.csv", "c.xls"])
+    assert converter.pick_sources(files, (".xlsx", ".xls")) == (["a.xlsx", "c.xlsx"], ["c.xls"])
+
+
+def test_auto_mode_does_not_overwrite_with_the_csv_copy(converter, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "output"
+    output.mkdir()
+    pd.DataFrame(ROWS).to_excel(output / "horarios.xlsx", index=False)
+    # A stale CSV copy with the same base name
+    pd.DataFrame(ROWS[:1]).to_csv(output / "horarios.csv", index=False)
+    monkeypatch.setattr(converter, "WORKSPACE_ROOT", str(tmp_path))
+    monkeypatch.setattr("sys.argv", ["convert_excel_to_csv.py", "--feather"])
+
+    converter.main()
+    assert sorted(p.name for p in output.iterdir()) == ["horarios.csv", "horarios.feather", "horarios.xlsx"]
+    assert len(pd.read_feather(output / "horarios.feather")) == len(ROWS)
@@ -0,0 +1,25 @@
+from matriculaup.core.course_search import filter_courses
+from matriculaup.models.course import Course
+
+
+def _course(codigo, nombre, docentes):
+    return Course.from_dict({
+        "codigo": codigo, "nombre": nombre, "creditos": "4", "prerequisitos": None,
+        "secciones": [{"seccion": "A", "docentes": docentes, "sesiones": []}],
+    })
+
+
+COURSES = [
+    _course("138201", "Microeconomía I", ["CASTROMATTA, Milagros"]),
+    _course("138202", "Macroeconomía I", ["GARCIA, Juan"]),
+]
+
+
+def test_matches_name_code_and_professor_case_insensitively():
+    assert [c.codigo for c in filter_courses(COURSES, "MICRO")] == ["138201"]
+    assert [c.codigo for c in filter_courses(COURSES, "138202")] == ["138202"]
+    assert [c.codigo for c in filter_courses(COURSES, "garcia")] == ["138202"]
+
+
+def test_blank_query_returns_everything():
+    assert filter_courses(COURSES, "  ") == COURSES
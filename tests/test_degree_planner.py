@@ -0,0 +1,107 @@
+import pytest
+
+from matriculaup.core.degree_planner import DegreePlanner, prerequisites_met
+from matriculaup.models.curriculum import Curriculum
+
+
+def _leaf(code):
+    return {"items": [{"code": code, "name": code}]}
+
+
+@pytest.fixture
+def chain_curriculum():
+    """Five mandatory courses: A -> B -> C chain plus two independent ones."""
+    return Curriculum.from_dict({
+        "metadata": {"plan": "Test", "carrera": "Economía"},
+        "ciclos": [
+            {"ciclo": 1, "cursos": [
+                {"codigo": "100001", "nombre": "A", "creditos": "5", "tipo": "obligatorio"},
+                {"codigo": "100004", "nombre": "D", "creditos": "5", "tipo": "obligatorio"},
+            ]},
+            {"ciclo": 2, "cursos": [
+                {"codigo": "100002", "nombre": "B", "creditos": "5", "tipo": "obligatorio"},
+                {"codigo": "100005", "nombre": "E", "creditos": "5", "tipo": "obligatorio"},
+            ]},
+            {"ciclo": 3, "cursos": [
+                {"codigo": "100003", "nombre": "C", "creditos": "5", "tipo": "obligatorio"},
+            ]},
+            {"ciclo": "electivos", "cursos": [
+                {"codigo": "100009", "nombre": "Electivo", "creditos": "3", "tipo": "electivo"},
+            ]},
+        ],
+    })
+
+
+PREREQS = {
+    "100002": _leaf("100001"),
+    "100003": {"op": "AND", "items": [_leaf("100002"), _leaf("100004")]},
+}
+
+
+class TestPrerequisiteEvaluation:
+
+    def test_or_needs_any_branch(self):
+        tree = {"op": "OR", "items": [_leaf("1"), _leaf("2")]}
+        assert prerequisites_met(tree, {"2"}) is True
+        assert prerequisites_met(tree, set()) is False
+
+    def test_unparsed_prerequisite_counts_as_met(self):
+        assert prerequisites_met({"raw": "Y (", "parsed": False}, set()) is True
+        assert prerequisites_met(None, set()) is True
+
+
+class TestDegreePlanner:
+
+    def test_chain_sets_minimum_semesters(self, chain_curriculum):
+        plan = DegreePlanner(chain_curriculum, PREREQS).plan(set())
+        assert plan.total_semestres == 3
+        assert plan.optimo is True
+        first = {c.codigo for c in plan.semestres[0].cursos}
+        assert {"100001", "100004"} <= first
+
+    def test_credit_cap_forces_extra_semester(self, chain_curriculum):
+        plan = DegreePlanner(chain_curriculum, PREREQS, credit_cap=5).plan(set())
+        assert plan.total_semestres == 5
+        assert all(s.creditos <= 5 for s in plan.semestres)
+
+    def test_replanning_after_toggle_reuses_cache(self, chain_curriculum):
+        planner = DegreePlanner(chain_curriculum, PREREQS)
+        planner.plan(set())
+        cached_states = len(planner._cache)
+        planner.plan(set())
+        assert len(planner._cache) == cached_states
+
+        hits = planner.cache_hits
+        plan = planner.plan({"100001"})
+        assert plan.total_semestres == 2
+        assert planner.cache_hits > hits
+        assert all(c.codigo != "100001" for s in plan.semestres for c in s.cursos)
+
+    @staticmethod
+    def _three_credit_courses(n):
+        return Curriculum.from_dict({"metadata": {}, "ciclos": [{"ciclo": 1, "cursos": [
+            {"codigo": f"20000{i}", "nombre": str(i), "creditos": "3", "tipo": "obligatorio"}
+            for i in range(n)
+        ]}]})
+
+    def test_greedy_plan_above_lower_bound_is_not_proven(self):
+        # 3-credit courses under a 5-credit cap: the credit bound says 2 semesters, only the
+        # sampled one-course loads are searched and they need 3
+        plan = DegreePlanner(self._three_credit_courses(3), {}, credit_cap=5).plan(set())
+        assert plan.total_semestres == 3
+        assert plan.optimo is False
+
+    def test_budget_truncated_states_are_not_reused(self):
+        planner = DegreePlanner(self._three_credit_courses(5), {}, credit_cap=5, max_states=2)
+        assert planner.plan(set()).total_semestres == 5
+        assert any(result[3] for result in planner._cache.values())
+
+        planner.max_states = 20000
+        assert planner.plan(set()).total_semestres == 5
+        assert not any(result[3] for result in planner._cache.values())
+
+    def test_prerequisite_outside_plan_blocks_course(self, chain_curriculum):
+        prereqs = dict(PREREQS, **{"100005": _leaf("999999")})
+        plan = DegreePlanner(chain_curriculum, prereqs).plan(set())
+        assert [c.codigo for c in plan.bloqueados] == ["100005"]
+        assert DegreePlanner(chain_curriculum, prereqs).plan({"999999"}).bloqueados == []
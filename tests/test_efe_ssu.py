@@ -0,0 +1,68 @@
+import csv
+
+import pytest
+
+from scripts.extractors import efe_ssu
+
+ROWS = [
+    ["SERVICIO SOCIAL UNIVERSITARIO"],
+    [],
+    ["", "CÓDIGO", "SECCIÓN", "FECHA", "SESIÓN", "H. INICIO", "H. FIN"],
+    ["", "900101", "A", "21/03/2026", "IDA", "09:00", "09:30"],
+    ["", "900101", "A", "2026-03-21 00:00:00", "CLASE", "8:00:00", "8:50:00"],
+    ["", "900101", "B", "", "CLASE", "10:00", "11:00"],
+    ["", "nota al pie"],
+]
+
+
+@pytest.fixture
+def sessions_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(efe_ssu, "CACHE_DIR", tmp_path / "cache")
+    path = tmp_path / "ssu.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(ROWS)
+    return path
+
+
+def test_csv_rows_are_parsed_in_one_pass(sessions_csv):
+    result = efe_ssu._load_excel(sessions_csv, use_cache=False)
+    assert result == {"900101": {"A": [
+        {"fecha": "2026-03-21", "dia": "SAB", "tipo": "CLASE", "hora_inicio": "08:00", "hora_fin": "08:50"},
+        {"fecha": "2026-03-21", "dia": "SAB", "tipo": "IDA", "hora_inicio": "09:00", "hora_fin": "09:30"},
+    ]}}
+
+
+def test_parsed_map_is_cached_by_content(sessions_csv, monkeypatch):
+    first = efe_ssu._load_excel(sessions_csv)
+    assert len(list((sessions_csv.parent / "cache").iterdir())) == 1
+
+    monkeypatch.setattr(efe_ssu, "_parse_session_rows", lambda rows: pytest.fail("cache not used"))
+    assert efe_ssu._load_excel(sessions_csv) == first
+
+
+@pytest.mark.skipif(not efe_ssu.XLSX_PATH.exists(), reason="SSU workbook not available")
+def test_streamed_workbook_matches_csv_export(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    csv_path = tmp_path / "ssu.csv"
+    sheet = openpyxl.load_workbook(efe_ssu.XLSX_PATH).active
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(["" if c is None else c for c in row] for row in sheet.iter_rows(values_only=True))
+
+    streamed = efe_ssu._load_excel(efe_ssu.XLSX_PATH, use_cache=False)
+    assert streamed
+    assert efe_ssu._load_excel(csv_path, use_cache=False) == streamed
+
+
+def test_spanish_excel_csv_export(sessions_csv):
+    # Spanish-locale Excel: ';' separators and cp1252 text
+    spanish = sessions_csv.with_name("ssu_es.csv")
+    with open(spanish, "w", newline="", encoding="cp1252") as f:
+        csv.writer(f, delimiter=";").writerows(ROWS)
+    assert efe_ssu._load_excel(spanish, use_cache=False) == efe_ssu._load_excel(sessions_csv, use_cache=False)
+
+
+def test_csv_without_header_fails_loudly(tmp_path):
+    path = tmp_path / "ssu.csv"
+    path.write_text("900101,A,21/03/2026\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Header row not found"):
+        efe_ssu._load_excel(path, use_cache=False)
@@ -0,0 +1,42 @@
+import re
+
+import pytest
+
+from scripts.extractors.validators import validate_courses_json
+from scripts.generate_catalog import CatalogGenerator, CatalogProfile
+
+
+@pytest.fixture
+def profile(minimal_valid_course):
+    second = dict(minimal_valid_course, codigo="138202", nombre="Microeconomia II",
+                  prerequisitos={"op": "AND", "items": [{"items": [{"code": "138201", "name": "Microeconomia I"}]}]})
+    return CatalogProfile({"metadata": {"ciclo": "2026-1", "fecha_extraccion": "2026-02-24"},
+                           "cursos": [minimal_valid_course, second]})
+
+
+def test_same_seed_same_catalog(profile):
+    a = CatalogGenerator(profile, seed=7).generate(40)
+    b = CatalogGenerator(profile, seed=7).generate(40)
+    assert a == b
+    assert a["metadata"]["fecha_extraccion"] == "2026-02-24"
+    assert a["cursos"] != CatalogGenerator(profile, seed=8).generate(40)["cursos"]
+
+
+def test_codes_unique_and_prerequisites_point_backwards(profile):
+    cursos = CatalogGenerator(profile, seed=1).generate(200)["cursos"]
+    codes = [c["codigo"] for c in cursos]
+    assert len(set(codes)) == len(codes)
+    # Template prefix plus a numeric suffix, like the real codes
+    assert all(re.fullmatch(r"\d{6}", code) for code in codes)
+    assert sum(code.startswith("138") for code in codes) == 200
+    seen = set()
+    for course in cursos:
+        tree = course["prerequisitos"]
+        if tree:
+            leaves = [leaf["code"] for group in tree["items"] for leaf in group["items"]]
+            assert set(leaves) <= seen
+        seen.add(course["codigo"])
+
+
+def test_output_matches_courses_schema(profile):
+    assert validate_courses_json(CatalogGenerator(profile, seed=3).generate(100)) == []
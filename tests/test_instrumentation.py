@@ -0,0 +1,51 @@
+import importlib
+
+import pytest
+
+import matriculaup.instrumentation as instrumentation
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setenv(instrumentation.ENV_VAR, "1")
+    module = importlib.reload(instrumentation)
+    module.reset()
+    yield module
+    monkeypatch.delenv(instrumentation.ENV_VAR)
+    import atexit
+    atexit.unregister(module.dump)
+    importlib.reload(instrumentation)
+
+
+def test_disabled_is_a_no_op(monkeypatch):
+    monkeypatch.delenv(instrumentation.ENV_VAR, raising=False)
+    module = importlib.reload(instrumentation)
+
+    def func():
+        return 42
+
+    assert module.timed("x")(func) is func
+    assert module.timer("x") is module.timer("y")
+    module.count("rows_seen")
+    assert "rows_seen" not in module.summary()
+
+
+def test_enabled_records_timers_and_counters(enabled, tmp_path, monkeypatch):
+    @enabled.timed("work")
+    def work(n):
+        return n * 2
+
+    assert work(3) == 6
+    assert work.__name__ == "work"
+    with enabled.timer("block"):
+        pass
+    enabled.count("rows", 5)
+
+    text = enabled.summary()
+    assert "work" in text and "block" in text and "rows" in text
+    assert enabled._timers["work"].calls == 1
+
+    log = tmp_path / "profile.log"
+    monkeypatch.setenv(enabled.LOG_ENV_VAR, str(log))
+    enabled.dump()
+    assert "work" in log.read_text(encoding="utf-8")
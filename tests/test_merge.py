@@ -0,0 +1,124 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from matriculaup.core.conflict_detector import ConflictDetector
+from matriculaup.core.course_search import filter_courses
+from matriculaup.models.course import Course
+from matriculaup.store.bundle import build_bundle, load_bundle
+from scripts.extractors.merge import MergeConflictError, merge_files, merge_offerings
+
+INPUT = Path(__file__).resolve().parent.parent / "input"
+COURSES = INPUT / "courses_2026-1_v4.json"
+EFE = INPUT / "efe_courses_2026-1_v1.json"
+
+
+def _section(seccion, dia="LUN", inicio="08:00", fin="09:50"):
+    return {"seccion": seccion, "docentes": ["Docente"], "observaciones": "",
+            "sesiones": [{"tipo": "CLASE", "dia": dia, "hora_inicio": inicio, "hora_fin": fin, "aula": "A101"}]}
+
+
+def _doc(*courses, ciclo="2026-1"):
+    return {"metadata": {"ciclo": ciclo}, "cursos": list(courses)}
+
+
+def _course(codigo, *sections, nombre="Curso", creditos="3.0"):
+    return {"codigo": codigo, "nombre": nombre, "creditos": creditos, "prerequisitos": None,
+            "secciones": list(sections)}
+
+
+def test_sections_are_unioned_and_duplicates_dropped():
+    a = _doc(_course("100", _section("A")), _course("200", _section("A")))
+    b = _doc(_course("100", _section("A"), _section("B")), _course("300", _section("A")))
+    original = copy.deepcopy(b)
+
+    data, report = merge_offerings([("a", a), ("b", b)])
+    by_code = {c["codigo"]: c for c in data["cursos"]}
+    assert list(by_code) == ["100", "200", "300"]
+    assert [s["seccion"] for s in by_code["100"]["secciones"]] == ["A", "B"]
+    assert (report.courses, report.duplicates, report.sections_added, report.conflicts) == (3, 1, 1, [])
+    assert data["metadata"]["ciclo"] == "2026-1"
+    assert data["metadata"]["fuentes"] == [{"nombre": "a", "cursos": 2}, {"nombre": "b", "cursos": 2}]
+    assert b == original
+
+
+def test_conflict_policies():
+    a = _doc(_course("100", _section("A"), nombre="Viejo"))
+    b = _doc(_course("100", _section("A", dia="MAR"), nombre="Nuevo"))
+
+    first, report = merge_offerings([("a", a), ("b", b)], on_conflict="first")
+    assert first["cursos"][0]["nombre"] == "Viejo"
+    assert first["cursos"][0]["secciones"][0]["sesiones"][0]["dia"] == "LUN"
+    assert len(report.conflicts) == 2
+
+    last, _ = merge_offerings([("a", a), ("b", b)], on_conflict="last")
+    assert last["cursos"][0]["nombre"] == "Nuevo"
+    assert last["cursos"][0]["secciones"][0]["sesiones"][0]["dia"] == "MAR"
+
+    with pytest.raises(MergeConflictError):
+        merge_offerings([("a", a), ("b", b)], on_conflict="error")
+    with pytest.raises(ValueError):
+        merge_offerings([("a", a)], on_conflict="newest")
+
+
+def test_ciclo_mismatch_is_a_conflict():
+    a = _doc(_course("100", _section("A")))
+    b = _doc(_course("200", _section("A")), ciclo="2025-2")
+
+    data, report = merge_offerings([("a", a), ("b", b)])
+    assert data["metadata"]["ciclo"] == "2026-1"
+    assert report.conflicts == ["metadata.ciclo (b)"]
+    assert merge_offerings([("a", a), ("b", b)], on_conflict="last")[0]["metadata"]["ciclo"] == "2025-2"
+    with pytest.raises(MergeConflictError):
+        merge_offerings([("a", a), ("b", b)], on_conflict="error")
+
+
+def test_repeated_section_letter_within_a_source_is_reported():
+    a = _doc(_course("100", _section("A"), _section("A", dia="MIE"), _section("A")))
+    b = _doc(_course("100", _section("A")))
+
+    data, report = merge_offerings([("a", a), ("b", b)])
+    sections = data["cursos"][0]["secciones"]
+    assert [s["sesiones"][0]["dia"] for s in sections] == ["LUN"]
+    # b's A is compared against a's first A, not the repeated one
+    assert (report.duplicates, report.sections_added, report.conflicts) == (2, 0, ["100 sección A (a)"])
+    with pytest.raises(MergeConflictError):
+        merge_offerings([("a", a)], on_conflict="error")
+
+
+def test_merged_efe_is_searchable_and_conflict_checked(tmp_path):
+    regular = json.loads(COURSES.read_text(encoding="utf-8"))
+    efe = json.loads(EFE.read_text(encoding="utf-8"))
+    data, report = merge_files([COURSES, EFE])
+    assert report.courses == len({c["codigo"] for c in regular["cursos"] + efe["cursos"]})
+    assert not report.conflicts
+
+    merged = tmp_path / "merged.json"
+    merged.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    courses = load_bundle(build_bundle(tmp_path / "data.bundle", merged))["courses"]
+    assert len(courses) == report.courses
+
+    efe_course = Course.from_dict(efe["cursos"][0])
+    found = filter_courses(courses, efe_course.codigo)
+    assert [c.codigo for c in found] == [efe_course.codigo]
+    section = found[0].secciones[0]
+    assert section.occupancy is not None
+
+    # A regular section meeting at the same time as the EFE one, found session by session
+    efe_codes = {c["codigo"] for c in efe["cursos"]}
+    clashing, free = None, None
+    for course in courses:
+        if course.codigo in efe_codes:
+            continue
+        for other in course.secciones:
+            overlaps = any(ConflictDetector.sessions_overlap(s1, s2)
+                           for s1 in section.sesiones for s2 in other.sesiones)
+            if overlaps and clashing is None:
+                clashing = (course, other)
+            elif not overlaps and other.sesiones and free is None:
+                free = (course, other)
+    assert clashing and free
+    assert ConflictDetector.find_conflicts([(found[0], section), clashing]) == [(found[0], clashing[0])]
+    assert ConflictDetector.find_conflicts([(found[0], section), free]) == []
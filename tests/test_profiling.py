@@ -0,0 +1,35 @@
+from scripts.extractors.courses import CourseOfferingExtractor
+from scripts.extractors.profiling import ExtractionProfiler, NullProfiler
+
+# Real-PDF layout: course row, section row, session continuation row
+TABLE = [
+    ["Secc.", None, None, None, None, None, None, None, None, None, None],
+    ["138201 - Microeconomía I", None, None, "4,00", "", None, None, None, None, None, None],
+    ["A", "", "CASTROMATTA, Milagros", "CLASE", None, "LUN", "07:30", "09:20", "", "30", "A-101"],
+    [None, None, None, "CLASE", None, "MIE", "07:30", "09:20", "", "30", "A-101"],
+    [],
+]
+
+
+def test_profiler_counts_rows_and_times_stages(tmp_path):
+    profiler = ExtractionProfiler()
+    extractor = CourseOfferingExtractor("Oferta-Academica-2026-I_v1.pdf", str(tmp_path), profiler=profiler)
+    profiler.start("test.pdf")
+    with profiler.page(0):
+        with profiler.stage("_process_table"):
+            courses = extractor._process_table(TABLE)
+    profiler.stop()
+
+    assert len(courses[0]["secciones"][0]["sesiones"]) == 2
+    report = profiler.report()
+    assert report["rows"] == {"header": 1, "course": 1, "section": 1, "session": 1, "blank": 1}
+    assert report["pages"][0]["stages"]["_process_table"]["calls"] == 1
+    assert report["slowest_pages"][0]["page"] == 1
+
+    assert "Extraction profile" in profiler.write_html(tmp_path / "p.html").read_text(encoding="utf-8")
+    assert profiler.write_json(tmp_path / "p.json").exists()
+
+
+def test_extractor_defaults_to_null_profiler():
+    extractor = CourseOfferingExtractor("Oferta-Academica-2026-I_v1.pdf")
+    assert isinstance(extractor.profiler, NullProfiler) and not extractor.profiler.enabled
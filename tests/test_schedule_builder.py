@@ -0,0 +1,175 @@
+import importlib.util
+import random
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from PIL import Image, ImageChops, ImageColor
+
+
+@pytest.fixture(scope="module")
+def builder_module(scripts_path):
+    """scripts/schedule-builder.py (a hyphenated name, so it is loaded from its path)."""
+    pytest.importorskip("tkinter")
+    spec = importlib.util.spec_from_file_location("schedule_builder", scripts_path / "schedule-builder.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Treeview rows: (block_id, [Secc, Profesor, Tipo, Dia, Inicio, Fin, Prerequisitos, Cred])
+ROWS = [
+    ("Microeconomía I__A", ["A", "Pérez, Juan", "CLASE", "LUN", "08:00", "09:50", "", "4"]),
+    ("Macroeconomía I__A", ["A", "", "PRÁCTICA", "JUE", "14:00", "15:50", "", "3"]),
+    ("Macroeconomía I__A", ["A", "", "FINAL", "SAB", "09:00", "11:00", "", "3"]),
+]
+
+
+@pytest.fixture(scope="module")
+def renderer(builder_module):
+    return builder_module.ScheduleImageRenderer(scale=2)
+
+
+def _corner(module, renderer, dia, ini, fin):
+    """A pixel just inside the block's top-left corner, clear of the border and the text."""
+    x1, y1, _, _ = module.block_box(dia, ini, fin)
+    return round((x1 + 4) * renderer.scale), round((y1 + 4) * renderer.scale)
+
+
+def test_blocks_are_drawn_in_their_grid_cells(builder_module, renderer):
+    m = builder_module
+    clases = renderer.render(ROWS, "clases")
+    assert clases.size == (m.GRID_WIDTH * renderer.scale, m.GRID_HEIGHT * renderer.scale)
+    assert clases.getpixel(_corner(m, renderer, "LUN", "08:00", "09:50")) == ImageColor.getrgb("#7ecbff")
+    assert clases.getpixel(_corner(m, renderer, "JUE", "14:00", "15:50")) == ImageColor.getrgb("#2ecc40")
+    # Exams are left to the other image
+    assert clases.getpixel(_corner(m, renderer, "SAB", "09:00", "11:00")) == ImageColor.getrgb("white")
+
+    examenes = renderer.render(ROWS, "examenes")
+    assert examenes.getpixel(_corner(m, renderer, "SAB", "09:00", "11:00")) == ImageColor.getrgb("red")
+    assert examenes.getpixel(_corner(m, renderer, "LUN", "08:00", "09:50")) == ImageColor.getrgb("white")
+
+
+def test_grid_headers_and_empty_cells(builder_module, renderer):
+    m = builder_module
+    img = renderer.render(ROWS, "clases")
+    for i in range(len(m.DAYS)):
+        header = ((m.FIRST_COL_WIDTH + i * m.CELL_WIDTH + 4) * renderer.scale, 4 * renderer.scale)
+        assert img.getpixel(header) == ImageColor.getrgb("lightgray")
+    # Tuesday 10:15 is empty
+    assert img.getpixel(_corner(m, renderer, "MAR", "10:15", "10:45")) == ImageColor.getrgb("white")
+    # Rows without a valid day or time are skipped, not drawn at the origin
+    bad = [("X__A", ["A", "", "CLASE", "DOM", "08:00", "09:50", "", "3"]),
+           ("Y__A", ["A", "", "CLASE", "LUN", "", "09:50", "", "3"])]
+    assert ImageChops.difference(renderer.render(bad, "clases"), renderer.grid_image()).getbbox() is None
+
+
+def test_export_writes_pngs_and_one_pdf(builder_module, renderer, tmp_path):
+    m = builder_module
+    schedules = {"Horario1": ROWS, "Horario2": ROWS[:1]}
+    paths = renderer.export(schedules, str(tmp_path / "export"), formats=("png", "pdf"))
+
+    names = ["Horario1_Clases.png", "Horario1_Examenes.png",
+             "Horario2_Clases.png", "Horario2_Examenes.png", "Horarios.pdf"]
+    assert [p.rsplit("/", 1)[-1] for p in paths] == names
+    assert sorted(p.name for p in (tmp_path / "export").iterdir()) == sorted(names)
+    with Image.open(tmp_path / "export" / "Horario1_Clases.png") as png:
+        assert png.size == (m.GRID_WIDTH * renderer.scale, m.GRID_HEIGHT * renderer.scale)
+
+    pdf = (tmp_path / "export" / "Horarios.pdf").read_bytes()
+    assert pdf.startswith(b"%PDF")
+    # One page per image: classes and exams for each schedule
+    assert len(re.findall(rb"/Type\s*/Page\b", pdf)) == 2 * len(schedules)
+
+    assert renderer.export(schedules, str(tmp_path / "png_only")) == [
+        str(tmp_path / "png_only" / n) for n in names[:-1]]
+
+
+DAYS = ["LUN", "MAR", "MIE", "lun "]
+TIPOS = ["CLASE", "PRÁCTICA", "PRACDIRIGI", "clase", "FINAL", "PARCIAL", "OTRO"]
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _random_courses(rng, n):
+    rows = []
+    for c in range(n):
+        for secc in "AB"[:rng.randint(1, 2)]:
+            for _ in range(rng.randint(1, 3)):
+                start = rng.randrange(7 * 60 + 30, 21 * 60, 30)
+                rows.append({"Curso": f"Curso {c}", "Secc": secc, "Docentes": f"Docente {c}", "Cred": 3,
+                             "Prerequisitos": "", "Día": rng.choice(DAYS),
+                             "Horario_Inicio": "" if rng.random() < 0.05 else _hhmm(start),
+                             "Horario_Cierre": _hhmm(start + rng.choice([50, 80, 110])),
+                             "Tipo": rng.choice(TIPOS)})
+    return pd.DataFrame(rows)
+
+
+def _random_schedule(rng, n):
+    blocks = []
+    for _ in range(n):
+        start = rng.randrange(7 * 60 + 30, 21 * 60, 30)
+        blocks.append(["A", "", rng.choice(TIPOS), rng.choice(DAYS + ["VIE"]),
+                       _hhmm(start), _hhmm(start + rng.choice([50, 80, 110])), "", "3"])
+    return blocks
+
+
+def _pairwise_conflicts(df, blocks):
+    """The baseline filter_courses loops: any row of the group against every block, per group."""
+    def grupo(tipo):
+        t = (str(tipo) or "").upper().strip()
+        return "CLASE" if t in {"CLASE", "PRÁCTICA", "PRÁCTICAS", "PRACDIRIGI"} else \
+            "EXAMEN" if t in {"FINAL", "PARCIAL"} else "OTRO"
+
+    flags = []
+    for _, group_data in df.groupby(["Curso", "Secc", "Docentes", "Cred", "Prerequisitos"], dropna=False):
+        has_conflict = False
+        for _, row in group_data.iterrows():
+            try:
+                start_n = datetime.strptime(row["Horario_Inicio"], "%H:%M")
+                end_n = datetime.strptime(row["Horario_Cierre"], "%H:%M")
+            except ValueError:
+                continue
+            for v in blocks:
+                if str(row["Día"]).upper().strip() != str(v[3]).upper().strip():
+                    continue
+                if grupo(row["Tipo"]) != grupo(v[2]) or grupo(v[2]) == "OTRO":
+                    continue
+                start_e = datetime.strptime(v[4], "%H:%M")
+                end_e = datetime.strptime(v[5], "%H:%M")
+                if start_n < end_e and end_n > start_e:
+                    has_conflict = True
+        flags.append(has_conflict)
+    return flags
+
+
+class _Tree:
+    """The few Treeview calls conflicting_groups makes."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def get_children(self):
+        return list(range(len(self._rows)))
+
+    def item(self, sid):
+        return {"values": self._rows[sid]}
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_conflicting_groups_match_pairwise_loops(builder_module, seed):
+    rng = random.Random(seed)
+    df = _random_courses(rng, rng.randint(1, 10))
+    blocks = _random_schedule(rng, rng.randint(0, 8))
+
+    # Without a Tk window: only the state conflicting_groups reads
+    builder = builder_module.ScheduleBuilder.__new__(builder_module.ScheduleBuilder)
+    builder.courses_df = builder.prepare_courses(df)
+    builder.schedules_data = {1: {"tree": _Tree(blocks)}}
+    builder.notebook = SimpleNamespace(select=lambda: "tab", index=lambda tab: 0)
+
+    assert builder.conflicting_groups().tolist() == _pairwise_conflicts(df, blocks)
@@ -0,0 +1,124 @@
+import random
+from datetime import datetime
+
+import pytest
+
+DAYS = ["LUN", "MAR", "MIE", "JUE", "VIE", "SAB", "lun "]
+TIPOS = ["CLASE", "PRÁCTICA", "PRACDIRIGI", "clase", "FINAL", "PARCIAL", "OTRO", None]
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _random_blocks(rng, n, prefix):
+    """Blocks in MatriculaApp's format, with a few invalid times and untracked session types."""
+    blocks = []
+    for b in range(n):
+        slots = []
+        for _ in range(rng.randint(1, 3)):
+            start = rng.randrange(7 * 60 + 30, 21 * 60, 30)
+            end = start + rng.choice([50, 80, 110])
+            slots.append({"dia": rng.choice(DAYS), "inicio": "nan" if rng.random() < 0.05 else _hhmm(start),
+                          "fin": _hhmm(end), "tipo": rng.choice(TIPOS)})
+        blocks.append({"block": f"{prefix}{b}__A", "curso": f"{prefix}{b}", "secc": "A",
+                       "slots": slots, "cred": 3.0})
+    return blocks
+
+
+def _minutes(value):
+    t = datetime.strptime(str(value), "%H:%M")
+    return t.hour * 60 + t.minute
+
+
+class _Pairwise:
+    """The baseline's nested loops over every pair of slots, as the reference result."""
+
+    def __init__(self, app_module):
+        app = app_module.MatriculaApp()
+        self._normalize = app_module.normalize_str
+        self._clases, self._examenes = app._CLASES_NORM, app._EXAMENES_NORM
+
+    def group(self, tipo):
+        norm = self._normalize(tipo or "").upper().strip()
+        return "C" if norm in self._clases else "E" if norm in self._examenes else None
+
+    def cross(self, sa, sb):
+        """Same day, same group (classes vs exams) and intervals that cross."""
+        dia_a, dia_b = str(sa.get("dia") or "").upper().strip(), str(sb.get("dia") or "").upper().strip()
+        group = self.group(sa.get("tipo"))
+        if dia_a != dia_b or not dia_a or group is None or group != self.group(sb.get("tipo")):
+            return False
+        try:
+            a_s, a_e, b_s, b_e = (_minutes(sa["inicio"]), _minutes(sa["fin"]),
+                                  _minutes(sb["inicio"]), _minutes(sb["fin"]))
+        except ValueError:
+            return False
+        return a_s < b_e and a_e > b_s
+
+    def with_new(self, new_rows, existing):
+        """_detect_conflicts_with_new: (new block, existing block) per crossing slot pair."""
+        return [(nr["block"], eb["block"])
+                for nr in new_rows for ns in nr["slots"]
+                for eb in existing for es in eb["slots"]
+                if self.cross(ns, es)]
+
+    def within(self, rows):
+        """detect_conflicts tuples, every pair of blocks once."""
+        return [(a["block"], b["block"], str(sa["dia"]).upper().strip(),
+                 sa["inicio"], sa["fin"], sb["inicio"], sb["fin"])
+                for i, a in enumerate(rows) for b in rows[i + 1:]
+                for sa in a["slots"] for sb in b["slots"]
+                if self.cross(sa, sb)]
+
+
+@pytest.fixture
+def app(app_module):
+    return app_module.MatriculaApp()
+
+
+@pytest.fixture
+def pairwise(app_module):
+    return _Pairwise(app_module)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_conflicts_match_pairwise_loops(app, pairwise, seed):
+    rng = random.Random(seed)
+    existing = _random_blocks(rng, rng.randint(0, 12), "E")
+    new_rows = _random_blocks(rng, rng.randint(1, 6), "N")
+    app.schedules[1] = existing
+
+    conflicts = app._detect_conflicts_with_new(1, new_rows)
+    assert [(nr["block"], eb["block"]) for nr, _, eb, _ in conflicts] == pairwise.with_new(new_rows, existing)
+    assert all(pairwise.cross(ns, es) for _, ns, _, es in conflicts)
+
+    assert app.detect_conflicts(1)[0] == pairwise.within(existing)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_render_overlap_flags_match_pairwise_check(app, pairwise, seed):
+    rows = _random_blocks(random.Random(seed), 8, "B")
+    for filter_types, group in (("CLASE", "C"), ("EXAM", "E")):
+        flags = {}
+        for block in app._render_blocks(rows, filter_types):
+            flags.setdefault(block["curso"], set()).add(block["overlap"])
+        for row in rows:
+            crosses = any(pairwise.cross(s, o) for s in row["slots"] if pairwise.group(s.get("tipo")) == group
+                          for other in rows if other is not row for o in other["slots"])
+            # Every drawn slot of a block carries the block's flag
+            assert flags.get(row["curso"], {crosses}) == {crosses}
+
+
+def test_conflict_message_names_both_sessions(app_module, schedule_df):
+    # The baseline message read nr['dia'] from slot-format blocks and raised KeyError
+    app = app_module.MatriculaApp(app_module.CourseCatalog(schedule_df))
+    assert app.add_to_schedule(["Microeconomía I__A|x"], 1).startswith("✓")
+
+    message = app.add_to_schedule(["Estadística I__A|x"], 1)
+    assert message.startswith("⚠ Conflictos detectados")
+    assert "Nuevo: Estadística I__A (LUN 09:00-10:50) choca con Microeconomía I__A (LUN 08:00-09:50)" in message
+    assert [b["block"] for b in app.schedules[1]] == ["Microeconomía I__A"]
+
+    assert app.add_to_schedule(["Estadística I__A|x"], 1, force_replace=True).startswith("✓")
+    assert [b["block"] for b in app.schedules[1]] == ["Estadística I__A"]
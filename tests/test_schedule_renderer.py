@@ -0,0 +1,70 @@
+import pytest
+
+
+# Geometry of the matplotlib figure the PIL renderer replaced (data units)
+OLD_CELL_W, OLD_CELL_H, OLD_INSET = 1.5, 0.35, 0.05
+OLD_START, OLD_END = 7 * 60 + 30, 23 * 60
+
+BLOCKS = [
+    {'day': 0, 'start': 8 * 60, 'end': 9 * 60 + 50, 'curso': 'Microeconomía I', 'secc': 'A', 'overlap': False},
+    {'day': 2, 'start': 14 * 60, 'end': 15 * 60 + 50, 'curso': 'Macroeconomía I', 'secc': 'B', 'overlap': True},
+    {'day': 5, 'start': 19 * 60, 'end': 22 * 60, 'curso': 'Taller', 'secc': 'C', 'overlap': False},
+]
+
+
+def _rgb(hex_color):
+    return tuple(int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+@pytest.fixture(scope="module")
+def renderer(app_module):
+    return app_module.WeekScheduleRenderer()
+
+
+def _run(pixels, color):
+    """First and last index of `color` in a line of pixels."""
+    hits = [i for i, p in enumerate(pixels) if p == color]
+    return hits[0], hits[-1]
+
+
+def test_blocks_match_old_matplotlib_layout(renderer):
+    img = renderer.render(BLOCKS, 'CLASE')
+    grid_left, grid_top = renderer.day_x(0), renderer.grid_top
+    grid_w = renderer.day_x(len(renderer.DAYS)) - grid_left
+    grid_h = renderer.n_rows * renderer.ROW_H
+    old_w = len(renderer.DAYS) * OLD_CELL_W
+    old_h = (OLD_END - OLD_START) / 30 * OLD_CELL_H
+    # Border width plus rounding: well under one 30-minute row
+    tolerance = 6
+
+    for blk in BLOCKS:
+        face = _rgb(renderer.STYLES['CLASE']['conf' if blk['overlap'] else 'ok'][0])
+        x_old = (blk['day'] * OLD_CELL_W + OLD_INSET) / old_w
+        y_old = ((blk['start'] - OLD_START) / 30 * OLD_CELL_H) / old_h
+        y2_old = ((blk['end'] - OLD_START) / 30 * OLD_CELL_H) / old_h
+
+        # Sample a column and a row near the block's top-left corner, clear of the text
+        x = grid_left + round(x_old * grid_w) + 12
+        top, bottom = _run([img.getpixel((x, y)) for y in range(img.height)], face)
+        assert abs(top - (grid_top + y_old * grid_h)) <= tolerance
+        assert abs(bottom - (grid_top + y2_old * grid_h)) <= tolerance
+
+        left, right = _run([img.getpixel((px, top + 4)) for px in range(img.width)], face)
+        assert abs(left - (grid_left + x_old * grid_w)) <= tolerance
+        expected_w = (OLD_CELL_W - 2 * OLD_INSET) / old_w * grid_w
+        assert abs((right - left) - expected_w) <= 2 * tolerance
+
+
+def test_grid_colours_and_headers(renderer):
+    img = renderer.render(BLOCKS, 'CLASE')
+    header_y = renderer.grid_top - renderer.HEADER_H // 2
+    for i in range(len(renderer.DAYS)):
+        # Day headers above the grid (the old figure's inverted axis put them at the bottom)
+        assert img.getpixel((renderer.day_x(i) + 8, header_y)) == _rgb(renderer.HEADER_BG)
+    # Empty slot: Tuesday 10:15 is plain background
+    empty = (renderer.day_x(1) + renderer.DAY_W // 2, int(renderer.minute_y(10 * 60 + 15)))
+    assert img.getpixel(empty) == _rgb(renderer.BG_COLOR)
+
+    exams = renderer.render([dict(BLOCKS[0], overlap=False)], 'EXAM')
+    corner = (renderer.day_x(0) + renderer.BLOCK_PAD + 12, int(renderer.minute_y(8 * 60)) + 8)
+    assert exams.getpixel(corner) == _rgb(renderer.STYLES['EXAM']['ok'][0])
@@ -0,0 +1,63 @@
+import inspect
+import urllib.request
+
+import pytest
+
+
+class _Jobs:
+    pending = 3
+
+
+@pytest.fixture
+def metrics(app_module):
+    return app_module.ServerMetrics(app_module.SessionStore(), _Jobs())
+
+
+def test_histogram_buckets_are_cumulative(metrics):
+    for seconds in (0.001, 0.02, 0.02, 100.0):
+        metrics.observe("search_change", seconds)
+    text = metrics.prometheus_text()
+    assert 'matricula_handler_seconds_bucket{handler="search_change",le="0.005"} 1' in text
+    assert 'matricula_handler_seconds_bucket{handler="search_change",le="0.025"} 3' in text
+    assert 'matricula_handler_seconds_bucket{handler="search_change",le="30.0"} 3' in text
+    assert 'matricula_handler_seconds_bucket{handler="search_change",le="+Inf"} 4' in text
+    assert 'matricula_handler_seconds_count{handler="search_change"} 4' in text
+    assert "matricula_background_jobs_pending 3" in text
+    assert metrics.quantile("search_change", 0.5) == 0.025
+    assert metrics.quantile("missing", 0.5) is None
+
+
+def test_track_keeps_generators_and_counts_errors(metrics):
+    @metrics.track("gen")
+    def gen(x, request=None):
+        yield x
+        yield x + 1
+
+    @metrics.track("boom")
+    def boom():
+        raise RuntimeError
+
+    assert inspect.isgeneratorfunction(gen)
+    assert "request" in inspect.signature(gen).parameters
+    assert list(gen(1)) == [1, 2]
+    with pytest.raises(RuntimeError):
+        boom()
+    text = metrics.prometheus_text()
+    assert 'matricula_first_update_seconds_count{handler="gen"} 1' in text
+    assert 'matricula_handler_errors_total{handler="boom"} 1' in text
+    assert 'matricula_handler_errors_total{handler="gen"}' not in text
+    assert metrics.in_flight == 0
+    assert "err=1" in metrics.log_line()
+
+
+def test_serves_prometheus_text(metrics):
+    metrics.observe("update_schedule_view", 0.2)
+    server = metrics.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+    assert 'matricula_handler_seconds_count{handler="update_schedule_view"} 1' in body
@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def _request(session_hash):
+    return SimpleNamespace(session_hash=session_hash)
+
+
+def test_saved_progress_stays_in_its_session(app_module, tmp_path):
+    store = app_module.SessionStore(directory=str(tmp_path))
+    alice, bob = _request("alice"), _request("bob")
+
+    store.get(alice).taken_courses = {"ECONOMÍA I"}
+    assert store.get(alice).save_progress().startswith("✓")
+    store.get(bob).taken_courses = {"MATEMÁTICAS II"}
+    assert store.get(bob).save_progress().startswith("✓")
+
+    store.get(alice).taken_courses = set()
+    assert store.get(alice).load_progress().startswith("✓")
+    assert store.get(alice).taken_courses == {"ECONOMÍA I"}
+    assert store.get(bob).load_progress().startswith("✓")
+    assert store.get(bob).taken_courses == {"MATEMÁTICAS II"}
+
+    # A session that never saved finds nothing to load, not someone else's file
+    assert store.get(_request("carol")).load_progress().startswith("⚠")
+
+
+def test_session_files_are_removed_with_the_session(app_module, tmp_path):
+    store = app_module.SessionStore(directory=str(tmp_path))
+    app = store.get(_request("../alice"))
+    app.save_progress()
+    assert Path(app.work_dir).parent == tmp_path
+    assert os.path.exists(app.work_path("matricula_progress.json"))
+
+    store.discard(_request("../alice"))
+    assert not os.path.exists(app.work_dir)
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from matriculaup.core.conflict_detector import ConflictDetector
+from matriculaup.core.timeutil import hhmm_array_to_minutes, hhmm_to_minutes
+
+SAMPLES = ["07:30", "7:30", "7:5", "00:00", "23:59", "24:00", "12:60", "", "abc",
+           " 07:30", "07:30:00", "07-30", "+7:30", None, float("nan")]
+
+
+def _strptime_minutes(value):
+    try:
+        t = datetime.strptime(value, "%H:%M")
+    except (TypeError, ValueError):
+        return -1
+    return t.hour * 60 + t.minute
+
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_scalar_matches_strptime(value):
+    assert hhmm_to_minutes(value, -1) == _strptime_minutes(value)
+
+
+def test_scalar_default_is_none():
+    assert hhmm_to_minutes("11:30") == 690
+    assert hhmm_to_minutes("not a time") is None
+
+
+def test_array_matches_scalar():
+    values = SAMPLES * 3
+    result = hhmm_array_to_minutes(values)
+    assert result.dtype == np.int32
+    assert result.tolist() == [_strptime_minutes(v) for v in values]
+
+
+def test_array_keeps_shape_and_default():
+    result = hhmm_array_to_minutes(np.array([["08:00", "x"], ["9:15", "10:45"]], dtype=object), default=0)
+    assert result.tolist() == [[480, 0], [555, 645]]
+    assert hhmm_array_to_minutes([]).shape == (0,)
+
+
+def test_conflict_detector_still_rejects_invalid_times():
+    assert ConflictDetector._parse_time("08:30") == 510
+    with pytest.raises(ValueError):
+        ConflictDetector._parse_time("8h30")
@@ -37,3 +37,60 @@ class TestJsonSchemaCompliance:
         del bad["secciones"][0]["sesiones"][0]["hora_inicio"]
         errors = validate_courses_json({"metadata": {"ciclo": "2026-1", "fecha_extraccion": "2026-02-24"}, "cursos": [bad]})
         assert len(errors) > 0, "Missing 'hora_inicio' should fail"
+
+
+class TestCompiledValidator:
+    """Compiled checks must report exactly what jsonschema's Draft7Validator reports."""
+
+    @staticmethod
+    def _draft7(schema, data):
+        from jsonschema import Draft7Validator
+        errors = sorted(Draft7Validator(schema).iter_errors(data), key=lambda e: list(e.path))
+        return [f"{'.'.join(str(p) for p in e.path)}: {e.message}" for e in errors]
+
+    @skip_if_no_validators
+    def test_errors_match_draft7(self, minimal_valid_course):
+        from scripts.extractors.validators import COURSES_SCHEMA, CoursesValidator
+        bad = dict(minimal_valid_course, codigo="12345", creditos=True,
+                   prerequisitos={"raw": "x", "parsed": False, "items": []})
+        bad["secciones"] = [dict(minimal_valid_course["secciones"][0], seccion="", sesiones=[
+            {"tipo": "UNKNOWN", "dia": "L", "hora_inicio": "7:30", "cupos": 1.5},
+        ])]
+        for data in (
+            {"metadata": {"ciclo": 2026}, "cursos": [minimal_valid_course, bad, {"codigo": 1}, None]},
+            {"metadata": {"ciclo": "2026-1", "fecha_extraccion": "x"}, "cursos": []},
+            {"cursos": "x"},
+            None,
+        ):
+            assert CoursesValidator().validate(data) == self._draft7(COURSES_SCHEMA, data)
+
+    @skip_if_no_validators
+    def test_curriculum_errors_match_draft7(self):
+        from scripts.extractors.validators import CURRICULUM_SCHEMA
+        data = {"metadata": {"plan": "2017", "carrera": "Economía"}, "ciclos": [
+            {"ciclo": 1, "cursos": [{"codigo": "1", "nombre": "A", "tipo": "obligatorio"}]},
+            {"ciclo": "electivos", "cursos": []},
+            {"ciclo": -1, "cursos": [{"codigo": 1}]},
+            5,
+        ]}
+        assert validate_curriculum_json(data) == self._draft7(CURRICULUM_SCHEMA, data)
+
+    @skip_if_no_validators
+    def test_only_changed_courses_are_revalidated(self, minimal_valid_course):
+        import copy
+        from scripts.extractors.validators import CoursesValidator
+        other = dict(copy.deepcopy(minimal_valid_course), codigo="138202")
+        data = {"metadata": {"ciclo": "2026-1", "fecha_extraccion": "2026-02-24"},
+                "cursos": [minimal_valid_course, other]}
+        validator = CoursesValidator()
+        assert validator.validate(data) == []
+        assert (validator.checked, validator.reused) == (2, 0)
+
+        other["secciones"][0]["sesiones"][0]["tipo"] = "UNKNOWN_TYPE"
+        errors = validator.validate(data)
+        assert len(errors) == 1 and errors[0].startswith("cursos.1.secciones.0.sesiones.0.tipo:")
+        assert (validator.checked, validator.reused) == (3, 1)
+
+        # Known-unchanged courses skip even the content comparison
+        assert validator.validate(data, changed=[]) == errors
+        assert (validator.checked, validator.reused) == (3, 3)